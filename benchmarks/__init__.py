@@ -0,0 +1 @@
+"""Benchmarks for the Srp Energy client."""
@@ -0,0 +1,109 @@
+"""End-to-end benchmarks of the client against a local SRP stand-in.
+
+Each benchmark logs in and fetches a date range from ``MockSrpServer``,
+from one day up to three years of synthetic hourly rows of a plain or time
+of use plan. Besides the latency that
+pytest-benchmark reports, the ``extra_info`` of each run records the rows
+per second, the peak memory allocated by one fetch, as traced by
+``tracemalloc``, and the seconds spent in each step, as timed by a
+``CallbackTracer``.
+
+Run with ``python -m pytest benchmarks/bench_client.py``, and add
+``--benchmark-json=out.json`` to keep the results.
+"""
+
+from collections import defaultdict
+from datetime import datetime, timedelta
+import tracemalloc
+
+import pytest
+
+from benchmarks.mock_server import MockSrpServer
+from srpenergy.client import SrpEnergyClient
+from srpenergy.trace import CallbackTracer
+
+pytest.importorskip("pytest_benchmark")
+
+ACCOUNT_ID = "123456789"
+USER_NAME = "user@example.com"
+PASSWORD = "benchmark"  # noqa: S105
+START_DATE = datetime(2021, 1, 1)
+CHUNK_DAYS = 30
+
+RANGES = {
+    "day": 1,
+    "month": 30,
+    "year": 365,
+    "three_years": 3 * 365,
+}
+
+
+@pytest.fixture(scope="module")
+def servers():
+    """Serve the SRP api locally, by is_tou, for the benchmarks of this module."""
+    with MockSrpServer("total") as total, MockSrpServer("tou") as tou:
+        yield {False: total, True: tou}
+
+
+def fetch_usage(base_url, days, is_tou, tracer=None):
+    """Log in and return the usage of ``days`` days with a new client."""
+    with SrpEnergyClient(
+        ACCOUNT_ID, USER_NAME, PASSWORD, tracer=tracer, base_url=base_url
+    ) as client:
+        return client.usage(
+            START_DATE,
+            START_DATE + timedelta(days=days - 1),
+            is_tou,
+            chunk_days=CHUNK_DAYS,
+        )
+
+
+def step_seconds(base_url, days, is_tou):
+    """Return the seconds spent in each step of one traced fetch."""
+    seconds = defaultdict(float)
+
+    def record(name, duration, attributes):
+        seconds[name] += duration
+
+    fetch_usage(base_url, days, is_tou, CallbackTracer(record))
+    return {name: round(duration, 6) for name, duration in seconds.items()}
+
+
+def peak_memory(base_url, days, is_tou):
+    """Return the peak bytes allocated while fetching, usage included.
+
+    Unlike the peak RSS of the process, it only covers this fetch, so each
+    range reports its own peak.
+    """
+    tracemalloc.start()
+    try:
+        fetch_usage(base_url, days, is_tou)
+        _size, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return peak
+
+
+@pytest.mark.parametrize("is_tou", [False, True], ids=["total", "tou"])
+@pytest.mark.parametrize("range_name", list(RANGES))
+def test_usage(benchmark, servers, range_name, is_tou):
+    """Benchmark fetching a date range with a new client."""
+    days = RANGES[range_name]
+    server = servers[is_tou]
+
+    usage = benchmark(fetch_usage, server.base_url, days, is_tou)
+
+    assert len(usage) == days * 24  # noqa: S101
+    benchmark.extra_info["rows"] = len(usage)
+    # There are no stats with --benchmark-disable.
+    if benchmark.stats is not None:
+        benchmark.extra_info["rows_per_sec"] = round(
+            len(usage) / benchmark.stats.stats.mean
+        )
+
+    # Measure apart, so the tracing does not weigh on the latency.
+    benchmark.extra_info["peak_memory_bytes"] = peak_memory(
+        server.base_url, days, is_tou
+    )
+    benchmark.extra_info["step_seconds"] = step_seconds(server.base_url, days, is_tou)
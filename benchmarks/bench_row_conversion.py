@@ -0,0 +1,86 @@
+"""Micro-benchmark of the per-row usage conversion.
+
+Compares the conversion of an ``hourlyUsageList`` row with the previous
+approach, which parsed the row date with ``dateutil`` for the pretty date,
+the pretty time and the rate.
+
+Run with ``python -m benchmarks.bench_row_conversion``.
+"""
+
+from datetime import datetime, timedelta
+import timeit
+
+from dateutil.parser import parse
+
+from srpenergy.client import _convert_row, get_rate_calendar
+
+ROW_COUNT = 24 * 31
+REPEAT = 5
+
+
+def make_rows(count):
+    """Return ``count`` hourly usage rows starting on 2020-07-01."""
+    start = datetime(2020, 7, 1)
+    return [
+        {
+            "date": (start + timedelta(hours=hour)).isoformat(),
+            "onPeakKwh": 1.5,
+            "offPeakKwh": 0.5,
+            "shoulderKwh": 0.0,
+            "superOffPeakKwh": 0.0,
+            "totalKwh": 0.0,
+            "onPeakCost": 0.0,
+            "offPeakCost": 0.0,
+            "shoulderCost": 0.0,
+            "superOffPeakCost": 0.0,
+            "totalCost": 0.0,
+        }
+        for hour in range(count)
+    ]
+
+
+def convert_row_dateutil(row, is_tou):
+    """Convert a row parsing its date with ``dateutil`` three times."""
+    total_kwh = row["totalKwh"]
+    total_cost = row["totalCost"]
+
+    if is_tou:
+        usage_time = parse(row["date"])
+        rate, is_peak = get_rate_calendar(usage_time.year).lookup(
+            usage_time.timetuple().tm_yday, usage_time.hour
+        )
+        total_kwh = row["onPeakKwh"] if is_peak else row["offPeakKwh"]
+        total_cost = total_kwh * rate
+
+    return (
+        parse(row["date"]).strftime("%m/%d/%Y"),
+        parse(row["date"]).strftime("%H:%M %p"),
+        row["date"],
+        total_kwh,
+        round(total_cost, 2),
+    )
+
+
+def best_per_row(convert, rows, is_tou):
+    """Return the best time in microseconds to convert one row."""
+    timings = timeit.repeat(
+        lambda: [convert(row, is_tou) for row in rows], number=1, repeat=REPEAT
+    )
+    return min(timings) / len(rows) * 1e6
+
+
+def main():
+    """Print the per-row conversion time of both approaches."""
+    rows = make_rows(ROW_COUNT)
+
+    for is_tou in (False, True):
+        before = best_per_row(convert_row_dateutil, rows, is_tou)
+        after = best_per_row(_convert_row, rows, is_tou)
+        print(
+            f"is_tou={is_tou!s:5}  dateutil: {before:7.2f} us/row  "
+            f"fromisoformat: {after:6.2f} us/row  speedup: {before / after:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""Local stand-in for the SRP api.
+
+Serves ``login/authorize``, ``login/antiforgerytoken`` and
+``usage/hourlydetail`` from a thread of the current process, so that the
+client can be measured end to end without touching the network.
+
+Usage::
+
+    with MockSrpServer() as server:
+        client = SrpEnergyClient(
+            accountid, username, password, base_url=server.base_url
+        )
+
+"""
+
+from datetime import datetime
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+from urllib.parse import parse_qs, urlsplit
+
+from benchmarks.synthetic import iter_payload
+
+API_PATH = "/myaccountapi/api/"
+XSRF_TOKEN = "benchmark-xsrf-token-{}"  # noqa: S105
+SESSION_COOKIE = "srp-benchmark-session"
+# How often the server checks for a shutdown, in seconds.
+POLL_INTERVAL = 0.05
+
+LOGIN_BODY = json.dumps(
+    {
+        "message": "Log in successful.",
+        "username": "user@example.com",
+        "email": "user@example.com",
+        "isIrrigator": False,
+        "redirectUrl": "",
+    }
+).encode()
+ANTI_FORGERY_BODY = json.dumps({"message": "Success"}).encode()
+
+
+@lru_cache(maxsize=64)
+def _usage_body(begin_date, end_date, plan, seed):
+    """Return the encoded ``hourlydetail`` body of a date range.
+
+    Bodies are kept so that generating them does not weigh on the client
+    timed in the same process.
+    """
+    return b"".join(iter_payload(begin_date, end_date, plan, seed, demand=True))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Answer the requests of the client like the SRP api."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written apart, which Nagle would hold for 40 ms.
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        """Keep the benchmark output quiet."""
+
+    def _reply(self, status, body=b"", cookie=None):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if cookie is not None:
+            self.send_header("Set-Cookie", f"{cookie}; Path=/")
+
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        """Log in."""
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+        if self.path != API_PATH + "login/authorize":
+            self._reply(404)
+            return
+
+        with self.server.lock:
+            self.server.logins += 1
+
+        self._reply(200, LOGIN_BODY, f"{SESSION_COOKIE}=1")
+
+    def do_GET(self):
+        """Return the XSRF token or the hourly usage."""
+        url = urlsplit(self.path)
+
+        if url.path == API_PATH + "login/antiforgerytoken":
+            token = XSRF_TOKEN.format(self.server.sessions)
+            self._reply(200, ANTI_FORGERY_BODY, f"xsrf-token={token}")
+            return
+
+        if url.path != API_PATH + "usage/hourlydetail":
+            self._reply(404)
+            return
+
+        if self.headers.get("x-xsrf-token") != XSRF_TOKEN.format(self.server.sessions):
+            self._reply(401)
+            return
+
+        params = parse_qs(url.query)
+        try:
+            begin_date = datetime.strptime(params["beginDate"][0], "%m-%d-%Y").date()
+            end_date = datetime.strptime(params["endDate"][0], "%m-%d-%Y").date()
+        except (KeyError, ValueError):
+            self._reply(400)
+            return
+
+        with self.server.lock:
+            self.server.usage_requests += 1
+
+        self._reply(
+            200,
+            _usage_body(begin_date, end_date, self.server.plan, self.server.seed),
+        )
+
+
+class MockSrpServer:
+    """MockSrpServer(plan="total", seed=0, host="127.0.0.1", port=0).
+
+    A local HTTP server standing in for the SRP api, run in a thread.
+
+    The usage is generated by ``benchmarks.synthetic`` for any date range.
+
+    Parameters
+    ----------
+    plan : string
+        The plan type of the usage, ``"total"``, ``"ez3"`` or ``"tou"``.
+    seed : int
+        The seed of the usage values.
+    host : string
+        The address to listen on.
+    port : int
+        The port to listen on, any free port if 0.
+
+    Attributes
+    ----------
+    base_url : string
+        The root of the api, to pass as ``base_url`` to the clients.
+
+    """
+
+    def __init__(self, plan="total", seed=0, host="127.0.0.1", port=0):
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.plan = plan
+        self._server.seed = seed
+        self._server.daemon_threads = True
+        self._server.lock = threading.Lock()
+        self._server.logins = 0
+        self._server.usage_requests = 0
+        self._server.sessions = 0
+        self._thread = None
+
+        host, port = self._server.server_address[:2]
+        self.base_url = f"http://{host}:{port}{API_PATH}"
+
+    @property
+    def logins(self):
+        """Return the number of ``login/authorize`` requests served."""
+        return self._server.logins
+
+    @property
+    def usage_requests(self):
+        """Return the number of ``usage/hourlydetail`` requests served."""
+        return self._server.usage_requests
+
+    def expire_sessions(self):
+        """Reject the XSRF tokens handed out so far, as if the logins expired."""
+        with self._server.lock:
+            self._server.sessions += 1
+
+    def start(self):
+        """Serve requests from a daemon thread."""
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            kwargs={"poll_interval": POLL_INTERVAL},
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop serving and release the port."""
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self):
+        """Start the server for use as a context manager."""
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Stop the server on exit."""
+        self.stop()
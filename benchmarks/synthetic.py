@@ -0,0 +1,231 @@
+"""Synthetic ``usage/hourlydetail`` payloads for load and scale testing.
+
+Generates seeded, realistic hourly usage for any date range in the shape
+of each plan type, and streams it as JSON so that millions of rows can be
+written without holding them in memory. The load follows a daily curve
+peaking in the late afternoon and is higher in the summer months.
+
+Plan types are ``"total"``, where each row carries ``totalKwh`` and
+``totalCost``, ``"ez3"``, where usage and cost are split in on and off peak
+fields with ``totalKwh`` and ``totalCost`` at 0, and ``"tou"``, where each
+hour is reported as on or off peak kWh only, following ``get_rate``.
+
+The values of a day only depend on the seed and the day, so a range
+fetched in chunks matches the same range fetched at once.
+
+Write a three year payload with
+``python -m benchmarks.synthetic 2020-01-01 2022-12-31 --plan tou > usage.json``.
+"""
+
+import argparse
+from datetime import date, datetime, timedelta
+import json
+import math
+import random
+import sys
+
+from srpenergy.client import _get_rate
+
+PLANS = ("total", "ez3", "tou")
+
+# The flat price of the plain plan and the EZ-3 prices, in $/kWh.
+TOTAL_RATE = 0.1098
+EZ3_RATES = (0.2494, 0.0985)
+
+# EZ-3 peak hours, 3 PM to 6 PM on weekdays.
+EZ3_PEAK_START = 15
+EZ3_PEAK_END = 18
+
+# The load of an idle home, and the extra load of a summer afternoon in kW.
+BASE_LOAD = 0.35
+PEAK_LOAD = 3.2
+
+
+def _day_random(seed, day):
+    """Return the random generator of one day."""
+    return random.Random(seed * 1_000_003 + day.toordinal())  # noqa: S311
+
+
+def _hourly_kwh(rng, day):
+    """Return the kWh used in each hour of a day."""
+    # Cooling drives the load, most of it in the summer months.
+    season = 0.25 + 0.75 * math.sin(math.pi * (day.month - 0.5) / 12) ** 2
+    scale = rng.uniform(0.7, 1.3)
+
+    usage = []
+    for hour in range(24):
+        curve = math.exp(-(((hour - 17) / 4) ** 2))
+        kwh = BASE_LOAD + PEAK_LOAD * season * scale * curve
+        usage.append(round(max(kwh * rng.gauss(1.0, 0.15), 0.05), 2))
+
+    return usage
+
+
+def _make_row(usage_time, kwh, plan):
+    """Return the ``hourlyUsageList`` row of an hour for a plan type."""
+    isotime = usage_time.isoformat()
+    row = {
+        "date": isotime,
+        "hour": isotime,
+        "onPeakKwh": 0.0,
+        "offPeakKwh": 0.0,
+        "shoulderKwh": 0.0,
+        "superOffPeakKwh": 0.0,
+        "totalKwh": 0.0,
+        "onPeakCost": 0.0,
+        "offPeakCost": 0.0,
+        "shoulderCost": 0.0,
+        "superOffPeakCost": 0.0,
+        "totalCost": 0.0,
+    }
+
+    if plan == "total":
+        row["totalKwh"] = kwh
+        row["totalCost"] = round(kwh * TOTAL_RATE, 2)
+    elif plan == "ez3":
+        is_peak = (
+            usage_time.weekday() < 5  # noqa: PLR2004
+            and EZ3_PEAK_START <= usage_time.hour < EZ3_PEAK_END
+        )
+        prefix = "onPeak" if is_peak else "offPeak"
+        row[prefix + "Kwh"] = kwh
+        row[prefix + "Cost"] = round(kwh * EZ3_RATES[not is_peak], 2)
+    else:
+        is_peak = _get_rate(usage_time)[1]
+        row["onPeakKwh" if is_peak else "offPeakKwh"] = kwh
+
+    return row
+
+
+def _iter_usage(begin_date, end_date, seed):
+    """Yield the start, hourly kWh and ``demandList`` entry of each day."""
+    for offset in range((end_date - begin_date).days + 1):
+        day = begin_date + timedelta(days=offset)
+        start = datetime(day.year, day.month, day.day)
+        usage = _hourly_kwh(_day_random(seed, day), day)
+        peak_hour = max(range(24), key=usage.__getitem__)
+
+        demand = {
+            "date": start.isoformat(),
+            "hour": (start + timedelta(hours=peak_hour)).isoformat(),
+            "demandKw": usage[peak_hour],
+        }
+        yield start, usage, demand
+
+
+def iter_days(begin_date, end_date, plan="total", seed=0):
+    """Yield the ``(demand, rows)`` of each day from one day to another included.
+
+    Parameters
+    ----------
+    begin_date : date
+        The first day.
+    end_date : date
+        The last day, included.
+    plan : string
+        One of ``"total"``, ``"ez3"`` or ``"tou"``.
+    seed : int
+        The seed of the usage values.
+
+    Yields
+    ------
+    tuple
+        In the form of (demand, rows), where demand is the ``demandList``
+        entry of the day and rows its 24 ``hourlyUsageList`` rows.
+
+    Raises
+    ------
+    ValueError
+        If ``plan`` is not a known plan type.
+
+    """
+    if plan not in PLANS:
+        raise ValueError(f"Parameter plan must be one of {PLANS}.")
+
+    for start, usage, demand in _iter_usage(begin_date, end_date, seed):
+        rows = [
+            _make_row(start + timedelta(hours=hour), kwh, plan)
+            for hour, kwh in enumerate(usage)
+        ]
+        yield demand, rows
+
+
+def iter_payload(begin_date, end_date, plan="total", seed=0, demand=False):
+    """Yield the JSON body of ``usage/hourlydetail`` one day at a time.
+
+    Only one day of rows is built at once, so the memory used does not
+    depend on the length of the range. The ``demandList`` is streamed by
+    generating the days again, which gives the same values.
+
+    Parameters
+    ----------
+    begin_date : date
+        The first day.
+    end_date : date
+        The last day, included.
+    plan : string
+        One of ``"total"``, ``"ez3"`` or ``"tou"``.
+    seed : int
+        The seed of the usage values.
+    demand : bool
+        fill the ``demandList`` with the peak hour of each day
+
+    Yields
+    ------
+    bytes
+        The parts of the body, to be written or sent in order.
+
+    """
+    encode = json.JSONEncoder(separators=(",", ":")).encode
+
+    yield b'{"hourlyUsageList":['
+    separator = b""
+    for _day_demand, rows in iter_days(begin_date, end_date, plan, seed):
+        yield separator + ",".join(map(encode, rows)).encode()
+        separator = b","
+
+    yield b'],"demandList":['
+    if demand:
+        separator = b""
+        for _start, _usage, day_demand in _iter_usage(begin_date, end_date, seed):
+            yield separator + encode(day_demand).encode()
+            separator = b","
+
+    yield b"]}"
+
+
+def write_payload(stream, payload):
+    """Write the parts of a body from ``iter_payload`` to a binary stream.
+
+    Returns
+    -------
+    int
+        The number of bytes written.
+
+    """
+    size = 0
+    for part in payload:
+        stream.write(part)
+        size += len(part)
+
+    return size
+
+
+def main(argv=None):
+    """Write the payload of a date range to the standard output."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("begin_date", type=date.fromisoformat)
+    parser.add_argument("end_date", type=date.fromisoformat)
+    parser.add_argument("--plan", choices=PLANS, default="total")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--demand", action="store_true")
+    args = parser.parse_args(argv)
+
+    payload = iter_payload(
+        args.begin_date, args.end_date, args.plan, args.seed, args.demand
+    )
+    write_payload(sys.stdout.buffer, payload)
+
+
+if __name__ == "__main__":
+    main()
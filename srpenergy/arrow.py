@@ -0,0 +1,166 @@
+"""Arrow module.
+
+This module houses the export of hourly usage to Apache Arrow tables and
+Parquet datasets. It requires the optional ``pyarrow`` dependency, installed
+with ``pip install srpenergy[arrow]``.
+
+"""
+
+from array import array
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from srpenergy.client import (
+    _get_rate,
+    _row_totals,
+    _srp_local_time,
+    parse_usage_time,
+)
+from srpenergy.frame import _LOCAL_EPOCH
+
+# The raw ``hourlyUsageList`` fields kept as columns, by column name.
+RAW_COLUMNS = {
+    "on_peak_kwh": "onPeakKwh",
+    "off_peak_kwh": "offPeakKwh",
+    "shoulder_kwh": "shoulderKwh",
+    "super_off_peak_kwh": "superOffPeakKwh",
+    "on_peak_cost": "onPeakCost",
+    "off_peak_cost": "offPeakCost",
+    "shoulder_cost": "shoulderCost",
+    "super_off_peak_cost": "superOffPeakCost",
+}
+
+# The file holding the rows of each account and month of a dataset.
+PARTITION_FILE = "usage.parquet"
+
+USAGE_SCHEMA = pa.schema(
+    [
+        ("accountid", pa.dictionary(pa.int32(), pa.string())),
+        ("timestamp", pa.timestamp("s", tz="-07:00")),
+        ("kwh", pa.float64()),
+        ("cost", pa.float64()),
+        ("peak", pa.bool_()),
+    ]
+    + [(name, pa.float64()) for name in RAW_COLUMNS]
+)
+
+
+def _column(values, arrow_type):
+    """Wrap a typed array in an Arrow array without copying it."""
+    return pa.Array.from_buffers(arrow_type, len(values), [None, pa.py_buffer(values)])
+
+
+def usage_table(rows, accountid, is_tou=False):
+    """Build an Arrow table from raw ``hourlyUsageList`` rows.
+
+    The rows are read once into typed column buffers that Arrow wraps without
+    copying, so no usage tuples are created.
+
+    Parameters
+    ----------
+    rows : iterable of dict
+        The raw rows, in order.
+    accountid : string
+        The srp account id of the rows.
+    is_tou : bool
+        indicate if usage is a time of use plan
+
+    Returns
+    -------
+    pyarrow.Table
+        With the columns of ``USAGE_SCHEMA``. ``kwh`` and ``cost`` are
+        computed as by ``SrpEnergyClient.usage()``, with an unrounded cost.
+
+    """
+    timestamps = array("q")
+    kwh = array("d")
+    cost = array("d")
+    peak = array("b")
+    raw = {name: array("d") for name in RAW_COLUMNS}
+
+    for row in rows:
+        usage_time = _srp_local_time(parse_usage_time(row["date"]))
+        tou_rate = _get_rate(usage_time)
+        total_kwh, total_cost = _row_totals(row, tou_rate if is_tou else None)
+
+        timestamps.append(int((usage_time - _LOCAL_EPOCH).total_seconds()))
+        kwh.append(total_kwh)
+        cost.append(total_cost)
+        peak.append(tou_rate[1])
+        for name, field in RAW_COLUMNS.items():
+            raw[name].append(row[field])
+
+    row_count = len(timestamps)
+    columns = [
+        pa.DictionaryArray.from_arrays(
+            pa.repeat(0, row_count).cast(pa.int32()), pa.array([accountid])
+        ),
+        _column(timestamps, USAGE_SCHEMA.field("timestamp").type),
+        _column(kwh, pa.float64()),
+        _column(cost, pa.float64()),
+        _column(peak, pa.int8()).cast(pa.bool_()),
+    ] + [_column(raw[name], pa.float64()) for name in RAW_COLUMNS]
+
+    return pa.Table.from_arrays(columns, schema=USAGE_SCHEMA)
+
+
+def _merge_partition(directory, rows):
+    """Merge rows into the file of a partition, replacing the hours they share.
+
+    The merged file is written aside and moved in place, so readers never see
+    a partial file.
+    """
+    path = directory / PARTITION_FILE
+    if path.exists():
+        existing = pq.read_table(path).select(rows.column_names).cast(rows.schema)
+        is_replaced = pc.is_in(existing["timestamp"], value_set=rows["timestamp"])
+        rows = pa.concat_tables([existing.filter(pc.invert(is_replaced)), rows])
+
+    directory.mkdir(parents=True, exist_ok=True)
+    # Files starting with an underscore are skipped by dataset readers.
+    partial_path = directory / f"_{PARTITION_FILE}.partial"
+    pq.write_table(rows.sort_by("timestamp"), partial_path)
+    partial_path.replace(path)
+
+
+def write_parquet(table, root_path):
+    """Write a usage table to a Parquet dataset partitioned by account and month.
+
+    Each ``accountid=<id>/month=<YYYY-MM>`` directory holds a single file.
+    The rows of a write are merged into it, replacing the hours already
+    written, so overlapping or repeated loads never duplicate rows.
+
+    Parameters
+    ----------
+    table : pyarrow.Table
+        A table returned by ``usage_table`` or ``SrpEnergyClient.usage_arrow``.
+    root_path : string or path
+        The root directory of the dataset.
+
+    Examples
+    --------
+    >>> from srpenergy.arrow import write_parquet
+    >>>
+    >>> write_parquet(client.usage_arrow(start_date, end_date), "lake/usage")
+
+    """
+    if table.num_rows == 0:
+        return
+
+    local_time = pc.local_timestamp(table["timestamp"])
+    months = pc.strftime(local_time, format="%Y-%m")
+    accountids = table["accountid"].cast(pa.string())
+    rows = table.drop_columns("accountid")
+
+    partitions = dict.fromkeys(
+        zip(accountids.to_pylist(), months.to_pylist(), strict=True)
+    )
+    for accountid, month in partitions:
+        in_partition = pc.and_(pc.equal(accountids, accountid), pc.equal(months, month))
+        _merge_partition(
+            Path(root_path) / f"accountid={accountid}" / f"month={month}",
+            rows.filter(in_partition),
+        )
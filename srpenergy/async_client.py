@@ -0,0 +1,497 @@
+"""Async client module.
+
+This module houses an asyncio version of the class used to fetch energy usage.
+It requires the optional ``httpx`` dependency, installed with
+``pip install srpenergy[async]``.
+
+"""
+
+import asyncio
+from collections import deque
+from urllib.parse import unquote
+
+import httpx
+
+from srpenergy.client import (
+    BASE_USAGE_URL,
+    BROWSER_HEADERS,
+    DEFAULT_MAX_WORKERS,
+    HTTP_FORBIDDEN_ERROR,
+    HTTP_UNAUTHORIZED_ERROR,
+    SrpEnergyError,
+    _ChunkMerger,
+    _convert_row,
+    _parse_hourly_usage,
+    _split_date_range,
+    _validate_credentials,
+    _validate_date_range,
+)
+from srpenergy.retry import RetryPolicy
+from srpenergy.trace import NULL_SPAN
+
+
+class AsyncSrpEnergyClient:
+    """AsyncSrpEnergyClient(accountid, username, password, transport=None).
+
+    Asyncio client used to fetch srp energy usage.
+
+    It mirrors ``SrpEnergyClient`` and returns identical results. Each client
+    keeps its own login cookies, while an ``httpx.AsyncHTTPTransport`` passed
+    as ``transport`` can be shared by many clients to pool connections.
+
+    Parameters
+    ----------
+    accountid : string
+        An srp account id.
+    username: string
+        An srp account username.
+    password: string
+        An srp account password
+    transport: httpx.AsyncBaseTransport, optional
+        A transport shared with other clients. It is not closed by ``close()``.
+    retry: RetryPolicy, optional
+        How requests failing for a transient reason are repeated.
+    limiter: TokenBucket, optional
+        A rate limiter shared with other clients, taken before each request.
+    tracer: Tracer, optional
+        An OpenTelemetry tracer or ``CallbackTracer`` timing each step.
+    base_url: string, optional
+        The root of the SRP api, changed to target a local stand-in.
+
+    Methods
+    -------
+    validate()
+        Validate user credentials.
+    usage(startdate, enddate)
+        Get the usage for a given date range.
+    iter_usage(startdate, enddate)
+        Iterate over the usage for a given date range.
+    close()
+        Close the authenticated session.
+
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        accountid,
+        username,
+        password,
+        transport=None,
+        retry=None,
+        limiter=None,
+        tracer=None,
+        base_url=BASE_USAGE_URL,
+    ):
+
+        _validate_credentials(accountid, username, password)
+
+        self.accountid = accountid
+        self.username = username
+        self.password = password
+        self.base_url = base_url
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.limiter = limiter
+        self.tracer = tracer
+
+        self._transport = transport
+        self._retry_budget = self.retry.budget
+        self._session = None
+        self._is_authorized = False
+        self._xsrf_token = None
+        self._login_lock = asyncio.Lock()
+        self._login_generation = 0
+
+    async def __aenter__(self):
+        """Return the client for use as an async context manager."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        """Close the authenticated session on exit."""
+        await self.close()
+
+    async def close(self):
+        """Close the authenticated session and discard cached credentials."""
+        if self._session is not None and self._transport is None:
+            await self._session.aclose()
+
+        self._session = None
+        self._is_authorized = False
+        self._xsrf_token = None
+
+    def _check_response(self, response: httpx.Response, step: str) -> None:
+        """Raise a clear error if a response indicates failure."""
+        if response.status_code == HTTP_FORBIDDEN_ERROR:
+            # Cloudflare or SRP access control blocked the request
+            raise SrpEnergyError(
+                f"Access denied (403) during '{step}'. "
+                "SRP's site may be blocking automated requests. "
+                f"Ray ID may be present in response: {response.text[:200]}"
+            )
+        try:
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            raise SrpEnergyError(
+                f"HTTP error during '{step}': {e} — body: {response.text[:200]}"
+            ) from e
+
+    def _get_session(self):
+        """Return the shared session, creating it on first use."""
+        if self._session is None:
+            self._session = httpx.AsyncClient(
+                headers=BROWSER_HEADERS, transport=self._transport
+            )
+
+        return self._session
+
+    def _take_retry(self, attempt):
+        """Return True if a failed attempt may be retried, spending the budget."""
+        if attempt >= self.retry.max_attempts:
+            return False
+
+        if self._retry_budget is None:
+            return True
+
+        if self._retry_budget < 1:
+            return False
+
+        self._retry_budget -= 1
+        return True
+
+    def _span(self, name):
+        """Return a span timing a step, or a span doing nothing without tracer."""
+        if self.tracer is None:
+            return NULL_SPAN
+
+        return self.tracer.start_as_current_span(name)
+
+    async def _send(self, method, url, **kwargs):
+        """Send a request, repeating it on transient failures."""
+        with self._span(url.removeprefix(self.base_url)) as span:
+            response, retries = await self._send_attempts(method, url, **kwargs)
+            span.set_attribute("http.status_code", response.status_code)
+            span.set_attribute("srp.retries", retries)
+
+        return response
+
+    async def _send_attempts(self, method, url, **kwargs):
+        """Return the response of a request and the number of retries it took."""
+        attempt = 1
+        while True:
+            if self.limiter is not None:
+                await self.limiter.acquire_async(self.accountid)
+
+            try:
+                response = await getattr(self._get_session(), method)(url, **kwargs)
+            except httpx.TransportError:
+                if not self._take_retry(attempt):
+                    raise
+
+                delay = self.retry.delay(attempt)
+            else:
+                if not self.retry.is_retryable(response) or not self._take_retry(
+                    attempt
+                ):
+                    return response, attempt - 1
+
+                delay = self.retry.delay(attempt, response)
+                await response.aclose()
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _authorize(self):
+        """Post the user credentials and return the login payload."""
+        self._is_authorized = False
+        self._xsrf_token = None
+
+        response = await self._send(
+            "post",
+            self.base_url + "login/authorize",
+            data={"username": self.username, "password": self.password},
+        )
+        self._check_response(response, "login/authorize")
+        data = response.json()
+
+        self._is_authorized = True
+        return data
+
+    async def _fetch_xsrf_token(self):
+        """Fetch the XSRF token, or ``None`` when the login expired."""
+        response = await self._send("get", self.base_url + "login/antiforgerytoken")
+
+        if "xsrf-token" not in response.cookies:
+            return None
+
+        return unquote(response.cookies["xsrf-token"])
+
+    async def _login(self):
+        """Make sure the session is authorized and holds an XSRF token."""
+        async with self._login_lock:
+            if self._xsrf_token is not None:
+                return
+
+            is_reused = self._is_authorized
+            if not is_reused:
+                await self._authorize()
+
+            xsrf_token = await self._fetch_xsrf_token()
+            if xsrf_token is None and is_reused:
+                await self._authorize()
+                xsrf_token = await self._fetch_xsrf_token()
+
+            if xsrf_token is None:
+                self._is_authorized = False
+                raise SrpEnergyError(
+                    "XSRF token cookie missing after antiforgerytoken request. "
+                    f"Cookies received: {list(self._session.cookies.keys())}"
+                )
+
+            self._xsrf_token = xsrf_token
+            self._login_generation += 1
+
+    async def _relogin(self, generation):
+        """Log in again after the login of ``generation`` was rejected.
+
+        Only the first task rejected with a login logs in again, the others
+        find a newer generation and reuse its token.
+        """
+        async with self._login_lock:
+            if self._login_generation == generation:
+                self._is_authorized = False
+                self._xsrf_token = None
+
+        await self._login()
+
+    async def _get_hourly_usage(self, str_startdate, str_enddate):
+        """Request the hourly usage using the current XSRF token."""
+        return await self._send(
+            "get",
+            self.base_url + "usage/hourlydetail",
+            params={
+                "billaccount": self.accountid,
+                "beginDate": str_startdate,
+                "endDate": str_enddate,
+            },
+            headers={"x-xsrf-token": self._xsrf_token},
+        )
+
+    async def _fetch_hourly_usage(self, begin_date, end_date):
+        """Return an iterator over the raw ``hourlyUsageList`` for a date range."""
+        # Convert dates to strings
+        str_startdate = begin_date.strftime("%m-%d-%Y")
+        str_enddate = end_date.strftime("%m-%d-%Y")
+
+        is_reused = self._xsrf_token is not None
+        await self._login()
+        # Read before the token is sent, so a rejected token is never newer.
+        generation = self._login_generation
+
+        response = await self._get_hourly_usage(str_startdate, str_enddate)
+        if is_reused and response.status_code in (
+            HTTP_UNAUTHORIZED_ERROR,
+            HTTP_FORBIDDEN_ERROR,
+        ):
+            await self._relogin(generation)
+            response = await self._get_hourly_usage(str_startdate, str_enddate)
+
+        self._check_response(response, "usage/hourlydetail")
+
+        # The body is already buffered, so streaming it would save nothing.
+        if self.tracer is None:
+            return _parse_hourly_usage([response.content])
+
+        with self._span("usage/decode") as span:
+            rows = list(_parse_hourly_usage([response.content]))
+            span.set_attribute("srp.bytes", len(response.content))
+            span.set_attribute("srp.rows", len(rows))
+
+        return iter(rows)
+
+    async def _fetch_chunks(self, chunks, max_workers):
+        """Yield the raw ``hourlyUsageList`` of each chunk in order.
+
+        Chunks are fetched concurrently, with at most ``max_workers`` requests
+        in flight or waiting to be consumed.
+        """
+        if len(chunks) == 1:
+            yield await self._fetch_hourly_usage(*chunks[0])
+            return
+
+        # Log in once before the chunks share the session.
+        await self._login()
+
+        pending = deque()
+        try:
+            for chunk in chunks:
+                if len(pending) >= max_workers:
+                    yield await pending.popleft()
+
+                pending.append(asyncio.ensure_future(self._fetch_hourly_usage(*chunk)))
+
+            while pending:
+                yield await pending.popleft()
+
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def validate(self):
+        """Validate user credentials.
+
+        Returns
+        -------
+        bool
+
+        Examples
+        --------
+        Validate credentials.
+
+        >>> from srpenergy.async_client import AsyncSrpEnergyClient
+        >>>
+        >>> async with AsyncSrpEnergyClient(accountid, username, password) as client:
+        ...     valid = await client.validate()
+        >>> print(valid)
+        True
+
+        """
+        try:
+            data = await self._authorize()
+            is_valid = data["message"] == "Log in successful."
+
+        except Exception:  # pylint: disable=W0703
+            is_valid = False
+
+        if not is_valid:
+            self._is_authorized = False
+
+        return is_valid
+
+    def iter_usage(
+        self,
+        startdate,
+        enddate,
+        is_tou=False,
+        chunk_days=None,
+        max_workers=DEFAULT_MAX_WORKERS,
+    ):
+        """Asynchronously iterate over the energy usage for a given date range.
+
+        The parameters are validated before the async iterator is returned.
+
+        Parameters
+        ----------
+        startdate : datetime
+            the start date
+        enddate : datetime
+            the end date
+        is_tou : bool
+            indicate if usage is a time of use plan
+        chunk_days : int, optional
+            split the range into requests of at most this many days
+        max_workers : int
+            the maximum number of chunks fetched concurrently
+
+        Returns
+        -------
+        async iterator of tuple
+            In the form of (datepart, timepart, isotime, kw, cost)
+
+        Raises
+        ------
+        ValueError
+            If ``startdate`` or ``enddate`` are not datetime,
+            or if ``startdate`` is greater than ``enddate``,
+            or if ``startdate`` is greater than now,
+            or if ``chunk_days`` or ``max_workers`` are less than 1.
+
+        Examples
+        --------
+        >>> async for row in client.iter_usage(start_date, end_date, chunk_days=7):
+        ...     await writer.write(row)
+
+        """
+        _validate_date_range(startdate, enddate)
+
+        if max_workers < 1:
+            raise ValueError("Parameter max_workers must be greater than 0.")
+
+        chunks = _split_date_range(startdate, enddate, chunk_days)
+
+        return self._iter_usage(chunks, is_tou, max_workers)
+
+    async def _iter_usage(self, chunks, is_tou, max_workers):
+        """Yield the converted rows of each chunk as it arrives."""
+        merger = _ChunkMerger()
+        async for hourly_usage_list in self._fetch_chunks(chunks, max_workers):
+            with self._span("usage/convert") as span:
+                usage = [
+                    _convert_row(row, is_tou) for row in merger.merge(hourly_usage_list)
+                ]
+                span.set_attribute("srp.rows", len(usage))
+
+            for row in usage:
+                yield row
+
+    async def usage(
+        self,
+        startdate,
+        enddate,
+        is_tou=False,
+        chunk_days=None,
+        max_workers=DEFAULT_MAX_WORKERS,
+    ):
+        """Get the energy usage for a given date range.
+
+        Parameters
+        ----------
+        startdate : datetime
+            the start date
+        enddate : datetime
+            the end date
+        is_tou : bool
+            indicate if usage is a time of use plan
+        chunk_days : int, optional
+            split the range into requests of at most this many days
+        max_workers : int
+            the maximum number of chunks fetched concurrently
+
+        Returns
+        -------
+        list of tuple
+            In the form of (datepart, timepart, isotime, kw, cost)
+
+        Raises
+        ------
+        ValueError
+            If ``startdate`` or ``enddate`` are not datetime,
+            or if ``startdate`` is greater than ``enddate``,
+            or if ``startdate`` is greater than now,
+            or if ``chunk_days`` or ``max_workers`` are less than 1.
+
+        Examples
+        --------
+        Poll several accounts concurrently over one connection pool.
+
+        >>> import asyncio
+        >>> import httpx
+        >>> from srpenergy.async_client import AsyncSrpEnergyClient
+        >>>
+        >>> async def poll(accounts, start_date, end_date):
+        ...     transport = httpx.AsyncHTTPTransport()
+        ...     clients = [
+        ...         AsyncSrpEnergyClient(*account, transport=transport)
+        ...         for account in accounts
+        ...     ]
+        ...     usages = await asyncio.gather(
+        ...         *(client.usage(start_date, end_date) for client in clients)
+        ...     )
+        ...     await transport.aclose()
+        ...     return usages
+
+        """
+        return [
+            row
+            async for row in self.iter_usage(
+                startdate, enddate, is_tou, chunk_days, max_workers
+            )
+        ]
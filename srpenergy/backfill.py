@@ -0,0 +1,381 @@
+"""Backfill module.
+
+This module houses the runner used to pull years of hourly usage for many
+billing accounts, spread over a process pool.
+
+"""
+
+import argparse
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import csv
+from datetime import datetime, timedelta
+import json
+from multiprocessing.managers import BaseManager
+import os
+from pathlib import Path
+import sys
+from typing import NamedTuple
+
+from srpenergy.client import (
+    SRP_TIMEZONE,
+    SrpEnergyClient,
+    _validate_accountid,
+    _validate_date_range,
+)
+from srpenergy.throttle import TokenBucket
+
+CSV_HEADER = ("date", "time", "isotime", "kwh", "cost")
+
+# The client of each worker process, created by ``_init_worker``.
+_worker_client = None
+_worker_is_tou = False
+
+
+class BackfillResult(NamedTuple):
+    """The months fetched, skipped and failed by a backfill."""
+
+    fetched: int
+    skipped: int
+    failed: dict
+
+
+class _LimiterManager(BaseManager):
+    """Serve one ``TokenBucket`` to every worker process."""
+
+
+_LimiterManager.register("TokenBucket", TokenBucket, exposed=("acquire",))
+
+
+def _month_windows(startdate, enddate):
+    """Yield the ``(month, begin, end)`` of each month of a date range."""
+    month = datetime(startdate.year, startdate.month, 1)
+    while month <= enddate:
+        next_month = (month + timedelta(days=32)).replace(day=1)
+        yield (
+            month.strftime("%Y-%m"),
+            max(startdate, month),
+            min(enddate, next_month - timedelta(days=1)),
+        )
+        month = next_month
+
+
+def _is_closed_month(begin_date, end_date, today):
+    """Return True if a window covers a whole month that ended before today."""
+    next_day = end_date.date() + timedelta(days=1)
+
+    return begin_date.day == 1 and next_day.day == 1 and next_day <= today
+
+
+def _init_worker(credentials, is_tou, limiter, client_options):
+    """Create the client of a worker process, shared by all of its months."""
+    global _worker_client, _worker_is_tou  # noqa: PLW0603
+
+    # Each month names its own account, the client login is shared.
+    _worker_client = SrpEnergyClient(*credentials, limiter=limiter, **client_options)
+    _worker_is_tou = is_tou
+
+
+def _fetch_month(accountid, begin_date, end_date):
+    """Return the converted usage of one account over one month."""
+    usage = _worker_client.usage_many(
+        [accountid], begin_date, end_date, _worker_is_tou
+    )[accountid]
+    if isinstance(usage, Exception):
+        raise usage
+
+    return usage
+
+
+class Checkpoint:
+    """Checkpoint(path).
+
+    The (account id, month) pairs of whole, closed months already written,
+    appended to a file as JSON lines so that an interrupted backfill resumes
+    where it stopped. A line cut short by a crash is ignored.
+
+    Parameters
+    ----------
+    path : string
+        The checkpoint file, created if missing.
+
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.done = set()
+
+        if self.path.exists():
+            with self.path.open(encoding="utf-8") as lines:
+                for line in lines:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+
+                    self.done.add((entry["accountid"], entry["month"]))
+
+    def __contains__(self, task):
+        """Return True if an (account id, month) pair was written."""
+        return task in self.done
+
+    def add(self, accountid, month):
+        """Record that a month of an account was written, durably."""
+        with self.path.open("a", encoding="utf-8") as lines:
+            lines.write(json.dumps({"accountid": accountid, "month": month}) + "\n")
+            lines.flush()
+            os.fsync(lines.fileno())
+
+        self.done.add((accountid, month))
+
+
+class CsvSink:
+    """CsvSink(root_path).
+
+    Sink writing the usage of each account and month to
+    ``<root_path>/<accountid>/<YYYY-MM>.csv``.
+
+    Files are replaced atomically, so a month fetched again after a crash
+    overwrites its previous file instead of adding to it.
+
+    Parameters
+    ----------
+    root_path : string
+        The directory holding the files.
+
+    """
+
+    def __init__(self, root_path):
+        self.root_path = Path(root_path)
+
+    def write(self, accountid, month, usage):
+        """Write the usage tuples of one account and month."""
+        path = self.root_path / accountid / f"{month}.csv"
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        partial_path = path.with_suffix(".csv.partial")
+        with partial_path.open("w", encoding="utf-8", newline="") as stream:
+            writer = csv.writer(stream)
+            writer.writerow(CSV_HEADER)
+            writer.writerows(usage)
+
+        partial_path.replace(path)
+
+
+class Backfill:
+    """Backfill(username, password, sink, checkpoint=None, processes=None).
+
+    Runner pulling the hourly usage of many accounts over many months.
+
+    The (account x month) grid is spread over a pool of processes, so the
+    parsing and costing of the rows run on every core. Each process logs in
+    once and fetches its months with a single request each. With ``rate``
+    set, every process takes its requests from one ``TokenBucket`` served by
+    a manager process. The sink receives each month in the parent process,
+    and the month is then recorded in the checkpoint, so that a backfill run
+    again after a crash skips the months already written. Only whole months
+    that have ended are recorded. A month cut by the range, or still
+    running, is fetched again by later runs.
+
+    Parameters
+    ----------
+    username: string
+        An srp account username.
+    password: string
+        An srp account password
+    sink : object
+        Receives ``sink.write(accountid, month, usage)`` for each month, where
+        month is ``"YYYY-MM"`` and usage a list of usage tuples.
+    checkpoint : string, optional
+        The checkpoint file. Without it every month is fetched.
+    processes : int, optional
+        The number of worker processes, the number of cores by default.
+    rate : float, optional
+        The requests per second shared by all the processes, unlimited if
+        None.
+    burst : int
+        The number of requests that can be sent at once after a pause.
+    is_tou : bool
+        indicate if usage is a time of use plan
+    **client_options
+        Passed on to the ``SrpEnergyClient`` of each process, such as
+        ``retry``.
+
+    Examples
+    --------
+    >>> from srpenergy.backfill import Backfill, CsvSink
+    >>>
+    >>> backfill = Backfill(
+    ...     username,
+    ...     password,
+    ...     CsvSink("history"),
+    ...     checkpoint="history/checkpoint.jsonl",
+    ...     rate=2.0,
+    ... )
+    >>> result = backfill.run(accountids, datetime(2020, 1, 1), datetime(2023, 12, 31))
+    >>> for (accountid, month), error in result.failed.items():
+    ...     print(f"{accountid} {month} failed: {error}")
+
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        username,
+        password,
+        sink,
+        checkpoint=None,
+        processes=None,
+        rate=None,
+        burst=1,
+        is_tou=False,
+        **client_options,
+    ):
+        if processes is not None and processes < 1:
+            raise ValueError("Parameter processes must be greater than 0.")
+
+        self.username = username
+        self.password = password
+        self.sink = sink
+        self.checkpoint = Checkpoint(checkpoint) if checkpoint is not None else None
+        self.processes = processes
+        self.rate = rate
+        self.burst = burst
+        self.is_tou = is_tou
+        self.client_options = client_options
+
+    def _plan(self, accountids, startdate, enddate):
+        """Return the (accountid, month, begin, end, is_closed) tasks to fetch."""
+        today = datetime.now(SRP_TIMEZONE).date()
+        tasks = []
+        for accountid in accountids:
+            for month, begin_date, end_date in _month_windows(startdate, enddate):
+                if self.checkpoint is None or (accountid, month) not in self.checkpoint:
+                    is_closed = _is_closed_month(begin_date, end_date, today)
+                    tasks.append((accountid, month, begin_date, end_date, is_closed))
+
+        return tasks
+
+    def run(self, accountids, startdate, enddate):
+        """Fetch and write the usage of accounts over a date range.
+
+        Parameters
+        ----------
+        accountids : iterable of string
+            the srp account ids, which must belong to the login
+        startdate : datetime
+            the start date
+        enddate : datetime
+            the end date
+
+        Returns
+        -------
+        BackfillResult
+            The number of months fetched and skipped, and the exception of
+            each failed (accountid, month). Failed months are not recorded
+            in the checkpoint, so running again retries them.
+
+        Raises
+        ------
+        ValueError
+            If an account id is not valid,
+            or if ``startdate`` or ``enddate`` are not datetime,
+            or if ``startdate`` is greater than ``enddate``,
+            or if ``startdate`` is greater than now.
+
+        """
+        accountids = list(dict.fromkeys(accountids))
+        for accountid in accountids:
+            _validate_accountid(accountid)
+
+        _validate_date_range(startdate, enddate)
+
+        tasks = self._plan(accountids, startdate, enddate)
+        skipped = len(accountids) * len(list(_month_windows(startdate, enddate)))
+        skipped -= len(tasks)
+        if not tasks:
+            return BackfillResult(0, skipped, {})
+
+        credentials = (accountids[0], self.username, self.password)
+        if self.rate is None:
+            return self._run_pool(tasks, skipped, credentials, None)
+
+        with _LimiterManager() as manager:
+            return self._run_pool(
+                tasks,
+                skipped,
+                credentials,
+                manager.TokenBucket(self.rate, self.burst),
+            )
+
+    def _run_pool(self, tasks, skipped, credentials, limiter):
+        """Fetch the tasks over the process pool, writing each as it completes."""
+        fetched = 0
+        failed = {}
+        with ProcessPoolExecutor(
+            max_workers=self.processes,
+            initializer=_init_worker,
+            initargs=(credentials, self.is_tou, limiter, self.client_options),
+        ) as pool:
+            pending = {
+                pool.submit(_fetch_month, accountid, begin_date, end_date): (
+                    accountid,
+                    month,
+                    is_closed,
+                )
+                for accountid, month, begin_date, end_date, is_closed in tasks
+            }
+            while pending:
+                done, _not_done = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    accountid, month, is_closed = pending.pop(future)
+                    try:
+                        self.sink.write(accountid, month, future.result())
+                    except Exception as error:  # pylint: disable=W0703
+                        failed[accountid, month] = error
+                        continue
+
+                    # A partial month is fetched again by later runs.
+                    if self.checkpoint is not None and is_closed:
+                        self.checkpoint.add(accountid, month)
+
+                    fetched += 1
+
+        return BackfillResult(fetched, skipped, failed)
+
+
+def main(argv=None):
+    """Backfill accounts from the command line.
+
+    The login is read from the ``SRP_USER_NAME`` and ``SRP_PASSWORD``
+    environment variables.
+    """
+    parser = argparse.ArgumentParser(description="Backfill SRP hourly usage.")
+    parser.add_argument("accountids", nargs="+")
+    parser.add_argument("--start", type=datetime.fromisoformat, required=True)
+    parser.add_argument("--end", type=datetime.fromisoformat, required=True)
+    parser.add_argument("--output", required=True, help="directory of the CSV files")
+    parser.add_argument("--checkpoint", help="checkpoint file to resume from")
+    parser.add_argument("--processes", type=int)
+    parser.add_argument("--rate", type=float, help="requests per second")
+    parser.add_argument("--tou", action="store_true", help="time of use plan")
+    args = parser.parse_args(argv)
+
+    backfill = Backfill(
+        os.environ["SRP_USER_NAME"],
+        os.environ["SRP_PASSWORD"],
+        CsvSink(args.output),
+        checkpoint=args.checkpoint,
+        processes=args.processes,
+        rate=args.rate,
+        is_tou=args.tou,
+    )
+    result = backfill.run(args.accountids, args.start, args.end)
+
+    print(f"Fetched {result.fetched} months, skipped {result.skipped}.")
+    for (accountid, month), error in sorted(result.failed.items()):
+        print(f"{accountid} {month} failed: {error}")
+
+    return 1 if result.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+"""Cache module.
+
+This module houses a local on-disk cache of hourly usage, used by the client
+to avoid downloading closed days again.
+
+"""
+
+from datetime import datetime, timedelta
+import json
+import sqlite3
+import threading
+import time
+import zlib
+
+from srpenergy.client import SRP_TIMEZONE
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MUTABLE_DAYS = 2
+DEFAULT_RECENT_TTL = 15 * 60
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS usage_days (
+    accountid TEXT NOT NULL,
+    day TEXT NOT NULL,
+    rows BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (accountid, day)
+)
+"""
+
+
+class UsageCache:
+    """UsageCache(path, max_bytes, mutable_days, recent_ttl).
+
+    SQLite cache of raw ``hourlyUsageList`` rows keyed by account id and day.
+
+    Closed days never change, so a day fetched after it closed is served
+    from the cache until it is evicted. The most recent ``mutable_days``
+    days, including today in SRP local time, may still receive data. They are only served
+    while younger than ``recent_ttl`` seconds. When the compressed rows
+    exceed ``max_bytes`` the least recently used days are evicted.
+
+    Parameters
+    ----------
+    path : string
+        The SQLite database file, or ``":memory:"``.
+    max_bytes : int
+        The maximum size of the compressed rows kept.
+    mutable_days : int
+        The number of most recent days that are still changing.
+    recent_ttl : float
+        The number of seconds a still changing day is served.
+
+    Attributes
+    ----------
+    hits : int
+        The number of days served from the cache.
+    misses : int
+        The number of days not found or expired.
+
+    Examples
+    --------
+    >>> from srpenergy.cache import UsageCache
+    >>> from srpenergy.client import SrpEnergyClient
+    >>>
+    >>> cache = UsageCache("srpenergy-usage.sqlite")
+    >>> client = SrpEnergyClient(accountid, username, password, cache=cache)
+    >>> usage = client.usage(start_date, end_date)
+    >>> print(cache.stats())
+    {'hits': 0, 'misses': 3, 'days': 3, 'bytes': 2150}
+
+    """
+
+    def __init__(
+        self,
+        path,
+        max_bytes=DEFAULT_MAX_BYTES,
+        mutable_days=DEFAULT_MUTABLE_DAYS,
+        recent_ttl=DEFAULT_RECENT_TTL,
+    ):
+        if max_bytes < 1:
+            raise ValueError("Parameter max_bytes must be greater than 0.")
+
+        if mutable_days < 0:
+            raise ValueError("Parameter mutable_days can not be negative.")
+
+        self.max_bytes = max_bytes
+        self.mutable_days = mutable_days
+        self.recent_ttl = recent_ttl
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(_SCHEMA)
+        self._connection.commit()
+
+    def __enter__(self):
+        """Return the cache for use as a context manager."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Close the cache on exit."""
+        self.close()
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def _is_fresh(self, day, fetched_at, now):
+        """Return True if a day fetched at ``fetched_at`` can be served."""
+        # Days close at midnight in Arizona, whatever the machine timezone.
+        closed_at = datetime.combine(
+            day + timedelta(days=self.mutable_days),
+            datetime.min.time(),
+            tzinfo=SRP_TIMEZONE,
+        ).timestamp()
+
+        # A day fetched once closed is final, otherwise it expires.
+        return fetched_at >= closed_at or now - fetched_at < self.recent_ttl
+
+    def get_days(self, accountid, days):
+        """Return the cached rows of the given days.
+
+        Parameters
+        ----------
+        accountid : string
+            An srp account id.
+        days : list of date
+            The days to look up.
+
+        Returns
+        -------
+        dict
+            The rows of each fresh cached day, keyed by date.
+
+        """
+        now = time.time()
+        keys = {day.isoformat(): day for day in days}
+
+        with self._lock:
+            cursor = self._connection.execute(
+                "SELECT day, rows, fetched_at FROM usage_days "
+                "WHERE accountid = ? AND day BETWEEN ? AND ?",
+                (accountid, min(keys), max(keys)),
+            )
+            cached = {}
+            for key, rows, fetched_at in cursor:
+                day = keys.get(key)
+                if day is not None and self._is_fresh(day, fetched_at, now):
+                    cached[day] = json.loads(zlib.decompress(rows))
+
+            self._connection.executemany(
+                "UPDATE usage_days SET accessed_at = ? WHERE accountid = ? AND day = ?",
+                [(now, accountid, day.isoformat()) for day in cached],
+            )
+            self._connection.commit()
+
+            self.hits += len(cached)
+            self.misses += len(keys) - len(cached)
+
+        return cached
+
+    def put_day(self, accountid, day, rows):
+        """Store the rows of a day, then evict days over the size limit.
+
+        Parameters
+        ----------
+        accountid : string
+            An srp account id.
+        day : date
+            The day of the rows.
+        rows : list of dict
+            The raw ``hourlyUsageList`` rows of the day.
+
+        """
+        now = time.time()
+        blob = zlib.compress(json.dumps(rows, separators=(",", ":")).encode())
+
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO usage_days VALUES (?, ?, ?, ?, ?, ?)",
+                (accountid, day.isoformat(), blob, len(blob), now, now),
+            )
+            self._evict()
+            self._connection.commit()
+
+    def _evict(self):
+        """Delete the least recently used days over ``max_bytes``."""
+        (total,) = self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM usage_days"
+        ).fetchone()
+        if total <= self.max_bytes:
+            return
+
+        cursor = self._connection.execute(
+            "SELECT accountid, day, size FROM usage_days ORDER BY accessed_at"
+        )
+        evicted = []
+        for accountid, day, size in cursor:
+            if total <= self.max_bytes:
+                break
+
+            evicted.append((accountid, day))
+            total -= size
+
+        self._connection.executemany(
+            "DELETE FROM usage_days WHERE accountid = ? AND day = ?", evicted
+        )
+
+    def stats(self):
+        """Return the hit and miss counters and the size of the cache.
+
+        Returns
+        -------
+        dict
+            With the keys ``hits``, ``misses``, ``days`` and ``bytes``.
+
+        """
+        with self._lock:
+            days, size = self._connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM usage_days"
+            ).fetchone()
+
+        return {"hits": self.hits, "misses": self.misses, "days": days, "bytes": size}
+
+    def clear(self):
+        """Delete every cached day and reset the counters."""
+        with self._lock:
+            self._connection.execute("DELETE FROM usage_days")
+            self._connection.commit()
+            self.hits = 0
+            self.misses = 0
@@ -4,12 +4,36 @@ This module houses the main class used to fetch energy usage.
 
 """
 
-from datetime import datetime, timedelta
+from __future__ import annotations
+
+from array import array
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+import importlib
+import json
 import re
+import threading
+from time import sleep
+from typing import TYPE_CHECKING, NamedTuple
 from urllib.parse import unquote
 
-from dateutil.parser import parse
-import requests
+from srpenergy.retry import RetryPolicy
+from srpenergy.trace import NULL_SPAN
+
+if TYPE_CHECKING:
+    import requests
+
+# Heavy dependencies, imported on first use so that the rate functions load
+# without the HTTP stack. Each name maps to its module, and attribute if any.
+_LAZY_IMPORTS = {
+    "ijson": ("ijson", None),
+    "np": ("numpy", None),
+    "orjson": ("orjson", None),
+    "parse": ("dateutil.parser", "parse"),
+    "requests": ("requests", None),
+}
+_OPTIONAL_IMPORTS = frozenset(("ijson", "np", "orjson"))
 
 BASE_USAGE_URL = "https://myaccount.srpnet.com/myaccountapi/api/"
 
@@ -25,7 +49,17 @@ BROWSER_HEADERS = {
     "Connection": "keep-alive",
     "Referer": BASE_USAGE_URL,
 }
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_POOL_SIZE = 10
+DEFAULT_SYNC_DAYS = 2
+HTTP_UNAUTHORIZED_ERROR = 401
 HTTP_FORBIDDEN_ERROR = 403
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# SRP reports usage in Arizona time, which does not observe daylight saving.
+SRP_TIMEZONE = timezone(timedelta(hours=-7), "MST")
+# The length of the naive ``YYYY-MM-DDTHH:MM:SS`` times SRP reports.
+ISO_SIZE = 19
 
 # Peak hours
 SUMMER_PEAK_START = 14  # 2 PM
@@ -35,16 +69,97 @@ WINTER_PEAK_MORNING_END = 9  # 9 AM
 WINTER_PEAK_EVENING_START = 17  # 5 PM
 WINTER_PEAK_EVENING_END = 21  # 9 PM
 
+# Prices as (peak, off peak) in $/kWh
+PEAK_SUMMER_RATES = (0.2409, 0.073)
+SUMMER_RATES = (0.2094, 0.0727)
+WINTER_RATES = (0.0951, 0.0691)
+
+# Seasons
+SEASON_WINTER = 0  # Nov-Apr
+SEASON_SUMMER = 1  # May-Oct
+SEASON_PEAK_SUMMER = 2  # Jul,Aug
+
+SEASON_RATES = {
+    SEASON_WINTER: WINTER_RATES,
+    SEASON_SUMMER: SUMMER_RATES,
+    SEASON_PEAK_SUMMER: PEAK_SUMMER_RATES,
+}
+
+SEASON_PEAK_HOURS = {
+    SEASON_WINTER: tuple(
+        WINTER_PEAK_MORNING_START <= hour < WINTER_PEAK_MORNING_END
+        or WINTER_PEAK_EVENING_START <= hour < WINTER_PEAK_EVENING_END
+        for hour in range(24)
+    ),
+    SEASON_SUMMER: tuple(
+        SUMMER_PEAK_START <= hour < SUMMER_PEAK_END for hour in range(24)
+    ),
+}
+SEASON_PEAK_HOURS[SEASON_PEAK_SUMMER] = SEASON_PEAK_HOURS[SEASON_SUMMER]
+
+RATE_CALENDAR_CACHE_SIZE = 16
+
+
+def _import_lazy(name):
+    """Import a heavy dependency, or return None for a missing speedup."""
+    module_name, attribute = _LAZY_IMPORTS[name]
+    try:
+        value = importlib.import_module(module_name)
+    except ImportError:
+        if name not in _OPTIONAL_IMPORTS:
+            raise
+
+        return None
+
+    return value if attribute is None else getattr(value, attribute)
+
+
+def _lazy(name, namespace=None):
+    """Return a heavy dependency of a module, importing it on first use.
+
+    The dependency is then kept in the module ``namespace``, the globals of
+    this module by default, where tests can patch it.
+    """
+    if namespace is None:
+        namespace = globals()
+
+    try:
+        return namespace[name]
+    except KeyError:
+        value = namespace[name] = _import_lazy(name)
+        return value
+
+
+def __getattr__(name):
+    """Import a heavy dependency on first use, then keep it as a global."""
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    return _lazy(name)
+
+
+def parse_usage_time(value):
+    """Return the datetime of an iso date.
+
+    SRP dates use the fixed ``YYYY-MM-DDTHH:MM:SS`` format, which is parsed
+    with ``datetime.fromisoformat``. Other formats fall back to
+    ``dateutil.parser.parse``.
+    """
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return _lazy("parse")(value)
+
 
 def get_pretty_date(date_part):
     """Return a formatted date from an iso date."""
-    date = parse(date_part)
+    date = parse_usage_time(date_part)
     return date.strftime("%m/%d/%Y")
 
 
 def get_pretty_time(date_part):
     """Return a formatted time from an iso date."""
-    date = parse(date_part)
+    date = parse_usage_time(date_part)
     return date.strftime("%H:%M %p")
 
 
@@ -65,85 +180,559 @@ def get_rate(str_usage_time):
     Labor Day, Thanksgiving Day and Christmas Day.
 
     see https://srpnet.com/prices/pdfx/April2015/E-26.pdf
+
+    A time with a timezone offset is converted to SRP local time.
     """
     # Validate parameters
     if str_usage_time is None:
         raise TypeError("Parameter str_usage_time can not be none.")
 
     try:
-        usage_time = parse(str_usage_time)
+        usage_time = parse_usage_time(str_usage_time)
     except ValueError as error:
         raise ValueError(
             "Parameter str_usage_time should be parsed as a datetime."
         ) from error
 
-    summer_start_date = datetime(usage_time.year, 5, 1, 0, 0, 0)
-    summer_end_date = datetime(usage_time.year, 11, 1, 0, 0, 0) - timedelta(seconds=1)
+    return _get_rate(usage_time)
 
-    peak_summer_start_date = datetime(usage_time.year, 7, 1, 0, 0, 0)
-    peak_summer_end_date = datetime(usage_time.year, 9, 1, 0, 0, 0) - timedelta(
-        seconds=1
-    )
 
-    week_day_idx = usage_time.weekday()
+def _get_rate(usage_time):
+    """Return the time of use pricing for the given datetime."""
+    usage_time = _srp_local_time(usage_time)
+    calendar = get_rate_calendar(usage_time.year)
+
+    return calendar.lookup(usage_time.timetuple().tm_yday, usage_time.hour)
+
+
+def _srp_local_time(usage_time):
+    """Return a datetime as a naive SRP local time, converting aware ones."""
+    if usage_time.tzinfo is None:
+        return usage_time
+
+    return usage_time.astimezone(SRP_TIMEZONE).replace(tzinfo=None)
+
+
+def _has_offset(value):
+    """Return True if a time string or datetime carries a timezone."""
+    if isinstance(value, datetime):
+        return value.tzinfo is not None
+
+    if isinstance(value, str):
+        # Past the date part, a sign or Z can only start an offset.
+        tail = value[10:]
+        return "+" in tail or "-" in tail or "Z" in tail
+
+    return False
+
+
+def _datetime64_array(np, timestamps):
+    """Return times as a ``datetime64[s]`` array of naive SRP local times.
+
+    NumPy reads times with an offset as UTC, so when any is present the times
+    are converted to SRP local time one by one first.
+    """
+    if isinstance(timestamps, np.ndarray):
+        if timestamps.dtype.kind == "M":
+            return timestamps.astype("datetime64[s]")
+
+        timestamps = timestamps.tolist()
+    else:
+        timestamps = list(timestamps)
+
+    # Strings no longer than YYYY-MM-DDTHH:MM:SS can not hold an offset.
+    try:
+        is_naive = max(map(len, timestamps), default=0) <= ISO_SIZE
+    except TypeError:
+        is_naive = False
+
+    if not is_naive and any(map(_has_offset, timestamps)):
+        timestamps = [
+            _srp_local_time(
+                timestamp
+                if isinstance(timestamp, datetime)
+                else parse_usage_time(timestamp)
+            )
+            for timestamp in timestamps
+        ]
+
+    return np.asarray(timestamps, dtype="datetime64[s]")
+
+
+def is_holiday(day):
+    """Return True if a date is one of the six observed off-peak holidays.
+
+    The holidays are New Year's Day, Memorial Day, Independence Day,
+    Labor Day, Thanksgiving Day and Christmas Day.
+
+    .. note::
+        The rules match the ones the client has always applied: every
+        Thursday in November counts as Thanksgiving and Christmas is
+        observed on December 24.
+    """
+    week_day_idx = day.weekday()
 
     # Holidays (New Years, Independence, Memorial, Labor, Thanks, Christmas)
-    is_holiday = usage_time.month == 1 and usage_time.day == 1
-    is_holiday = is_holiday or (usage_time.day == 4 and usage_time.month == 7)  # noqa: PLR2004
-    is_holiday = is_holiday or (
-        usage_time.month == 5 and (week_day_idx == 0 and (31 - usage_time.day) < 7)  # noqa: PLR2004
+    is_holiday_day = day.month == 1 and day.day == 1
+    is_holiday_day = is_holiday_day or (day.day == 4 and day.month == 7)  # noqa: PLR2004
+    is_holiday_day = is_holiday_day or (
+        day.month == 5 and (week_day_idx == 0 and (31 - day.day) < 7)  # noqa: PLR2004
+    )
+    is_holiday_day = is_holiday_day or (
+        day.month == 9 and (week_day_idx == 0 and (day.day <= 7))  # noqa: PLR2004
     )
-    is_holiday = is_holiday or (
-        usage_time.month == 9 and (week_day_idx == 0 and (usage_time.day <= 7))  # noqa: PLR2004
+    is_holiday_day = is_holiday_day or (day.month == 11 and week_day_idx == 3)  # noqa: PLR2004
+    return is_holiday_day or (day.month == 12 and day.day == 24)  # noqa: PLR2004
+
+
+def get_season(day):
+    """Return the time of use season of a date."""
+    if 7 <= day.month <= 8:  # noqa: PLR2004
+        return SEASON_PEAK_SUMMER
+
+    if 5 <= day.month <= 10:  # noqa: PLR2004
+        return SEASON_SUMMER
+
+    return SEASON_WINTER
+
+
+class RateCalendar:
+    """RateCalendar(year).
+
+    Time of use pricing for every hour of one year.
+
+    The calendar holds a per-day table of seasons and holiday flags, and a
+    per-hour table of rates and peak flags indexed by
+    ``(ordinal_day - 1) * 24 + hour``. Use ``get_rate_calendar`` to share
+    calendars instead of building them directly.
+
+    Parameters
+    ----------
+    year : int
+        The calendar year.
+
+    """
+
+    def __init__(self, year):
+        self.year = year
+
+        first_day = datetime(year, 1, 1)
+        day_count = (datetime(year + 1, 1, 1) - first_day).days
+
+        self.seasons = bytearray(day_count)
+        self.holidays = bytearray(day_count)
+        self.rates = array("d")
+        self.peaks = array("b")
+
+        for day_idx in range(day_count):
+            day = first_day + timedelta(days=day_idx)
+            season = get_season(day)
+            holiday = is_holiday(day)
+            is_off_peak_day = holiday or day.weekday() > 4  # noqa: PLR2004
+
+            self.seasons[day_idx] = season
+            self.holidays[day_idx] = holiday
+
+            peak_rate, non_peak_rate = SEASON_RATES[season]
+            for is_peak_hour in SEASON_PEAK_HOURS[season]:
+                is_peak = is_peak_hour and not is_off_peak_day
+                self.rates.append(peak_rate if is_peak else non_peak_rate)
+                self.peaks.append(is_peak)
+
+    def lookup(self, ordinal_day, hour):
+        """Return the (rate, is_peak) for an hour of a day of the year."""
+        idx = (ordinal_day - 1) * 24 + hour
+
+        return self.rates[idx], bool(self.peaks[idx])
+
+
+@lru_cache(maxsize=RATE_CALENDAR_CACHE_SIZE)
+def get_rate_calendar(year):
+    """Return the shared ``RateCalendar`` of a year.
+
+    Calendars are built on first use and the most recently used ones are
+    kept in a bounded cache.
+    """
+    return RateCalendar(year)
+
+
+def get_rates(timestamps):
+    """Return the time of use pricing for many times at once.
+
+    The result matches calling ``get_rate`` for each time. With NumPy
+    installed the times are classified with vectorized array operations,
+    otherwise they are classified one by one.
+
+    Parameters
+    ----------
+    timestamps : iterable
+        ISO formatted strings, datetimes or a ``datetime64`` array. Times
+        with a timezone are converted to SRP local time.
+
+    Returns
+    -------
+    tuple of arrays
+        In the form of (rates, is_peak). NumPy ``float64`` and ``bool`` arrays
+        with NumPy, otherwise ``array('d')`` and ``array('b')``.
+
+    Examples
+    --------
+    >>> from srpenergy.client import get_rates
+    >>> rates, is_peak = get_rates(["2020-06-24T01:00:00", "2020-06-24T15:00:00"])
+    >>> rates
+    array([0.0727, 0.2094])
+    >>> is_peak
+    array([False,  True])
+
+    """
+    if timestamps is None:
+        raise TypeError("Parameter timestamps can not be none.")
+
+    np = _lazy("np")
+    if np is None:
+        rates = array("d")
+        peaks = array("b")
+        for timestamp in timestamps:
+            if isinstance(timestamp, datetime):
+                rate, is_peak = _get_rate(timestamp)
+            else:
+                rate, is_peak = get_rate(timestamp)
+
+            rates.append(rate)
+            peaks.append(is_peak)
+
+        return rates, peaks
+
+    try:
+        values = _datetime64_array(np, timestamps)
+    except ValueError as error:
+        raise ValueError(
+            "Parameter timestamps should be parsed as datetimes."
+        ) from error
+
+    years = values.astype("datetime64[Y]")
+    idx = (values.astype("datetime64[h]") - years).astype(int)
+    year = years.astype(int) + 1970
+
+    rates = np.empty(values.shape, dtype=float)
+    is_peak = np.empty(values.shape, dtype=bool)
+    for calendar_year in np.unique(year):
+        calendar = get_rate_calendar(int(calendar_year))
+        in_year = year == calendar_year
+        rates[in_year] = np.frombuffer(calendar.rates, dtype=float)[idx[in_year]]
+        is_peak[in_year] = np.frombuffer(calendar.peaks, dtype=np.int8)[
+            idx[in_year]
+        ].astype(bool)
+
+    return rates, is_peak
+
+
+def create_adapter(pool_maxsize=DEFAULT_POOL_SIZE, pool_block=True):
+    """Return a connection pool to share between clients.
+
+    Parameters
+    ----------
+    pool_maxsize : int
+        The maximum number of connections kept open to SRP.
+    pool_block : bool
+        wait for a free connection instead of opening more than
+        ``pool_maxsize`` connections
+
+    Returns
+    -------
+    requests.adapters.HTTPAdapter
+
+    Examples
+    --------
+    >>> from srpenergy.client import SrpEnergyClient, create_adapter
+    >>>
+    >>> adapter = create_adapter(pool_maxsize=8)
+    >>> clients = [
+    ...     SrpEnergyClient(accountid, username, password, adapter=adapter)
+    ...     for accountid, username, password in accounts
+    ... ]
+
+    """
+    if pool_maxsize < 1:
+        raise ValueError("Parameter pool_maxsize must be greater than 0.")
+
+    # Every request goes to a single host, so one pool is enough.
+    return _lazy("requests").adapters.HTTPAdapter(
+        pool_connections=1, pool_maxsize=pool_maxsize, pool_block=pool_block
     )
-    is_holiday = is_holiday or (usage_time.month == 11 and week_day_idx == 3)  # noqa: PLR2004
-    is_holiday = is_holiday or (usage_time.month == 12 and usage_time.day == 24)  # noqa: PLR2004
 
-    is_weekend = week_day_idx > 4  # noqa: PLR2004
 
-    if peak_summer_start_date <= usage_time <= peak_summer_end_date:
-        # Check if is Peak Summer
+def _validate_credentials(accountid, username, password):
+    """Raise if the account id or credentials are not usable."""
+    _validate_accountid(accountid)
+
+    # Validate parameters
+    if username is None:
+        raise TypeError("Parameter username can not be none.")
+
+    if password is None:
+        raise TypeError("Parameter password can not be none.")
+
+    if not username:
+        raise ValueError("Parameter username must have length greater than 0.")
 
-        is_peak = SUMMER_PEAK_START <= usage_time.hour < SUMMER_PEAK_END
-        peak_rate = 0.2409
-        non_peak_rate = 0.073
+    if not password:
+        raise ValueError("Parameter password must have length greater than 0.")
 
-    elif summer_start_date <= usage_time <= summer_end_date:
-        # Check if regular Summer
 
-        # Is peak time
-        is_peak = SUMMER_PEAK_START <= usage_time.hour < SUMMER_PEAK_END
-        peak_rate = 0.2094
-        non_peak_rate = 0.0727
+def _validate_accountid(accountid):
+    """Raise if an account id is not usable."""
+    if accountid is None:
+        raise TypeError("Parameter account can not be none.")
 
+    if not accountid:
+        raise ValueError("Parameter accountid must have length greater than 0.")
+
+    if not re.match(r"^\d{9}$", accountid):
+        raise ValueError("Parameter account should only contain numbers.")
+
+
+def _validate_date_range(startdate, enddate, now=None):
+    """Raise if a usage date range is not valid.
+
+    ``now`` is the current time in the clock of the dates, the machine local
+    time by default.
+    """
+    # Validate parameters
+    if not isinstance(startdate, datetime):
+        raise ValueError("Parameter startdate must be datetime.")
+
+    if not isinstance(enddate, datetime):
+        raise ValueError("Parameter enddate must be datetime.")
+
+    # Validate date ranges
+    if startdate > enddate:
+        raise ValueError("Parameter startdate can not be greater than enddate.")
+
+    # Validate date ranges
+    if now is None:
+        is_future = startdate.timestamp() > datetime.now().timestamp()
     else:
-        # Must be winter
+        is_future = startdate > now
+
+    if is_future:
+        raise ValueError("Parameter startdate can not be greater than now.")
+
+
+def _split_date_range(startdate, enddate, chunk_days=None):
+    """Split a date range into consecutive ``(begin, end)`` date chunks.
+
+    The api works on whole days, so each chunk covers at most ``chunk_days``
+    calendar days and chunks never share a day.
+    """
+    return _split_days(startdate.date(), enddate.date(), chunk_days)
+
+
+def _split_days(begin_date, end_date, chunk_days=None):
+    """Split the days from ``begin_date`` to ``end_date`` into chunks."""
+    if chunk_days is None:
+        return [(begin_date, end_date)]
+
+    if chunk_days < 1:
+        raise ValueError("Parameter chunk_days must be greater than 0.")
+
+    chunks = []
+    while begin_date <= end_date:
+        chunk_end_date = min(begin_date + timedelta(days=chunk_days - 1), end_date)
+        chunks.append((begin_date, chunk_end_date))
+        begin_date = chunk_end_date + timedelta(days=1)
+
+    return chunks
+
+
+class _ChunkMerger:  # pylint: disable=R0903
+    """Merge consecutive chunks of rows in order, without duplicates.
+
+    Rows keep the order of the api response. A row is dropped when its date
+    is not later than the last date of the previous chunks, which removes the
+    rows repeated at chunk boundaries.
+    """
+
+    def __init__(self):
+        self.last_date = None
+
+    def merge(self, hourly_usage_list):
+        """Yield the new rows of the next chunk."""
+        boundary_date = self.last_date
+        for row in hourly_usage_list:
+            if boundary_date is not None and row["date"] <= boundary_date:
+                continue
+
+            if self.last_date is None or row["date"] > self.last_date:
+                self.last_date = row["date"]
+
+            yield row
+
+
+class _ChunkReader:  # pylint: disable=R0903
+    """File-like reader over an iterable of byte chunks.
+
+    The reader also records whether ``marker`` appeared in the bytes read.
+    """
+
+    def __init__(self, chunks, marker):
+        self._chunks = iter(chunks)
+        self._marker = marker
+        self._tail = b""
+        self.has_marker = False
+
+    def read(self, size=-1):
+        """Return the next non-empty chunk, or ``b""`` at the end.
+
+        A zero ``size`` is used by ``ijson`` to probe the data type and does
+        not consume a chunk.
+        """
+        if size == 0:
+            return b""
+
+        for chunk in self._chunks:
+            if chunk:
+                if not self.has_marker:
+                    self.has_marker = self._marker in self._tail + chunk
+                    self._tail = chunk[-len(self._marker) :]
+
+                return chunk
+
+        return b""
+
 
-        # Check if in Peak hours
-        is_peak = (
-            WINTER_PEAK_MORNING_START <= usage_time.hour < WINTER_PEAK_MORNING_END
-            or WINTER_PEAK_EVENING_START <= usage_time.hour < WINTER_PEAK_EVENING_END
+def _parse_hourly_usage(chunks, stream=False):
+    """Yield the rows of an ``usage/hourlydetail`` response body.
+
+    ``chunks`` is an iterable of the body bytes. By default the whole body is
+    decoded at once with ``orjson`` when available, or ``json``, which is the
+    fastest. With ``stream`` set and ``ijson`` installed the body is parsed
+    incrementally and only the ``hourlyUsageList`` rows are built, so other
+    lists such as ``demandList`` are skipped and the body is never held in
+    memory, at several times the parse time.
+    """
+    ijson = _lazy("ijson") if stream else None
+    if ijson is None:
+        orjson = _lazy("orjson")
+        body = b"".join(chunks)
+        data = orjson.loads(body) if orjson is not None else json.loads(body)
+        if "hourlyUsageList" not in data:
+            raise SrpEnergyError("Usage response has no hourlyUsageList.")
+
+        yield from data["hourlyUsageList"]
+        return
+
+    reader = _ChunkReader(chunks, b'"hourlyUsageList"')
+    has_rows = False
+    for row in ijson.items(reader, "hourlyUsageList.item", use_float=True):
+        has_rows = True
+        yield row
+
+    if not has_rows and not reader.has_marker:
+        raise SrpEnergyError("Usage response has no hourlyUsageList.")
+
+
+def _iter_response_rows(response, stream=False):
+    """Yield the hourly usage rows of a response, then close it."""
+    try:
+        if stream:
+            chunks = response.iter_content(STREAM_CHUNK_SIZE)
+        else:
+            chunks = [response.content]
+
+        yield from _parse_hourly_usage(chunks, stream)
+
+    finally:
+        response.close()
+
+
+def _interleave(plans):
+    """Yield ``(key, item)`` pairs taking one item from each plan in turn."""
+    iterators = [(key, iter(items)) for key, items in plans.items()]
+    while iterators:
+        remaining = []
+        for key, items in iterators:
+            item = next(items, None)
+            if item is not None:
+                yield key, item
+                remaining.append((key, items))
+
+        iterators = remaining
+
+
+def _row_totals(row, tou_rate=None):
+    """Return the (kwh, cost) of a raw row, priced by a (rate, is_peak) if given."""
+    if tou_rate is not None:
+        rate, is_peak = tou_rate
+        total_kwh = row["onPeakKwh"] if is_peak else row["offPeakKwh"]
+
+        return total_kwh, total_kwh * rate
+
+    total_kwh = row["totalKwh"]
+    if total_kwh == 0:
+        # Build the total_kwh from separate fields for EZ-3.
+        total_kwh = (
+            row["onPeakKwh"]
+            + row["offPeakKwh"]
+            + row["shoulderKwh"]
+            + row["superOffPeakKwh"]
+        )
+
+    total_cost = row["totalCost"]
+    if total_cost == 0:
+        # Build the total_cost from separate fields for EZ-3.
+        total_cost = (
+            row["onPeakCost"]
+            + row["offPeakCost"]
+            + row["shoulderCost"]
+            + row["superOffPeakCost"]
         )
 
-        peak_rate = 0.0951
-        non_peak_rate = 0.0691
+    return total_kwh, total_cost
 
-    is_peak = is_peak and not is_holiday and not is_weekend
 
-    rate = peak_rate if is_peak else non_peak_rate
+def _convert_row(row, is_tou=False):
+    """Convert a raw ``hourlyUsageList`` row into a usage tuple."""
+    # Parse the date once for the rate and both pretty formats.
+    usage_time = parse_usage_time(row["date"])
 
-    return rate, is_peak
+    # Check if on Time of Use Plan
+    total_kwh, total_cost = _row_totals(row, _get_rate(usage_time) if is_tou else None)
+
+    return (
+        usage_time.strftime("%m/%d/%Y"),
+        usage_time.strftime("%H:%M %p"),
+        row["date"],
+        total_kwh,
+        round(total_cost, 2),
+    )
 
 
 class SrpEnergyError(Exception):
     """Raised when the SRP API returns an unexpected response."""
 
 
+class SyncResult(NamedTuple):
+    """The new usage rows of a ``sync`` and the watermark to resume from."""
+
+    usage: list
+    watermark: datetime
+
+
 class SrpEnergyClient:
     """SrpEnergyClient(accountid, username, password).
 
     Client used to fetch srp energy usage.
 
+    The client keeps a single authenticated session, so repeated calls to
+    ``validate()`` and ``usage()`` reuse the same login cookies and XSRF token.
+    Call ``close()`` or use the client as a context manager to release it.
+    Clients given the same ``adapter`` keep their own cookies but reuse the
+    connections of one pool.
+
+    The client is thread safe. Threads share its login, and when the login
+    expires only the first rejected thread logs in again.
+
     Parameters
     ----------
     accountid : string
@@ -152,6 +741,23 @@ class SrpEnergyClient:
         An srp account username.
     password: string
         An srp account password
+    cache: UsageCache, optional
+        A cache of closed days used instead of downloading them again.
+    adapter: requests.adapters.HTTPAdapter, optional
+        A connection pool shared with other clients, as returned by
+        ``create_adapter``. It is not closed by ``close()``.
+    retry: RetryPolicy, optional
+        How requests failing for a transient reason are repeated.
+    limiter: TokenBucket, optional
+        A rate limiter shared with other clients, taken before each request.
+    tracer: Tracer, optional
+        An OpenTelemetry tracer or ``CallbackTracer`` timing each step.
+    base_url: string, optional
+        The root of the SRP api, changed to target a local stand-in.
+    stream: bool
+        Parse each usage body while it is downloaded, with ``ijson`` when
+        installed. It bounds the memory of very long ranges but parses
+        several times slower than decoding the whole body with ``orjson``.
 
     Methods
     -------
@@ -159,36 +765,81 @@ class SrpEnergyClient:
         Validate user credentials.
     usage(startdate, enddate)
         Get the usage for a given date range.
+    iter_usage(startdate, enddate)
+        Iterate over the usage for a given date range.
+    usage_frame(startdate, enddate)
+        Get the usage for a given date range as a compact ``UsageFrame``.
+    usage_arrow(startdate, enddate)
+        Get the usage for a given date range as an Arrow table.
+    usage_df(startdate, enddate)
+        Get the usage for a given date range as a DataFrame.
+    sync(since)
+        Get the usage completed since a watermark.
+    usage_many(accountids, startdate, enddate)
+        Get the usage of several billing accounts sharing the login.
+    close()
+        Close the authenticated session.
 
     """
 
-    def __init__(self, accountid, username, password):
-
-        # Validate parameters
-        if accountid is None:
-            raise TypeError("Parameter account can not be none.")
-
-        if username is None:
-            raise TypeError("Parameter username can not be none.")
-
-        if password is None:
-            raise TypeError("Parameter password can not be none.")
-
-        if not accountid:
-            raise ValueError("Parameter accountid must have length greater than 0.")
-
-        if not username:
-            raise ValueError("Parameter username must have length greater than 0.")
-
-        if not password:
-            raise ValueError("Parameter password must have length greater than 0.")
-
-        if not re.match(r"^\d{9}$", accountid):
-            raise ValueError("Parameter account should only contain numbers.")
+    def __init__(  # noqa: PLR0913
+        self,
+        accountid,
+        username,
+        password,
+        cache=None,
+        adapter=None,
+        retry=None,
+        limiter=None,
+        tracer=None,
+        base_url=BASE_USAGE_URL,
+        stream=False,
+    ):
+
+        _validate_credentials(accountid, username, password)
 
         self.accountid = accountid
         self.username = username
         self.password = password
+        self.base_url = base_url
+        self.stream = stream
+        self.cache = cache
+        self.watermarks = {}
+
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.limiter = limiter
+        self.tracer = tracer
+
+        self._adapter = adapter
+        self._retry_budget = self.retry.budget
+        self._retry_lock = threading.Lock()
+        self._login_lock = threading.RLock()
+        self._login_generation = 0
+        self._session = None
+        self._is_authorized = False
+        self._xsrf_token = None
+
+    def __enter__(self):
+        """Return the client for use as a context manager."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Close the authenticated session on exit."""
+        self.close()
+
+    def close(self):
+        """Close the authenticated session and discard cached credentials."""
+        if self._session is not None:
+            # Leave a shared adapter open for the other clients.
+            for prefix, adapter in list(self._session.adapters.items()):
+                if adapter is self._adapter:
+                    del self._session.adapters[prefix]
+
+            self._session.close()
+
+        self._session = None
+        self._is_authorized = False
+        self._xsrf_token = None
 
     def _check_response(self, response: requests.Response, step: str) -> None:
         """Raise a clear error if a response indicates failure."""
@@ -201,14 +852,377 @@ class SrpEnergyClient:
             )
         try:
             response.raise_for_status()
-        except requests.HTTPError as e:
+        except _lazy("requests").HTTPError as e:
             raise SrpEnergyError(
                 f"HTTP error during '{step}': {e} — body: {response.text[:200]}"
             ) from e
 
+    def _get_session(self):
+        """Return the shared session, creating it on first use."""
+        if self._session is None:
+            with self._login_lock:
+                if self._session is None:
+                    session = _lazy("requests").Session()
+                    session.headers.update(BROWSER_HEADERS)
+                    if self._adapter is not None:
+                        session.mount(self.base_url, self._adapter)
+
+                    self._session = session
+
+        return self._session
+
+    def _take_retry(self, attempt):
+        """Return True if a failed attempt may be retried, spending the budget."""
+        if attempt >= self.retry.max_attempts:
+            return False
+
+        with self._retry_lock:
+            if self._retry_budget is None:
+                return True
+
+            if self._retry_budget < 1:
+                return False
+
+            self._retry_budget -= 1
+
+        return True
+
+    def _span(self, name):
+        """Return a span timing a step, or a span doing nothing without tracer."""
+        if self.tracer is None:
+            return NULL_SPAN
+
+        return self.tracer.start_as_current_span(name)
+
+    def _send(self, method, url, **kwargs):
+        """Send a request, repeating it on transient failures."""
+        with self._span(url.removeprefix(self.base_url)) as span:
+            response, retries = self._send_attempts(method, url, **kwargs)
+            span.set_attribute("http.status_code", response.status_code)
+            span.set_attribute("srp.retries", retries)
+
+        return response
+
+    def _send_attempts(self, method, url, **kwargs):
+        """Return the response of a request and the number of retries it took."""
+        requests = _lazy("requests")
+        params = kwargs.get("params") or {}
+        key = params.get("billaccount", self.accountid)
+
+        attempt = 1
+        while True:
+            if self.limiter is not None:
+                self.limiter.acquire(key)
+
+            try:
+                response = getattr(self._get_session(), method)(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if not self._take_retry(attempt):
+                    raise
+
+                delay = self.retry.delay(attempt)
+            else:
+                if not self.retry.is_retryable(response) or not self._take_retry(
+                    attempt
+                ):
+                    return response, attempt - 1
+
+                delay = self.retry.delay(attempt, response)
+                response.close()
+
+            sleep(delay)
+            attempt += 1
+
+    def _authorize(self):
+        """Post the user credentials and return the login payload."""
+        self._is_authorized = False
+        self._xsrf_token = None
+
+        response = self._send(
+            "post",
+            self.base_url + "login/authorize",
+            data={"username": self.username, "password": self.password},
+        )
+        self._check_response(response, "login/authorize")
+        data = response.json()
+
+        self._is_authorized = True
+        return data
+
+    def _fetch_xsrf_token(self):
+        """Fetch the XSRF token for the authorized session.
+
+        Returns ``None`` when the antiforgerytoken response has no
+        ``xsrf-token`` cookie, which usually means the login expired.
+        """
+        response = self._send("get", self.base_url + "login/antiforgerytoken")
+
+        if "xsrf-token" not in response.cookies:
+            return None
+
+        return unquote(response.cookies["xsrf-token"])
+
+    def _login(self):
+        """Make sure the session is authorized and holds an XSRF token.
+
+        A reused authorization that no longer yields an XSRF token is
+        considered expired and is renewed once. Threads wait for the login
+        in progress instead of starting their own.
+        """
+        if self._xsrf_token is not None:
+            return
+
+        with self._login_lock:
+            if self._xsrf_token is None:
+                self._login_locked()
+
+    def _login_locked(self):
+        """Log in while holding the login lock."""
+        is_reused = self._is_authorized
+        if not is_reused:
+            self._authorize()
+
+        xsrf_token = self._fetch_xsrf_token()
+        if xsrf_token is None and is_reused:
+            self._authorize()
+            xsrf_token = self._fetch_xsrf_token()
+
+        if xsrf_token is None:
+            self._is_authorized = False
+            raise SrpEnergyError(
+                "XSRF token cookie missing after antiforgerytoken request. "
+                f"Cookies received: {list(self._session.cookies.keys())}"
+            )
+
+        self._xsrf_token = xsrf_token
+        self._login_generation += 1
+
+    def _relogin(self, generation):
+        """Log in again after the login of ``generation`` was rejected.
+
+        Only the first thread rejected with a login logs in again, the others
+        find a newer generation and reuse its token.
+        """
+        with self._login_lock:
+            if self._login_generation == generation:
+                self._is_authorized = False
+                self._xsrf_token = None
+
+            self._login()
+
+    def _get_hourly_usage(self, accountid, str_startdate, str_enddate):
+        """Request the hourly usage using the current XSRF token."""
+        return self._send(
+            "get",
+            self.base_url + "usage/hourlydetail",
+            params={
+                "billaccount": accountid,
+                "beginDate": str_startdate,
+                "endDate": str_enddate,
+            },
+            headers={"x-xsrf-token": self._xsrf_token},
+            stream=True,
+        )
+
+    def _fetch_hourly_usage(self, accountid, begin_date, end_date, preload=False):
+        """Return an iterator over the raw ``hourlyUsageList`` for a date range.
+
+        With ``stream`` set on the client the body is parsed while it is read
+        from the connection, unless ``preload`` is set, in which case it is
+        downloaded before returning.
+        If a reused login is rejected with a 401 or 403 the client
+        authenticates again and retries the request once.
+        """
+        # Convert dates to strings
+        str_startdate = begin_date.strftime("%m-%d-%Y")
+        str_enddate = end_date.strftime("%m-%d-%Y")
+
+        is_reused = self._xsrf_token is not None
+        self._login()
+        # Read before the token is sent, so a rejected token is never newer.
+        generation = self._login_generation
+
+        response = self._get_hourly_usage(accountid, str_startdate, str_enddate)
+        if is_reused and response.status_code in (
+            HTTP_UNAUTHORIZED_ERROR,
+            HTTP_FORBIDDEN_ERROR,
+        ):
+            response.close()
+            self._relogin(generation)
+            response = self._get_hourly_usage(accountid, str_startdate, str_enddate)
+
+        self._check_response(response, "usage/hourlydetail")
+
+        if self.tracer is not None:
+            return self._read_traced(response)
+
+        if preload:
+            # Download the whole body in the calling worker thread.
+            _ = response.content
+
+        return _iter_response_rows(response, self.stream)
+
+    def _read_traced(self, response):
+        """Return an iterator over the rows of a response read within a span."""
+        size = 0
+
+        def count_bytes(chunks):
+            nonlocal size
+            for chunk in chunks:
+                size += len(chunk)
+                yield chunk
+
+        with self._span("usage/decode") as span:
+            try:
+                rows = list(
+                    _parse_hourly_usage(
+                        count_bytes(response.iter_content(STREAM_CHUNK_SIZE)),
+                        self.stream,
+                    )
+                )
+            finally:
+                response.close()
+
+            span.set_attribute("srp.bytes", size)
+            span.set_attribute("srp.rows", len(rows))
+
+        return iter(rows)
+
+    def _plan_chunks(self, accountid, startdate, enddate, chunk_days):
+        """Return the ``(accountid, begin, end, rows)`` chunks of a date range.
+
+        Without a cache every chunk is fetched and ``rows`` is ``None``.
+        With a cache, consecutive cached days form one chunk holding their
+        rows, and the missing days are split into chunks to fetch.
+        """
+        if self.cache is None:
+            return [
+                (accountid, begin_date, end_date, None)
+                for begin_date, end_date in _split_date_range(
+                    startdate, enddate, chunk_days
+                )
+            ]
+
+        if chunk_days is not None and chunk_days < 1:
+            raise ValueError("Parameter chunk_days must be greater than 0.")
+
+        begin_date = startdate.date()
+        days = [
+            begin_date + timedelta(days=offset)
+            for offset in range((enddate.date() - begin_date).days + 1)
+        ]
+        with self._span("cache/lookup") as span:
+            cached = self.cache.get_days(accountid, days)
+            span.set_attribute("srp.cache_hits", len(cached))
+            span.set_attribute("srp.cache_misses", len(days) - len(cached))
+
+        chunks = []
+        missing = []
+        for day in days:
+            if day not in cached:
+                missing.append(day)
+                continue
+
+            if missing:
+                chunks.extend(
+                    (accountid, begin, end, None)
+                    for begin, end in _split_days(missing[0], missing[-1], chunk_days)
+                )
+                missing = []
+
+            if chunks and chunks[-1][3] is not None:
+                _accountid, begin, _end, rows = chunks[-1]
+                chunks[-1] = (accountid, begin, day, rows + cached[day])
+            else:
+                chunks.append((accountid, day, day, cached[day]))
+
+        if missing:
+            chunks.extend(
+                (accountid, begin, end, None)
+                for begin, end in _split_days(missing[0], missing[-1], chunk_days)
+            )
+
+        return chunks
+
+    def _load_chunk(self, accountid, begin_date, end_date, rows=None, preload=False):
+        """Return an iterator over the raw rows of a planned chunk."""
+        if rows is not None:
+            return iter(rows)
+
+        hourly_usage_list = self._fetch_hourly_usage(
+            accountid, begin_date, end_date, preload
+        )
+        if self.cache is None:
+            return hourly_usage_list
+
+        return self._store_days(accountid, begin_date, end_date, hourly_usage_list)
+
+    def _store_days(self, accountid, begin_date, end_date, hourly_usage_list):
+        """Yield the rows while storing each day of the chunk in the cache.
+
+        Rows of days outside the chunk, such as the last hour of the previous
+        day repeated at a chunk boundary, are yielded but never stored, so they
+        can not replace a whole day with a few of its rows.
+        """
+        first_key = begin_date.isoformat()
+        last_key = end_date.isoformat()
+        day_key = None
+        day_rows = []
+        for row in hourly_usage_list:
+            if row["date"][:10] != day_key:
+                if day_rows and first_key <= day_key <= last_key:
+                    self._store_day(accountid, day_key, day_rows)
+
+                day_key = row["date"][:10]
+                day_rows = []
+
+            day_rows.append(row)
+            yield row
+
+        if day_rows and first_key <= day_key <= last_key:
+            self._store_day(accountid, day_key, day_rows)
+
+    def _store_day(self, accountid, day_key, day_rows):
+        """Store the rows of one day in the cache."""
+        self.cache.put_day(accountid, datetime.fromisoformat(day_key).date(), day_rows)
+
+    def _fetch_chunks(self, chunks, max_workers):
+        """Yield the raw ``hourlyUsageList`` of each chunk in order.
+
+        Chunks are fetched concurrently over the shared session, with at most
+        ``max_workers`` requests in flight or waiting to be consumed.
+        """
+        if sum(chunk[3] is None for chunk in chunks) <= 1:
+            for chunk in chunks:
+                yield self._load_chunk(*chunk)
+            return
+
+        from concurrent.futures import ThreadPoolExecutor  # noqa: PLC0415
+
+        # Log in once before the workers share the session.
+        self._login()
+
+        pool = ThreadPoolExecutor(max_workers=min(max_workers, len(chunks)))
+        pending = deque()
+        try:
+            for chunk in chunks:
+                if len(pending) >= max_workers:
+                    yield pending.popleft().result()
+
+                pending.append(pool.submit(self._load_chunk, *chunk, preload=True))
+
+            while pending:
+                yield pending.popleft().result()
+
+        finally:
+            pool.shutdown(cancel_futures=True)
+
     def validate(self):
         """Validate user credentials.
 
+        A successful validation leaves the session authorized, so a following
+        call to ``usage()`` does not log in again.
+
         Returns
         -------
         bool
@@ -230,23 +1244,115 @@ class SrpEnergyClient:
 
         """
         try:
-            with requests.Session() as session:
-                session.headers.update(BROWSER_HEADERS)
-
-                # Step 1: Authenticate
-                response = session.post(
-                    BASE_USAGE_URL + "/login/authorize",
-                    data={"username": self.username, "password": self.password},
-                )
-                self._check_response(response, "login/authorize")
-                data = response.json()
+            with self._login_lock:
+                data = self._authorize()
 
-                return data["message"] == "Log in successful."
+            is_valid = data["message"] == "Log in successful."
 
         except Exception:  # pylint: disable=W0703
-            return False
+            is_valid = False
+
+        if not is_valid:
+            self._is_authorized = False
+
+        return is_valid
 
-    def usage(self, startdate, enddate, is_tou=False):  # pylint: disable=R0914
+    def iter_usage(
+        self,
+        startdate,
+        enddate,
+        is_tou=False,
+        chunk_days=None,
+        max_workers=DEFAULT_MAX_WORKERS,
+    ):
+        """Iterate over the energy usage for a given date range.
+
+        Rows are yielded as soon as they are converted, and chunks are fetched
+        only a few at a time ahead of the consumer, so memory stays bounded.
+        The parameters are validated before the iterator is returned.
+
+        Parameters
+        ----------
+        startdate : datetime
+            the start date
+        enddate : datetime
+            the end date
+        is_tou : bool
+            indicate if usage is a time of use plan
+        chunk_days : int, optional
+            split the range into requests of at most this many days
+        max_workers : int
+            the maximum number of chunks fetched concurrently
+
+        Returns
+        -------
+        iterator of tuple
+            In the form of (datepart, timepart, isotime, kw, cost)
+
+        Raises
+        ------
+        ValueError
+            If ``startdate`` or ``enddate`` are not datetime,
+            or if ``startdate`` is greater than ``enddate``,
+            or if ``startdate`` is greater than now,
+            or if ``chunk_days`` or ``max_workers`` are less than 1.
+
+        Examples
+        --------
+        Write a month of usage to a database week by week.
+
+        >>> start_date = datetime(2018, 9, 1)
+        >>> end_date = datetime(2018, 9, 30, 23)
+        >>> for row in client.iter_usage(start_date, end_date, chunk_days=7):
+        ...     writer.write(row)
+
+        """
+        chunks = self._plan_range(startdate, enddate, chunk_days, max_workers)
+
+        return self._iter_usage(chunks, is_tou, max_workers)
+
+    def _plan_range(self, startdate, enddate, chunk_days, max_workers, now=None):
+        """Validate a usage request and return the chunks of the client account."""
+        _validate_date_range(startdate, enddate, now)
+
+        if max_workers < 1:
+            raise ValueError("Parameter max_workers must be greater than 0.")
+
+        return self._plan_chunks(self.accountid, startdate, enddate, chunk_days)
+
+    def _iter_rows(self, chunks, max_workers):
+        """Yield the raw rows of each chunk in order, without repeats."""
+        merger = _ChunkMerger()
+        for hourly_usage_list in self._fetch_chunks(chunks, max_workers):
+            yield from merger.merge(hourly_usage_list)
+
+    def _iter_usage(self, chunks, is_tou, max_workers):
+        """Yield the converted rows of each chunk as it arrives."""
+        if self.tracer is None:
+            for row in self._iter_rows(chunks, max_workers):
+                yield _convert_row(row, is_tou)
+
+            return
+
+        # Convert each chunk at once to time the conversion on its own.
+        merger = _ChunkMerger()
+        for hourly_usage_list in self._fetch_chunks(chunks, max_workers):
+            with self._span("usage/convert") as span:
+                usage = [
+                    _convert_row(row, is_tou) for row in merger.merge(hourly_usage_list)
+                ]
+                span.set_attribute("srp.rows", len(usage))
+
+            yield from usage
+
+    def usage(
+        self,
+        startdate,
+        enddate,
+        is_tou=False,
+        chunk_days=None,
+        max_workers=DEFAULT_MAX_WORKERS,
+    ):
         """Get the energy usage for a given date range.
 
         Parameters
@@ -257,6 +1363,10 @@ class SrpEnergyClient:
             the end date
         is_tou : bool
             indicate if usage is a time of use plan
+        chunk_days : int, optional
+            split the range into requests of at most this many days
+        max_workers : int
+            the maximum number of chunks fetched concurrently
 
         Returns
         -------
@@ -268,7 +1378,8 @@ class SrpEnergyClient:
         ValueError
             If ``startdate`` or ``enddate`` are not datetime,
             or if ``startdate`` is greater than ``enddate``,
-            or if ``startdate`` is greater than now.
+            or if ``startdate`` is greater than now,
+            or if ``chunk_days`` or ``max_workers`` are less than 1.
 
         Examples
         --------
@@ -293,104 +1404,344 @@ class SrpEnergyClient:
         ('9/19/2018', '11:00 PM', '2018-09-19T23:00:00-7:00', '0.4', '0.09')
         ]
 
+        Get a year of hourly usage as weekly requests, four at a time.
+
+        >>> start_date = datetime(2018, 1, 1)
+        >>> end_date = datetime(2018, 12, 31, 23)
+        >>> usage = client.usage(start_date, end_date, chunk_days=7, max_workers=4)
+
         """
-        # Validate parameters
-        if not isinstance(startdate, datetime):
-            raise ValueError("Parameter startdate must be datetime.")
+        return list(
+            self.iter_usage(startdate, enddate, is_tou, chunk_days, max_workers)
+        )
 
-        if not isinstance(enddate, datetime):
-            raise ValueError("Parameter enddate must be datetime.")
+    def usage_frame(
+        self,
+        startdate,
+        enddate,
+        is_tou=False,
+        chunk_days=None,
+        max_workers=DEFAULT_MAX_WORKERS,
+    ):
+        """Get the energy usage for a given date range as a ``UsageFrame``.
 
-        # Validate date ranges
-        if startdate > enddate:
-            raise ValueError("Parameter startdate can not be greater than enddate.")
+        The frame stores each hour in typed columns instead of a tuple of
+        Python objects, and still iterates as the tuples of ``usage()``.
 
-        # Validate date ranges
-        if startdate.timestamp() > datetime.now().timestamp():
-            raise ValueError("Parameter startdate can not be greater than now.")
+        Parameters
+        ----------
+        startdate : datetime
+            the start date
+        enddate : datetime
+            the end date
+        is_tou : bool
+            indicate if usage is a time of use plan
+        chunk_days : int, optional
+            split the range into requests of at most this many days
+        max_workers : int
+            the maximum number of chunks fetched concurrently
 
-        try:
-            # Convert datetime to strings
-            str_startdate = startdate.strftime("%m-%d-%Y")
-            str_enddate = enddate.strftime("%m-%d-%Y")
+        Returns
+        -------
+        UsageFrame
 
-            with requests.Session() as session:
-                session.headers.update(BROWSER_HEADERS)
+        Raises
+        ------
+        ValueError
+            If ``startdate`` or ``enddate`` are not datetime,
+            or if ``startdate`` is greater than ``enddate``,
+            or if ``startdate`` is greater than now,
+            or if ``chunk_days`` or ``max_workers`` are less than 1.
 
-                # Step 1: Authenticate
-                response = session.post(
-                    BASE_USAGE_URL + "login/authorize",
-                    data={"username": self.username, "password": self.password},
-                )
-                self._check_response(response, "login/authorize")
+        Examples
+        --------
+        >>> frame = client.usage_frame(start_date, end_date)
+        >>> sum(frame.kwh)
+        28.4
+        >>> frame[0]
+        ('09/19/2018', '00:00 AM', '2018-09-19T00:00:00', 1.2, 0.17)
 
-                # Step 2: Fetch XSRF token
-                response = session.get(BASE_USAGE_URL + "login/antiforgerytoken")
+        """
+        # Imported here because the frame module builds on this one.
+        from srpenergy.frame import UsageFrame  # noqa: PLC0415
 
-                if "xsrf-token" not in response.cookies:
-                    raise SrpEnergyError(
-                        "XSRF token cookie missing after antiforgerytoken request. "
-                        f"Cookies received: {list(response.cookies.keys())}"
-                    )
+        chunks = self._plan_range(startdate, enddate, chunk_days, max_workers)
+
+        return UsageFrame.from_rows(self._iter_rows(chunks, max_workers), is_tou)
+
+    def usage_arrow(
+        self,
+        startdate,
+        enddate,
+        is_tou=False,
+        chunk_days=None,
+        max_workers=DEFAULT_MAX_WORKERS,
+    ):
+        """Get the energy usage for a given date range as an Arrow table.
+
+        It requires the optional ``pyarrow`` dependency.
 
-                xsrf_token = unquote(response.cookies["xsrf-token"])
-
-                # Step 3: Fetch usage data
-                response = session.get(
-                    BASE_USAGE_URL + "usage/hourlydetail",
-                    params={
-                        "billaccount": self.accountid,
-                        "beginDate": str_startdate,
-                        "endDate": str_enddate,
-                    },
-                    headers={"x-xsrf-token": xsrf_token},
+        Parameters
+        ----------
+        startdate : datetime
+            the start date
+        enddate : datetime
+            the end date
+        is_tou : bool
+            indicate if usage is a time of use plan
+        chunk_days : int, optional
+            split the range into requests of at most this many days
+        max_workers : int
+            the maximum number of chunks fetched concurrently
+
+        Returns
+        -------
+        pyarrow.Table
+            With the columns of ``srpenergy.arrow.USAGE_SCHEMA``.
+
+        Raises
+        ------
+        ValueError
+            If ``startdate`` or ``enddate`` are not datetime,
+            or if ``startdate`` is greater than ``enddate``,
+            or if ``startdate`` is greater than now,
+            or if ``chunk_days`` or ``max_workers`` are less than 1.
+
+        Examples
+        --------
+        >>> table = client.usage_arrow(start_date, end_date)
+        >>> table.column_names[:5]
+        ['accountid', 'timestamp', 'kwh', 'cost', 'peak']
+
+        """
+        # Imported here so pyarrow is only needed by this method.
+        from srpenergy.arrow import usage_table  # noqa: PLC0415
+
+        chunks = self._plan_range(startdate, enddate, chunk_days, max_workers)
+
+        return usage_table(self._iter_rows(chunks, max_workers), self.accountid, is_tou)
+
+    def usage_df(  # noqa: PLR0913
+        self,
+        startdate,
+        enddate,
+        is_tou=False,
+        chunk_days=None,
+        max_workers=DEFAULT_MAX_WORKERS,
+        backend="pandas",
+    ):
+        """Get the energy usage for a given date range as a DataFrame.
+
+        It requires the optional NumPy and pandas or Polars dependencies.
+
+        Parameters
+        ----------
+        startdate : datetime
+            the start date
+        enddate : datetime
+            the end date
+        is_tou : bool
+            indicate if usage is a time of use plan
+        chunk_days : int, optional
+            split the range into requests of at most this many days
+        max_workers : int
+            the maximum number of chunks fetched concurrently
+        backend : string
+            ``"pandas"`` or ``"polars"``.
+
+        Returns
+        -------
+        pandas.DataFrame or polars.DataFrame
+            As returned by ``srpenergy.dataframe.usage_dataframe``.
+
+        Raises
+        ------
+        ValueError
+            If ``startdate`` or ``enddate`` are not datetime,
+            or if ``startdate`` is greater than ``enddate``,
+            or if ``startdate`` is greater than now,
+            or if ``chunk_days`` or ``max_workers`` are less than 1,
+            or if ``backend`` is not a known backend.
+
+        Examples
+        --------
+        >>> df = client.usage_df(start_date, end_date, is_tou=True)
+        >>> df.groupby("peak")["cost"].sum()
+
+        """
+        # Imported here so NumPy and pandas are only needed by this method.
+        from srpenergy.dataframe import usage_dataframe  # noqa: PLC0415
+
+        chunks = self._plan_range(startdate, enddate, chunk_days, max_workers)
+
+        return usage_dataframe(self._iter_rows(chunks, max_workers), is_tou, backend)
+
+    def sync(
+        self,
+        since=None,
+        is_tou=False,
+        chunk_days=None,
+        max_workers=DEFAULT_MAX_WORKERS,
+    ):
+        """Get the usage of the hours completed since a watermark.
+
+        Only the days from ``since`` to now are requested, and only the rows
+        after ``since`` whose hour has ended are returned. The latest of them
+        becomes the new watermark, which is also remembered per account in
+        ``watermarks`` and used when ``since`` is omitted.
+
+        Parameters
+        ----------
+        since : datetime, optional
+            the last hour already collected, in SRP local time when naive.
+            Defaults to the remembered watermark, or two days ago.
+        is_tou : bool
+            indicate if usage is a time of use plan
+        chunk_days : int, optional
+            split the range into requests of at most this many days
+        max_workers : int
+            the maximum number of chunks fetched concurrently
+
+        Returns
+        -------
+        SyncResult
+            In the form of (usage, watermark), where usage is a list of
+            (datepart, timepart, isotime, kw, cost) tuples.
+
+        Examples
+        --------
+        Collect new hours every 15 minutes, persisting the watermark.
+
+        >>> watermark = load_watermark()
+        >>> usage, watermark = client.sync(since=watermark)
+        >>> save_rows(usage)
+        >>> save_watermark(watermark)
+
+        """
+        now = datetime.now(SRP_TIMEZONE).replace(tzinfo=None)
+
+        if since is None:
+            since = self.watermarks.get(
+                self.accountid, now - timedelta(days=DEFAULT_SYNC_DAYS)
+            )
+        elif not isinstance(since, datetime):
+            raise ValueError("Parameter since must be datetime.")
+        elif since.tzinfo is not None:
+            since = since.astimezone(SRP_TIMEZONE).replace(tzinfo=None)
+
+        # Both ends are in SRP local time, so is the check against now.
+        chunks = self._plan_range(
+            min(since, now), now, chunk_days, max_workers, now=now
+        )
+
+        watermark = since
+        usage = []
+        for values in self._iter_usage(chunks, is_tou, max_workers):
+            usage_time = parse_usage_time(values[2])
+            if usage_time <= since or usage_time + timedelta(hours=1) > now:
+                continue
+
+            usage.append(values)
+            watermark = max(watermark, usage_time)
+
+        self.watermarks[self.accountid] = watermark
+
+        return SyncResult(usage, watermark)
+
+    def usage_many(  # noqa: PLR0913
+        self,
+        accountids,
+        startdate,
+        enddate,
+        is_tou=False,
+        chunk_days=None,
+        max_workers=DEFAULT_MAX_WORKERS,
+    ):
+        """Get the energy usage of several billing accounts of the login.
+
+        The client logs in and fetches the XSRF token once, then requests
+        the accounts concurrently, taking a chunk of each account in turn.
+        A failure of one account does not affect the others.
+
+        Parameters
+        ----------
+        accountids : iterable of string
+            the srp account ids, which must belong to the client login
+        startdate : datetime
+            the start date
+        enddate : datetime
+            the end date
+        is_tou : bool
+            indicate if usage is a time of use plan
+        chunk_days : int, optional
+            split each range into requests of at most this many days
+        max_workers : int
+            the maximum number of requests in flight
+
+        Returns
+        -------
+        dict
+            The usage of each account id as a list of
+            (datepart, timepart, isotime, kw, cost) tuples, or the exception
+            raised while fetching that account.
+
+        Raises
+        ------
+        ValueError
+            If an account id is not valid,
+            or if ``startdate`` or ``enddate`` are not datetime,
+            or if ``startdate`` is greater than ``enddate``,
+            or if ``startdate`` is greater than now,
+            or if ``chunk_days`` or ``max_workers`` are less than 1.
+        SrpEnergyError
+            If the shared login fails.
+
+        Examples
+        --------
+        >>> results = client.usage_many(["123456789", "987654321"], start, end)
+        >>> for accountid, usage in results.items():
+        ...     if isinstance(usage, Exception):
+        ...         print(f"{accountid} failed: {usage}")
+
+        """
+        accountids = list(dict.fromkeys(accountids))
+        for accountid in accountids:
+            _validate_accountid(accountid)
+
+        _validate_date_range(startdate, enddate)
+
+        if max_workers < 1:
+            raise ValueError("Parameter max_workers must be greater than 0.")
+
+        plans = {
+            accountid: self._plan_chunks(accountid, startdate, enddate, chunk_days)
+            for accountid in accountids
+        }
+
+        if any(chunk[3] is None for chunks in plans.values() for chunk in chunks):
+            # Log in once before the workers share the session.
+            self._login()
+
+        from concurrent.futures import ThreadPoolExecutor  # noqa: PLC0415
+
+        futures = {accountid: [] for accountid in accountids}
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for accountid, chunk in _interleave(plans):
+                futures[accountid].append(
+                    pool.submit(lambda chunk: list(self._load_chunk(*chunk)), chunk)
                 )
 
-                self._check_response(response, "usage/hourlydetail")
-
-                data = response.json()
-                hourly_usage_list = data["hourlyUsageList"]
-
-                usage = []
-                for row in hourly_usage_list:
-                    total_kwh = row["totalKwh"]
-                    if total_kwh == 0:
-                        # Build the total_kwh from separate fields for EZ-3.
-                        total_kwh = (
-                            row["onPeakKwh"]
-                            + row["offPeakKwh"]
-                            + row["shoulderKwh"]
-                            + row["superOffPeakKwh"]
-                        )
-
-                    total_cost = row["totalCost"]
-                    if total_cost == 0:
-                        # Build the total_cost from separate fields for EZ-3.
-                        total_cost = (
-                            row["onPeakCost"]
-                            + row["offPeakCost"]
-                            + row["shoulderCost"]
-                            + row["superOffPeakCost"]
-                        )
-
-                    # Check if on Time of Use Plan
-                    if is_tou:
-                        rate, is_peak = get_rate(row["date"])
-
-                        total_kwh = row["onPeakKwh"] if is_peak else row["offPeakKwh"]
-
-                        total_cost = total_kwh * rate
-
-                    values = (
-                        get_pretty_date(row["date"]),
-                        get_pretty_time(row["date"]),
-                        row["date"],
-                        total_kwh,
-                        round(total_cost, 2),
-                    )
-                    usage.append(values)
+            results = {}
+            for accountid, account_futures in futures.items():
+                merger = _ChunkMerger()
+                try:
+                    results[accountid] = [
+                        _convert_row(row, is_tou)
+                        for future in account_futures
+                        for row in merger.merge(future.result())
+                    ]
 
-                return usage
+                except Exception as error:  # pylint: disable=W0703
+                    results[accountid] = error
 
-        except Exception as ex:
-            raise ex
+        return results
@@ -0,0 +1,119 @@
+"""DataFrame module.
+
+This module houses the conversion of hourly usage to pandas or Polars
+DataFrames, with the time of use pricing computed on whole columns. It
+requires NumPy and the DataFrame library, installed with
+``pip install srpenergy[pandas]`` or ``pip install srpenergy[polars]``.
+
+"""
+
+from array import array
+
+import numpy as np
+
+from srpenergy.client import SRP_TIMEZONE, _datetime64_array, get_rates
+
+try:
+    import pandas as pd
+except ImportError:  # pragma: no cover - optional backend
+    pd = None
+
+try:
+    import polars as pl
+except ImportError:  # pragma: no cover - optional backend
+    pl = None
+
+BACKENDS = ("pandas", "polars")
+
+# The raw ``hourlyUsageList`` fields needed to compute the totals.
+_KWH_FIELDS = ("onPeakKwh", "offPeakKwh", "shoulderKwh", "superOffPeakKwh")
+_COST_FIELDS = ("onPeakCost", "offPeakCost", "shoulderCost", "superOffPeakCost")
+_FIELDS = ("totalKwh", "totalCost", *_KWH_FIELDS, *_COST_FIELDS)
+
+
+def _read_columns(rows):
+    """Return the dates and the numeric fields of raw rows as NumPy arrays."""
+    dates = []
+    values = {field: array("d") for field in _FIELDS}
+    for row in rows:
+        dates.append(row["date"])
+        for field in _FIELDS:
+            values[field].append(row[field])
+
+    columns = {
+        field: np.frombuffer(value, dtype=float) for field, value in values.items()
+    }
+
+    try:
+        times = _datetime64_array(np, dates)
+    except ValueError as error:
+        raise ValueError("Usage dates should be parsed as datetimes.") from error
+
+    return times, columns
+
+
+def _total(columns, total_field, fields):
+    """Return a total column, built from its parts where the total is 0."""
+    total = columns[total_field]
+    parts = sum(columns[field] for field in fields)
+
+    return np.where(total == 0, parts, total)
+
+
+def usage_dataframe(rows, is_tou=False, backend="pandas"):
+    """Build a DataFrame from raw ``hourlyUsageList`` rows.
+
+    The kWh, cost, rate and peak columns are computed with array operations
+    that match ``SrpEnergyClient.usage()`` and ``get_rate``, the cost being
+    left unrounded.
+
+    Parameters
+    ----------
+    rows : iterable of dict
+        The raw rows, in order.
+    is_tou : bool
+        indicate if usage is a time of use plan
+    backend : string
+        ``"pandas"`` or ``"polars"``.
+
+    Returns
+    -------
+    pandas.DataFrame or polars.DataFrame
+        With the columns ``kwh``, ``cost``, ``rate`` and ``peak``. The pandas
+        frame is indexed by a time zone aware ``DatetimeIndex`` named
+        ``timestamp``, the Polars frame has a ``timestamp`` column instead.
+
+    Raises
+    ------
+    ValueError
+        If ``backend`` is not a known backend.
+    ImportError
+        If the library of ``backend`` is not installed.
+
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Parameter backend must be one of {BACKENDS}.")
+
+    library = pd if backend == "pandas" else pl
+    if library is None:
+        raise ImportError(f"{backend} is required, install srpenergy[{backend}].")
+
+    times, columns = _read_columns(rows)
+    rates, is_peak = get_rates(times)
+
+    if is_tou:
+        kwh = np.where(is_peak, columns["onPeakKwh"], columns["offPeakKwh"])
+        cost = kwh * rates
+    else:
+        kwh = _total(columns, "totalKwh", _KWH_FIELDS)
+        cost = _total(columns, "totalCost", _COST_FIELDS)
+
+    data = {"kwh": kwh, "cost": cost, "rate": rates, "peak": is_peak}
+
+    if backend == "polars":
+        timestamp = pl.Series("timestamp", times.astype("datetime64[ms]"))
+        timestamp = timestamp.dt.replace_time_zone("Etc/GMT+7")
+        return pl.DataFrame(data).insert_column(0, timestamp)
+
+    index = pd.DatetimeIndex(times, name="timestamp").tz_localize(SRP_TIMEZONE)
+    return pd.DataFrame(data, index=index)
@@ -0,0 +1,197 @@
+"""Frame module.
+
+This module houses a compact columnar container of hourly usage, used instead
+of a list of tuples when many hours are kept in memory.
+
+"""
+
+from array import array
+from datetime import datetime, timedelta, timezone
+
+from srpenergy.client import (
+    SRP_TIMEZONE,
+    _get_rate,
+    _row_totals,
+    _srp_local_time,
+    parse_usage_time,
+)
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional speedup
+    np = None
+
+# The SRP local time of the Unix epoch.
+_LOCAL_EPOCH = (
+    datetime(1970, 1, 1, tzinfo=timezone.utc)
+    .astimezone(SRP_TIMEZONE)
+    .replace(tzinfo=None)
+)
+
+
+class UsageFrame:
+    """UsageFrame().
+
+    Hourly usage stored in typed columns.
+
+    Each hour takes 25 bytes: an epoch second timestamp, the kWh and the cost
+    as doubles, and a peak flag as a byte. The pretty date and time strings
+    are rendered only when a row is accessed. Iterating or indexing the frame
+    returns the (datepart, timepart, isotime, kw, cost) tuples of
+    ``SrpEnergyClient.usage()``, where isotime is rendered in SRP local time
+    without an offset.
+
+    Attributes
+    ----------
+    timestamps : array of float
+        The start of each hour, in seconds since the epoch.
+    kwh : array of float
+        The energy used in each hour.
+    cost : array of float
+        The unrounded cost of each hour.
+    peak : array of int
+        1 if the hour is on the time of use peak, otherwise 0.
+    is_tou : bool
+        True if ``kwh`` and ``cost`` hold the peak or off-peak part of each
+        hour instead of its total.
+
+    Examples
+    --------
+    >>> frame = client.usage_frame(start_date, end_date)
+    >>> for datepart, timepart, isotime, kwh, cost in frame:
+    ...     print(datepart, timepart, kwh)
+
+    """
+
+    __slots__ = ("cost", "is_tou", "kwh", "peak", "timestamps")
+
+    def __init__(self):
+        self.timestamps = array("d")
+        self.kwh = array("d")
+        self.cost = array("d")
+        self.peak = array("b")
+        self.is_tou = False
+
+    @classmethod
+    def from_rows(cls, rows, is_tou=False):
+        """Build a frame from raw ``hourlyUsageList`` rows.
+
+        Parameters
+        ----------
+        rows : iterable of dict
+            The raw rows, in order.
+        is_tou : bool
+            indicate if usage is a time of use plan
+
+        Returns
+        -------
+        UsageFrame
+
+        """
+        frame = cls()
+        for row in rows:
+            frame.append_row(row, is_tou)
+
+        return frame
+
+    def append_row(self, row, is_tou=False):
+        """Append a raw ``hourlyUsageList`` row."""
+        usage_time = _srp_local_time(parse_usage_time(row["date"]))
+        tou_rate = _get_rate(usage_time)
+        total_kwh, total_cost = _row_totals(row, tou_rate if is_tou else None)
+        self.is_tou = self.is_tou or is_tou
+
+        self.timestamps.append((usage_time - _LOCAL_EPOCH).total_seconds())
+        self.kwh.append(total_kwh)
+        self.cost.append(total_cost)
+        self.peak.append(tou_rate[1])
+
+    def __len__(self):
+        """Return the number of hours."""
+        return len(self.timestamps)
+
+    def __getitem__(self, index):
+        """Return the usage tuple of an hour, or a frame of a slice."""
+        if isinstance(index, slice):
+            frame = type(self)()
+            frame.timestamps = self.timestamps[index]
+            frame.kwh = self.kwh[index]
+            frame.cost = self.cost[index]
+            frame.peak = self.peak[index]
+            frame.is_tou = self.is_tou
+            return frame
+
+        usage_time = self.usage_time(index)
+
+        return (
+            usage_time.strftime("%m/%d/%Y"),
+            usage_time.strftime("%H:%M %p"),
+            usage_time.isoformat(),
+            self.kwh[index],
+            round(self.cost[index], 2),
+        )
+
+    def __iter__(self):
+        """Iterate over the usage tuples."""
+        for index in range(len(self)):
+            yield self[index]
+
+    def __eq__(self, other):
+        """Return True if both frames hold the same columns."""
+        if not isinstance(other, UsageFrame):
+            return NotImplemented
+
+        return all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__
+        )
+
+    __hash__ = None
+
+    def __repr__(self):
+        """Return a short description of the frame."""
+        return f"<UsageFrame hours={len(self)}>"
+
+    def usage_time(self, index):
+        """Return the naive SRP local start time of an hour."""
+        return _LOCAL_EPOCH + timedelta(seconds=self.timestamps[index])
+
+    @property
+    def nbytes(self):
+        """Return the number of bytes held by the columns."""
+        return sum(
+            column.itemsize * len(column)
+            for column in (self.timestamps, self.kwh, self.cost, self.peak)
+        )
+
+    def to_numpy(self):
+        """Return the columns as NumPy arrays.
+
+        The ``kwh``, ``cost`` and ``peak`` arrays share the frame memory, so
+        rows can not be appended to the frame while they are referenced.
+
+        Returns
+        -------
+        dict
+            ``timestamps`` as ``datetime64[s]`` in SRP local time, ``kwh`` and
+            ``cost`` as ``float64`` and ``peak`` as ``bool`` arrays.
+
+        Raises
+        ------
+        ImportError
+            If NumPy is not installed.
+
+        """
+        if np is None:
+            raise ImportError("NumPy is required, install srpenergy[fast].")
+
+        local_seconds = (
+            np.frombuffer(self.timestamps, dtype=float)
+            + (_LOCAL_EPOCH - datetime(1970, 1, 1)).total_seconds()
+        )
+
+        return {
+            "timestamps": local_seconds.astype("int64").astype("datetime64[s]"),
+            "kwh": np.frombuffer(self.kwh, dtype=float),
+            "cost": np.frombuffer(self.cost, dtype=float),
+            "peak": np.frombuffer(self.peak, dtype=np.int8).view(bool),
+        }
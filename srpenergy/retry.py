@@ -0,0 +1,147 @@
+"""Retry module.
+
+This module houses the retry policy used by the clients to repeat requests
+that failed for a transient reason.
+
+"""
+
+from datetime import datetime, timezone
+import random
+
+HTTP_FORBIDDEN_ERROR = 403
+
+# Rate limited, bad gateway, service unavailable and gateway timeout.
+RETRY_STATUSES = (429, 502, 503, 504)
+
+
+class RetryPolicy:
+    """RetryPolicy(max_attempts=3, backoff=0.5, max_backoff=30.0, jitter=True).
+
+    How the clients repeat requests that failed for a transient reason.
+
+    A request is repeated when it raised a connection error or timeout, when
+    its status is in ``statuses``, or when it is a 403 Cloudflare challenge.
+    The n-th retry waits ``backoff * 2 ** (n - 1)`` seconds capped at
+    ``max_backoff``, drawn uniformly up to that value with ``jitter``. A
+    response with a ``Retry-After`` is retried after that wait in full, or
+    not at all if it is longer than ``max_backoff``. Each client stops
+    retrying once it spent ``budget`` retries.
+
+    Parameters
+    ----------
+    max_attempts : int
+        The maximum number of times a request is sent.
+    backoff : float
+        The wait before the first retry, in seconds.
+    max_backoff : float
+        The longest wait before a retry, in seconds.
+    jitter : bool
+        randomize the waits so that clients do not retry in step
+    budget : int, optional
+        The number of retries a client may spend, unlimited if None.
+    statuses : iterable of int
+        The HTTP statuses worth retrying.
+
+    Examples
+    --------
+    >>> from srpenergy.client import SrpEnergyClient
+    >>> from srpenergy.retry import RetryPolicy
+    >>>
+    >>> retry = RetryPolicy(max_attempts=5, budget=50)
+    >>> client = SrpEnergyClient(accountid, username, password, retry=retry)
+
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        max_attempts=3,
+        backoff=0.5,
+        max_backoff=30.0,
+        jitter=True,
+        budget=None,
+        statuses=RETRY_STATUSES,
+    ):
+        if max_attempts < 1:
+            raise ValueError("Parameter max_attempts must be greater than 0.")
+
+        if backoff < 0 or max_backoff < 0:
+            raise ValueError("Parameters backoff and max_backoff can not be negative.")
+
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.budget = budget
+        self.statuses = frozenset(statuses)
+
+    def is_retryable(self, response):
+        """Return True if a response failed for a transient reason.
+
+        A response asking for a longer wait than ``max_backoff`` in its
+        ``Retry-After`` is not retried, since retrying sooner fails again.
+        """
+        if response.status_code in self.statuses:
+            is_transient = True
+        else:
+            # Cloudflare challenges are lifted after a while, blocks are not.
+            is_transient = (
+                response.status_code == HTTP_FORBIDDEN_ERROR
+                and "cf-mitigated" in response.headers
+            )
+
+        if not is_transient:
+            return False
+
+        retry_after = _parse_retry_after(response.headers.get("retry-after"))
+
+        return retry_after is None or retry_after <= self.max_backoff
+
+    def delay(self, attempt, response=None):
+        """Return the seconds to wait after a failed attempt.
+
+        Parameters
+        ----------
+        attempt : int
+            The number of the failed attempt, starting at 1.
+        response : response, optional
+            The failed response, whose ``Retry-After`` header is waited in
+            full.
+
+        Returns
+        -------
+        float
+
+        """
+        retry_after = None
+        if response is not None:
+            retry_after = _parse_retry_after(response.headers.get("retry-after"))
+
+        if retry_after is not None:
+            return retry_after
+
+        delay = min(self.backoff * 2 ** (attempt - 1), self.max_backoff)
+        if self.jitter:
+            delay = random.uniform(0, delay)  # noqa: S311
+
+        return delay
+
+
+def _parse_retry_after(value):
+    """Return the seconds of a ``Retry-After`` header, or None if not valid."""
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    # The email package is slow to import and rarely needed.
+    from email.utils import parsedate_to_datetime  # noqa: PLC0415
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
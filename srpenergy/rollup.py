@@ -0,0 +1,139 @@
+"""Rollup module.
+
+This module houses the aggregation of hourly usage into daily, weekly,
+monthly and billing cycle totals.
+
+"""
+
+from datetime import datetime, timedelta
+from typing import NamedTuple
+
+from srpenergy.client import _get_rate, _srp_local_time, parse_usage_time
+from srpenergy.frame import _LOCAL_EPOCH, UsageFrame
+
+PERIODS = ("day", "week", "month", "billing_cycle")
+MAX_BILLING_DAY = 28
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+# The number of seconds between the Unix epoch and 1970-01-01 in SRP time.
+_LOCAL_EPOCH_SHIFT = (_LOCAL_EPOCH - datetime(1970, 1, 1)).total_seconds()
+_EPOCH_ORDINAL = datetime(1970, 1, 1).toordinal()
+
+
+class Rollup(NamedTuple):
+    """The usage totals of one period."""
+
+    start: datetime
+    hours: int
+    kwh: float
+    cost: float
+    on_peak_kwh: float
+    off_peak_kwh: float
+    on_peak_cost: float
+    off_peak_cost: float
+
+
+def _period_start(day, period, billing_day):
+    """Return the first day of the period holding a day."""
+    if period == "day":
+        return day
+
+    if period == "week":
+        return day - timedelta(days=day.weekday())
+
+    if period == "month":
+        return day.replace(day=1)
+
+    if day.day >= billing_day:
+        return day.replace(day=billing_day)
+
+    previous_month = day.replace(day=1) - timedelta(days=1)
+    return previous_month.replace(day=billing_day)
+
+
+def _iter_hours(usage):
+    """Yield the (ordinal_day, kwh, cost, is_peak) of each hour of usage."""
+    if isinstance(usage, UsageFrame):
+        for timestamp, kwh, cost, is_peak in zip(
+            usage.timestamps, usage.kwh, usage.cost, usage.peak, strict=True
+        ):
+            local_day = int((timestamp + _LOCAL_EPOCH_SHIFT) // SECONDS_PER_DAY)
+            yield _EPOCH_ORDINAL + local_day, kwh, cost, is_peak
+
+        return
+
+    for _datepart, _timepart, isotime, kwh, cost in usage:
+        usage_time = _srp_local_time(parse_usage_time(isotime))
+        yield usage_time.toordinal(), kwh, cost, _get_rate(usage_time)[1]
+
+
+def rollup(usage, period="day", billing_day=1):
+    """Sum hourly usage over days, weeks, months or billing cycles.
+
+    The usage is read in a single pass and only the running totals of each
+    period are kept, so it can be streamed from ``iter_usage``.
+
+    Parameters
+    ----------
+    usage : iterable of tuple or UsageFrame
+        The (datepart, timepart, isotime, kw, cost) tuples of ``usage()`` or
+        ``iter_usage()``, or a ``UsageFrame``.
+    period : string
+        One of ``"day"``, ``"week"``, ``"month"`` or ``"billing_cycle"``.
+        Weeks start on Monday.
+    billing_day : int
+        The day of the month a billing cycle starts on, from 1 to 28.
+
+    Returns
+    -------
+    list of Rollup
+        The totals of each period holding usage, ordered by start. Peak
+        hours follow the time of use calendar of ``get_rate``.
+
+    Raises
+    ------
+    ValueError
+        If ``period`` is not a known period,
+        or if ``billing_day`` is not between 1 and 28.
+
+    Examples
+    --------
+    >>> from srpenergy.rollup import rollup
+    >>>
+    >>> usage = client.iter_usage(start_date, end_date, is_tou=True, chunk_days=30)
+    >>> for month in rollup(usage, "month"):
+    ...     print(month.start, month.kwh, month.on_peak_cost)
+
+    """
+    if period not in PERIODS:
+        raise ValueError(f"Parameter period must be one of {PERIODS}.")
+
+    if not 1 <= billing_day <= MAX_BILLING_DAY:
+        raise ValueError(
+            f"Parameter billing_day must be between 1 and {MAX_BILLING_DAY}."
+        )
+
+    starts = {}
+    totals = {}
+    for ordinal_day, kwh, cost, is_peak in _iter_hours(usage):
+        start = starts.get(ordinal_day)
+        if start is None:
+            day = datetime.fromordinal(ordinal_day)
+            start = starts[ordinal_day] = _period_start(day, period, billing_day)
+
+        total = totals.get(start)
+        if total is None:
+            total = totals[start] = [0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0]
+
+        total[0] += 1
+        total[1] += kwh
+        total[2] += cost
+        if is_peak:
+            total[3] += kwh
+            total[5] += cost
+        else:
+            total[4] += kwh
+            total[6] += cost
+
+    return [Rollup(start, *totals[start]) for start in sorted(totals)]
@@ -0,0 +1,394 @@
+"""Tariff module.
+
+This module houses rate plans declared as data and compiled into hourly
+lookup tables, used to price usage with any SRP plan.
+
+"""
+
+from array import array
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+from srpenergy.client import (
+    PEAK_SUMMER_RATES,
+    RATE_CALENDAR_CACHE_SIZE,
+    SUMMER_PEAK_END,
+    SUMMER_PEAK_START,
+    SUMMER_RATES,
+    WINTER_PEAK_EVENING_END,
+    WINTER_PEAK_EVENING_START,
+    WINTER_PEAK_MORNING_END,
+    WINTER_PEAK_MORNING_START,
+    WINTER_RATES,
+    _datetime64_array,
+    _lazy,
+    _srp_local_time,
+    is_holiday,
+    parse_usage_time,
+)
+
+DEFAULT_BAND = "off_peak"
+DEFAULT_PEAK_BANDS = ("on_peak",)
+WEEKDAYS = (0, 1, 2, 3, 4)
+ALL_DAYS = (0, 1, 2, 3, 4, 5, 6)
+
+# The day type of holidays, after the seven weekdays.
+_HOLIDAY = 7
+
+# The E-26 time of use plan of 2015, as priced by ``get_rate``.
+E26_PLAN = {
+    "name": "E-26",
+    "schedules": [
+        {
+            "effective": "2015-04-01",
+            "holidays": "srp",
+            "seasons": [
+                {
+                    "name": "winter",
+                    "months": [1, 2, 3, 4, 11, 12],
+                    "price": WINTER_RATES[1],
+                    "bands": [
+                        {
+                            "name": "on_peak",
+                            "price": WINTER_RATES[0],
+                            "hours": [
+                                [WINTER_PEAK_MORNING_START, WINTER_PEAK_MORNING_END],
+                                [WINTER_PEAK_EVENING_START, WINTER_PEAK_EVENING_END],
+                            ],
+                            "weekdays": list(WEEKDAYS),
+                        }
+                    ],
+                },
+                {
+                    "name": "summer",
+                    "months": [5, 6, 9, 10],
+                    "price": SUMMER_RATES[1],
+                    "bands": [
+                        {
+                            "name": "on_peak",
+                            "price": SUMMER_RATES[0],
+                            "hours": [[SUMMER_PEAK_START, SUMMER_PEAK_END]],
+                            "weekdays": list(WEEKDAYS),
+                        }
+                    ],
+                },
+                {
+                    "name": "summer_peak",
+                    "months": [7, 8],
+                    "price": PEAK_SUMMER_RATES[1],
+                    "bands": [
+                        {
+                            "name": "on_peak",
+                            "price": PEAK_SUMMER_RATES[0],
+                            "hours": [[SUMMER_PEAK_START, SUMMER_PEAK_END]],
+                            "weekdays": list(WEEKDAYS),
+                        }
+                    ],
+                },
+            ],
+        }
+    ],
+}
+
+
+def __getattr__(name):
+    """Import NumPy on first use, then keep it as a global."""
+    if name != "np":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    return _lazy("np", globals())
+
+
+def _holiday_rule(holidays):
+    """Return a function telling if a day is a holiday of a schedule."""
+    if holidays is None:
+        return lambda day: False
+
+    if holidays == "srp":
+        return is_holiday
+
+    days = {datetime.fromisoformat(day).date() for day in holidays}
+    return lambda day: day.date() in days
+
+
+class _Schedule:
+    """The prices and bands of every hour of a plan from an effective date."""
+
+    def __init__(self, data, band_code):
+        self.effective = datetime.fromisoformat(data["effective"])
+        self.is_holiday = _holiday_rule(data.get("holidays"))
+
+        # The (price, band code) of each hour, by month and day type.
+        self.hours = {}
+        for season in data["seasons"]:
+            base = (season["price"], band_code(season.get("band", DEFAULT_BAND)))
+            day_hours = [[base] * 24 for _ in range(_HOLIDAY + 1)]
+
+            # Earlier bands take precedence over later ones.
+            for band in reversed(season.get("bands", [])):
+                price_band = (band["price"], band_code(band["name"]))
+                day_types = list(band.get("weekdays", ALL_DAYS))
+                if band.get("holidays", False):
+                    day_types.append(_HOLIDAY)
+
+                for start, end in band["hours"]:
+                    if not 0 <= start < end <= 24:  # noqa: PLR2004
+                        raise ValueError(
+                            f"Band {band['name']} hours must be within 0 and 24."
+                        )
+
+                    for day_type in day_types:
+                        day_hours[day_type][start:end] = [price_band] * (end - start)
+
+            for month in season["months"]:
+                if month in self.hours:
+                    raise ValueError(f"Month {month} is in more than one season.")
+
+                self.hours[month] = day_hours
+
+        missing = set(range(1, 13)) - set(self.hours)
+        if missing:
+            raise ValueError(f"Months {sorted(missing)} are in no season.")
+
+    def day_hours(self, day):
+        """Return the (price, band code) of each hour of a day."""
+        day_type = _HOLIDAY if self.is_holiday(day) else day.weekday()
+
+        return self.hours[day.month][day_type]
+
+
+class RateTable:
+    """RateTable(plan, year).
+
+    The price and band of every hour of one year of a plan, indexed by
+    ``(ordinal_day - 1) * 24 + hour``. Use ``RatePlan.table`` to share
+    tables instead of building them directly.
+
+    Parameters
+    ----------
+    plan : RatePlan
+        The rate plan.
+    year : int
+        The calendar year.
+
+    """
+
+    def __init__(self, plan, year):
+        self.year = year
+        self.prices = array("d")
+        self.bands = array("b")
+
+        first_day = datetime(year, 1, 1)
+        day_count = (datetime(year + 1, 1, 1) - first_day).days
+        for day_idx in range(day_count):
+            day = first_day + timedelta(days=day_idx)
+            for price, band in plan.schedule(day).day_hours(day):
+                self.prices.append(price)
+                self.bands.append(band)
+
+
+@lru_cache(maxsize=RATE_CALENDAR_CACHE_SIZE)
+def _get_rate_table(plan, year):
+    """Return the shared ``RateTable`` of a plan and year."""
+    return RateTable(plan, year)
+
+
+class RatePlan:
+    """RatePlan(name, schedules, peak_bands=("on_peak",)).
+
+    A rate plan declared as data.
+
+    Each schedule applies from its ``effective`` date until the next one,
+    and the first schedule also applies before its date. A schedule maps
+    every month to a season priced at ``price`` in its base band, named
+    ``band`` or ``"off_peak"``. The ``bands`` of a season override that
+    price for ranges of ``hours`` on some ``weekdays`` (Monday is 0), and on
+    holidays only if ``holidays`` is true. The first matching band wins.
+    Schedule ``holidays`` are ``"srp"`` for the holidays of ``is_holiday``,
+    or a list of ISO dates.
+
+    Plans are compiled into yearly lookup tables on first use.
+
+    Parameters
+    ----------
+    name : string
+        The name of the plan.
+    schedules : list of dict
+        The schedules of the plan.
+    peak_bands : iterable of string
+        The bands flagged as peak hours.
+
+    Attributes
+    ----------
+    bands : list of string
+        The band names, indexed by the band codes of ``rates``.
+
+    Examples
+    --------
+    >>> from srpenergy.tariff import RatePlan
+    >>>
+    >>> plan = RatePlan.from_dict(json.load(open("ez3.json")))
+    >>> frame = plan.apply(client.usage_frame(start_date, end_date))
+
+    """
+
+    def __init__(self, name, schedules, peak_bands=DEFAULT_PEAK_BANDS):
+        if not schedules:
+            raise ValueError("Parameter schedules must not be empty.")
+
+        self.name = name
+        self.bands = []
+        self._schedules = sorted(
+            (_Schedule(schedule, self._band_code) for schedule in schedules),
+            key=lambda schedule: schedule.effective,
+        )
+        self._peak_codes = {
+            self.bands.index(band) for band in peak_bands if band in self.bands
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Return the plan declared by a dict, as loaded from JSON.
+
+        The dict holds ``name``, ``schedules`` and optional ``peak_bands``.
+        """
+        return cls(
+            data["name"],
+            data["schedules"],
+            data.get("peak_bands", DEFAULT_PEAK_BANDS),
+        )
+
+    def __repr__(self):
+        """Return a short description of the plan."""
+        return f"<RatePlan {self.name}>"
+
+    def _band_code(self, band):
+        """Return the code of a band name, adding it if new."""
+        if band not in self.bands:
+            self.bands.append(band)
+
+        return self.bands.index(band)
+
+    def schedule(self, day):
+        """Return the schedule in effect on a day."""
+        in_effect = self._schedules[0]
+        for schedule in self._schedules[1:]:
+            if schedule.effective > day:
+                break
+
+            in_effect = schedule
+
+        return in_effect
+
+    def table(self, year):
+        """Return the shared ``RateTable`` of a year."""
+        return _get_rate_table(self, year)
+
+    def rate(self, usage_time):
+        """Return the (price, band) of the hour starting at a time.
+
+        A time with a timezone is converted to SRP local time.
+        """
+        usage_time = _srp_local_time(usage_time)
+        table = self.table(usage_time.year)
+        idx = (usage_time.timetuple().tm_yday - 1) * 24 + usage_time.hour
+
+        return table.prices[idx], self.bands[table.bands[idx]]
+
+    def rates(self, timestamps):
+        """Return the price and band code of many hours at once.
+
+        Parameters
+        ----------
+        timestamps : iterable
+            ISO formatted strings, datetimes or a ``datetime64`` array. Times
+            with a timezone are converted to SRP local time.
+
+        Returns
+        -------
+        tuple of arrays
+            In the form of (prices, bands), where bands index ``self.bands``.
+            NumPy arrays with NumPy, otherwise ``array('d')`` and
+            ``array('b')``.
+
+        """
+        np = _lazy("np", globals())
+        if np is None:
+            prices = array("d")
+            bands = array("b")
+            for timestamp in timestamps:
+                usage_time = _srp_local_time(
+                    timestamp
+                    if isinstance(timestamp, datetime)
+                    else parse_usage_time(timestamp)
+                )
+                table = self.table(usage_time.year)
+                idx = (usage_time.timetuple().tm_yday - 1) * 24 + usage_time.hour
+                prices.append(table.prices[idx])
+                bands.append(table.bands[idx])
+
+            return prices, bands
+
+        values = _datetime64_array(np, timestamps)
+        years = values.astype("datetime64[Y]")
+        idx = (values.astype("datetime64[h]") - years).astype(int)
+        year = years.astype(int) + 1970
+
+        prices = np.empty(values.shape, dtype=float)
+        bands = np.empty(values.shape, dtype=np.int8)
+        for table_year in np.unique(year):
+            table = self.table(int(table_year))
+            in_year = year == table_year
+            prices[in_year] = np.frombuffer(table.prices, dtype=float)[idx[in_year]]
+            bands[in_year] = np.frombuffer(table.bands, dtype=np.int8)[idx[in_year]]
+
+        return prices, bands
+
+    def apply(self, frame):
+        """Return a copy of a frame priced with the plan.
+
+        The cost of each hour is its total kWh times the plan price, and the
+        peak flag is set for the hours of ``peak_bands``. The frame must be
+        built with ``is_tou=False``, since a time of use frame only keeps the
+        peak or off-peak part of each hour.
+
+        Parameters
+        ----------
+        frame : UsageFrame
+            The usage to price.
+
+        Returns
+        -------
+        UsageFrame
+
+        Raises
+        ------
+        ValueError
+            If the frame was built with ``is_tou=True``.
+
+        """
+        if frame.is_tou:
+            raise ValueError("Price a frame built with is_tou=False.")
+
+        priced = frame[:]
+
+        np = _lazy("np", globals())
+        if np is None:
+            times = [frame.usage_time(index) for index in range(len(frame))]
+            prices, bands = self.rates(times)
+            priced.cost = array("d", map(float.__mul__, frame.kwh, prices))
+            priced.peak = array("b", (band in self._peak_codes for band in bands))
+            return priced
+
+        prices, bands = self.rates(frame.to_numpy()["timestamps"])
+        priced.cost = array(
+            "d", (np.frombuffer(frame.kwh, dtype=float) * prices).tobytes()
+        )
+        priced.peak = array(
+            "b", np.isin(bands, list(self._peak_codes)).astype(np.int8).tobytes()
+        )
+
+        return priced
+
+
+E26 = RatePlan.from_dict(E26_PLAN)
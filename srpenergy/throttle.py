@@ -0,0 +1,162 @@
+"""Throttle module.
+
+This module houses the rate limiter shared by clients to stay under the
+request rate SRP tolerates from one address.
+
+"""
+
+import asyncio
+from collections import deque
+import threading
+import time
+
+# The shortest wait between two checks of the bucket, in seconds.
+MIN_WAIT = 0.001
+
+
+class _Waiter:
+    """A request waiting for a token."""
+
+    __slots__ = ("granted",)
+
+    def __init__(self):
+        self.granted = False
+
+
+class TokenBucket:
+    """TokenBucket(rate, burst=1).
+
+    Token bucket rate limiter shared by blocking and asyncio clients.
+
+    The bucket refills at ``rate`` tokens per second up to ``burst`` tokens,
+    and every request takes a token. Waiting requests are queued by key,
+    usually the account id, and tokens are granted to the keys in turn so
+    that an account with many pending requests does not starve the others.
+    The bucket is thread safe and can be shared by clients of any thread or
+    event loop in the process.
+
+    Parameters
+    ----------
+    rate : float
+        The sustained number of requests per second.
+    burst : int
+        The number of requests that can be sent at once after a pause.
+
+    Examples
+    --------
+    >>> from srpenergy.client import SrpEnergyClient
+    >>> from srpenergy.throttle import TokenBucket
+    >>>
+    >>> limiter = TokenBucket(rate=2.0, burst=5)
+    >>> clients = [
+    ...     SrpEnergyClient(accountid, username, password, limiter=limiter)
+    ...     for accountid, username, password in accounts
+    ... ]
+
+    """
+
+    def __init__(self, rate, burst=1):
+        if rate <= 0:
+            raise ValueError("Parameter rate must be greater than 0.")
+
+        if burst < 1:
+            raise ValueError("Parameter burst must be greater than 0.")
+
+        self.rate = rate
+        self.burst = burst
+
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._waiters = {}
+        self._keys = deque()
+
+    def _enqueue(self, key):
+        """Queue a waiter for a key and return it."""
+        waiter = _Waiter()
+        with self._lock:
+            if key not in self._waiters:
+                self._waiters[key] = deque()
+                self._keys.append(key)
+
+            self._waiters[key].append(waiter)
+
+        return waiter
+
+    def _dequeue(self, key, waiter):
+        """Remove a waiter that gave up before being granted a token."""
+        with self._lock:
+            waiters = self._waiters.get(key)
+            if waiters is None or waiter not in waiters:
+                return
+
+            waiters.remove(waiter)
+            if not waiters:
+                del self._waiters[key]
+                self._keys.remove(key)
+
+    def _dispatch(self):
+        """Grant the available tokens in turn, and return the time to the next."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+
+            while self._keys and self._tokens >= 1:
+                key = self._keys.popleft()
+                waiters = self._waiters[key]
+                waiters.popleft().granted = True
+                self._tokens -= 1
+
+                if waiters:
+                    self._keys.append(key)
+                else:
+                    del self._waiters[key]
+
+            return max((1 - self._tokens) / self.rate, MIN_WAIT)
+
+    def acquire(self, key=None):
+        """Block until a request for a key may be sent.
+
+        Parameters
+        ----------
+        key : hashable, optional
+            The key the request is queued under, usually the account id.
+
+        """
+        waiter = self._enqueue(key)
+        try:
+            while True:
+                wait = self._dispatch()
+                if waiter.granted:
+                    return
+
+                time.sleep(wait)
+
+        finally:
+            if not waiter.granted:
+                self._dequeue(key, waiter)
+
+    async def acquire_async(self, key=None):
+        """Wait without blocking the event loop until a request may be sent.
+
+        Parameters
+        ----------
+        key : hashable, optional
+            The key the request is queued under, usually the account id.
+
+        """
+        waiter = self._enqueue(key)
+        try:
+            while True:
+                wait = self._dispatch()
+                if waiter.granted:
+                    return
+
+                await asyncio.sleep(wait)
+
+        finally:
+            if not waiter.granted:
+                self._dequeue(key, waiter)
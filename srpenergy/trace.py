@@ -0,0 +1,98 @@
+"""Trace module.
+
+This module houses the tracer hooks used to time each step of a usage
+request, either with an OpenTelemetry tracer or with a plain callback.
+
+"""
+
+import time
+
+
+class _NullSpan:
+    """A span doing nothing, used when tracing is off."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def set_attribute(self, key, value):
+        """Ignore an attribute."""
+
+
+NULL_SPAN = _NullSpan()
+
+
+class _CallbackSpan:
+    """A span timing a step, then reporting it to a callback."""
+
+    __slots__ = ("_callback", "_started", "attributes", "name")
+
+    def __init__(self, callback, name, attributes):
+        self._callback = callback
+        self._started = None
+        self.name = name
+        self.attributes = dict(attributes or {})
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_value is not None:
+            self.attributes["error"] = repr(exc_value)
+
+        self._callback(self.name, time.perf_counter() - self._started, self.attributes)
+        return False
+
+    def set_attribute(self, key, value):
+        """Set an attribute reported with the span."""
+        self.attributes[key] = value
+
+
+class CallbackTracer:
+    """CallbackTracer(callback).
+
+    Tracer reporting each finished step to a callback.
+
+    It implements the ``start_as_current_span`` method the clients call on
+    an OpenTelemetry tracer, so either can be passed as ``tracer``. The
+    callback receives the step name, its duration in seconds and a dict of
+    attributes. It may be called from the worker threads of the client.
+
+    The steps are ``login/authorize``, ``login/antiforgerytoken`` and
+    ``usage/hourlydetail`` for the requests, with the ``http.status_code``
+    and ``srp.retries`` attributes, ``usage/decode`` for reading and parsing
+    a response, with ``srp.bytes`` and ``srp.rows``, ``usage/convert`` for
+    converting the rows of a chunk, with ``srp.rows``, and ``cache/lookup``
+    with ``srp.cache_hits`` and ``srp.cache_misses``.
+
+    Parameters
+    ----------
+    callback : callable
+        Called as ``callback(name, duration, attributes)``.
+
+    Examples
+    --------
+    >>> from collections import defaultdict
+    >>> from srpenergy.trace import CallbackTracer
+    >>>
+    >>> durations = defaultdict(float)
+    >>> def record(name, duration, attributes):
+    ...     durations[name] += duration
+    >>>
+    >>> client = SrpEnergyClient(
+    ...     accountid, username, password, tracer=CallbackTracer(record)
+    ... )
+
+    """
+
+    def __init__(self, callback):
+        self.callback = callback
+
+    def start_as_current_span(self, name, attributes=None):
+        """Return a span timing a step."""
+        return _CallbackSpan(self.callback, name, attributes)
@@ -107,20 +107,37 @@ HTTP_RESPONSE_CODE_CLIENT_ERROR = 400
 class MockResponse:
     """Mock Response."""
 
-    def __init__(self, json_data, status_code, cookies, kwargs):
+    def __init__(self, json_data, status_code, cookies, kwargs, headers=None):
         """Create Mock Response."""
         self.json_data = json_data
         self.status_code = status_code
         self.cookies = cookies
         self.kwargs = kwargs
+        self.headers = headers if headers is not None else {}
         self.text = (
             json.dumps(json_data) if isinstance(json_data, dict) else str(json_data)
         )
 
+    @property
+    def content(self):
+        """Return mock body bytes."""
+        return self.text.encode()
+
     def json(self):
         """Return mock json."""
         return self.json_data
 
+    def iter_content(self, chunk_size=1):
+        """Return mock body bytes in chunks."""
+        content = self.content
+        return (
+            content[start : start + chunk_size]
+            for start in range(0, len(content), chunk_size)
+        )
+
+    def close(self):
+        """Close mock response."""
+
     def raise_for_status(self):
         """Raise HTTPError if the status code indicates an error."""
         if self.status_code >= HTTP_RESPONSE_CODE_CLIENT_ERROR:
@@ -175,3 +192,59 @@ def get_mock_requests(routes, antiforgery_status=200, antiforgery_cookies=None):
         )
 
     return mocked_requests_get
+
+
+def get_mock_transport(routes, antiforgery_status=200, antiforgery_cookies=None):
+    """Return an ``httpx.MockTransport`` standing in for the SRP api.
+
+    Routes are matched the same way as in ``get_mock_requests``. The login
+    endpoint always succeeds and the antiforgery endpoint sets its cookies.
+
+    Args:
+        routes: List of (pattern, response) tuples.
+        antiforgery_status: HTTP status code to return for the antiforgery request (default 200).
+        antiforgery_cookies: Cookies to return for the antiforgery request.
+                             Defaults to MOCK_ANTI_FORGERY_RESPONSE_COOKIES.
+                             Pass {} to simulate missing xsrf-token.
+    """
+    import httpx  # noqa: PLC0415
+
+    requests_seen = []
+
+    def handler(request):
+        requests_seen.append(request)
+        url = str(request.url)
+
+        if "login/authorize" in url:
+            return httpx.Response(200, json=MOCK_LOGIN_RESPONSE.json.return_value)
+
+        if "login/antiforgerytoken" in url:
+            cookies = (
+                antiforgery_cookies
+                if antiforgery_cookies is not None
+                else MOCK_ANTI_FORGERY_RESPONSE_COOKIES
+            )
+            headers = [
+                ("set-cookie", f"{name}={value}; path=/")
+                for name, value in cookies.items()
+            ]
+            return httpx.Response(
+                antiforgery_status, json=MOCK_ANTI_FORGERY_RESPONSE, headers=headers
+            )
+
+        begin_date = request.url.params.get("beginDate", "")
+        bill_account = request.url.params.get("billaccount", "")
+
+        for pattern, response in routes:
+            if pattern in url or pattern in begin_date or pattern in bill_account:
+                return httpx.Response(200, json=response)
+
+        raise ValueError(
+            f"No mock response matched url='{url}', beginDate='{begin_date}', "
+            f"billaccount='{bill_account}'. "
+            f"Registered patterns: {[p for p, _ in routes]}"
+        )
+
+    transport = httpx.MockTransport(handler)
+    transport.requests_seen = requests_seen
+    return transport
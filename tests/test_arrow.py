@@ -0,0 +1,122 @@
+"""The tests for the Arrow export."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from srpenergy.client import SrpEnergyClient
+
+from tests.common import (
+    MOCK_LOGIN_RESPONSE,
+    PATCH_GET,
+    PATCH_POST,
+    TEST_PASSWORD,
+    TEST_USER_NAME,
+    get_mock_requests,
+)
+from tests.test_client import ROUTES, TEST_ACCOUNT_ID, make_usage_row
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+from srpenergy.arrow import USAGE_SCHEMA, usage_table, write_parquet  # noqa: E402
+
+START_DATE = datetime(2018, 9, 19, 0, 0, 0)
+END_DATE = datetime(2018, 9, 19, 23, 0, 0)
+
+
+def test_usage_arrow_matches_usage():
+    """Test the table holds the values of the usage tuples."""
+    with patch(PATCH_GET) as session_get, patch(PATCH_POST) as session_post:
+        session_post.return_value = MOCK_LOGIN_RESPONSE
+        session_get.side_effect = get_mock_requests(ROUTES)
+
+        client = SrpEnergyClient(TEST_ACCOUNT_ID, TEST_USER_NAME, TEST_PASSWORD)
+
+        for is_tou in (False, True):
+            usage = client.usage(START_DATE, END_DATE, is_tou)
+            table = client.usage_arrow(START_DATE, END_DATE, is_tou)
+
+            assert table.schema == USAGE_SCHEMA
+            assert table.num_rows == len(usage)
+            assert table["kwh"].to_pylist() == [row[3] for row in usage]
+            assert [round(cost, 2) for cost in table["cost"].to_pylist()] == [
+                row[4] for row in usage
+            ]
+            assert set(table["accountid"].to_pylist()) == {TEST_ACCOUNT_ID}
+
+
+def test_usage_table_columns():
+    """Test the typed timestamp, peak and raw columns."""
+    row = make_usage_row("2020-06-24T15:00:00", 1.5)
+    row["onPeakKwh"] = 1.25
+    table = usage_table([row, make_usage_row("2020-06-24T01:00:00", 0.5)], "1")
+
+    assert table["timestamp"][0].as_py() == datetime(
+        2020, 6, 24, 15, tzinfo=timezone(timedelta(hours=-7))
+    )
+    assert table["peak"].to_pylist() == [True, False]
+    assert table["on_peak_kwh"].to_pylist() == [1.25, 0.0]
+
+
+def test_usage_table_empty():
+    """Test an empty table keeps the schema."""
+    table = usage_table([], TEST_ACCOUNT_ID)
+
+    assert table.num_rows == 0
+    assert table.schema == USAGE_SCHEMA
+
+
+def test_write_parquet(tmp_path):
+    """Test the dataset is partitioned by account and month."""
+    rows = [
+        make_usage_row("2020-06-30T23:00:00", 1.0),
+        make_usage_row("2020-07-01T00:00:00", 2.0),
+    ]
+    table = usage_table(rows, TEST_ACCOUNT_ID)
+
+    write_parquet(table, tmp_path)
+    write_parquet(table, tmp_path)
+    write_parquet(usage_table(rows[1:], "987654321"), tmp_path)
+
+    account_dir = tmp_path / f"accountid={TEST_ACCOUNT_ID}"
+    assert sorted(path.name for path in account_dir.iterdir()) == [
+        "month=2020-06",
+        "month=2020-07",
+    ]
+
+    # Writing the same range again replaces its rows.
+    dataset = pq.read_table(tmp_path)
+    assert dataset.num_rows == 3  # noqa: PLR2004
+    assert sorted(dataset["kwh"].to_pylist()) == [1.0, 2.0, 2.0]
+
+
+def test_write_parquet_overlapping_ranges(tmp_path):
+    """Test overlapping writes keep one row per hour, the latest one."""
+    hours = [datetime(2020, 9, 1) + timedelta(hours=hour) for hour in range(720)]
+
+    write_parquet(
+        usage_table(
+            (make_usage_row(hour.isoformat(), 1.0) for hour in hours[: 15 * 24]),
+            TEST_ACCOUNT_ID,
+        ),
+        tmp_path,
+    )
+    write_parquet(
+        usage_table(
+            (make_usage_row(hour.isoformat(), 2.0) for hour in hours),
+            TEST_ACCOUNT_ID,
+        ),
+        tmp_path,
+    )
+    write_parquet(
+        usage_table([make_usage_row(hours[0].isoformat(), 3.0)], TEST_ACCOUNT_ID),
+        tmp_path,
+    )
+
+    month_dir = tmp_path / f"accountid={TEST_ACCOUNT_ID}" / "month=2020-09"
+    assert [path.name for path in month_dir.iterdir()] == ["usage.parquet"]
+
+    dataset = pq.read_table(tmp_path)
+    assert dataset.num_rows == len(hours)
+    assert dataset["kwh"].to_pylist() == [3.0] + [2.0] * (len(hours) - 1)
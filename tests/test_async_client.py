@@ -0,0 +1,311 @@
+"""The tests for the asyncio Srp Energy client."""
+
+import asyncio
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from srpenergy.client import SrpEnergyClient, SrpEnergyError
+from srpenergy.retry import RetryPolicy
+from srpenergy.throttle import TokenBucket
+
+from tests.common import (
+    MOCK_LOGIN_RESPONSE,
+    PATCH_GET,
+    PATCH_POST,
+    TEST_PASSWORD,
+    TEST_USER_NAME,
+    get_mock_requests,
+    get_mock_transport,
+)
+
+httpx = pytest.importorskip("httpx")
+
+from srpenergy.async_client import AsyncSrpEnergyClient  # noqa: E402
+
+TEST_ACCOUNT_ID = "123456789"
+TEST_OTHER_ACCOUNT_ID = "234567891"
+
+MOCK_USAGE_RESPONSE = {
+    "hourlyUsageList": [
+        {
+            "date": "2020-06-25T17:00:00",
+            "hour": "2020-06-25T17:00:00",
+            "onPeakKwh": 6.5,
+            "offPeakKwh": 0.0,
+            "shoulderKwh": 0.0,
+            "superOffPeakKwh": 0.0,
+            "totalKwh": 0.0,
+            "onPeakCost": 0.0,
+            "offPeakCost": 0.0,
+            "shoulderCost": 0.0,
+            "superOffPeakCost": 0.0,
+            "totalCost": 0.00,
+        },
+        {
+            "date": "2020-06-25T23:00:00",
+            "hour": "2020-06-25T23:00:00",
+            "onPeakKwh": 0.0,
+            "offPeakKwh": 2.1,
+            "shoulderKwh": 0.0,
+            "superOffPeakKwh": 0.0,
+            "totalKwh": 2.1,
+            "onPeakCost": 0.0,
+            "offPeakCost": 0.0,
+            "shoulderCost": 0.0,
+            "superOffPeakCost": 0.0,
+            "totalCost": 0.31,
+        },
+    ],
+    "demandList": [],
+}
+
+ROUTES = [("usage/hourlydetail", MOCK_USAGE_RESPONSE)]
+
+START_DATE = datetime(2020, 6, 25)
+END_DATE = datetime(2020, 6, 25, 23)
+
+
+def get_sync_usage(is_tou):
+    """Return the usage fetched by the blocking client."""
+    with patch(PATCH_GET) as session_get, patch(PATCH_POST) as session_post:
+        session_post.return_value = MOCK_LOGIN_RESPONSE
+        session_get.side_effect = get_mock_requests(ROUTES)
+
+        client = SrpEnergyClient(TEST_ACCOUNT_ID, TEST_USER_NAME, TEST_PASSWORD)
+        return client.usage(START_DATE, END_DATE, is_tou)
+
+
+def test_async_validate_user():
+    """Test async validation of user."""
+    transport = get_mock_transport(ROUTES)
+
+    async def run():
+        async with AsyncSrpEnergyClient(
+            TEST_ACCOUNT_ID, TEST_USER_NAME, TEST_PASSWORD, transport=transport
+        ) as client:
+            return await client.validate()
+
+    assert asyncio.run(run())
+
+
+@pytest.mark.parametrize("is_tou", [False, True])
+def test_async_usage_matches_sync(is_tou):
+    """Test the async client returns the same rows as the blocking client."""
+    transport = get_mock_transport(ROUTES)
+
+    async def run():
+        async with AsyncSrpEnergyClient(
+            TEST_ACCOUNT_ID, TEST_USER_NAME, TEST_PASSWORD, transport=transport
+        ) as client:
+            return await client.usage(START_DATE, END_DATE, is_tou)
+
+    assert asyncio.run(run()) == get_sync_usage(is_tou)
+
+
+def test_async_usage_reuses_login():
+    """Test concurrent usage calls on one client share a single login."""
+    transport = get_mock_transport(ROUTES)
+
+    async def run():
+        async with AsyncSrpEnergyClient(
+            TEST_ACCOUNT_ID, TEST_USER_NAME, TEST_PASSWORD, transport=transport
+        ) as client:
+            return await asyncio.gather(
+                *(client.usage(START_DATE, END_DATE) for _ in range(5))
+            )
+
+    usages = asyncio.run(run())
+
+    assert len(usages) == 5  # noqa: PLR2004
+    paths = [request.url.path for request in transport.requests_seen]
+    assert sum(path.endswith("login/authorize") for path in paths) == 1
+
+
+def test_async_clients_share_transport():
+    """Test many clients poll concurrently over one shared transport."""
+    transport = get_mock_transport(ROUTES)
+    accountids = [TEST_ACCOUNT_ID, TEST_OTHER_ACCOUNT_ID]
+
+    async def run():
+        clients = [
+            AsyncSrpEnergyClient(
+                accountid, TEST_USER_NAME, TEST_PASSWORD, transport=transport
+            )
+            for accountid in accountids
+        ]
+        usages = await asyncio.gather(
+            *(client.usage(START_DATE, END_DATE) for client in clients)
+        )
+        for client in clients:
+            await client.close()
+        return usages
+
+    usages = asyncio.run(run())
+
+    assert usages[0] == usages[1] == get_sync_usage(False)
+    accounts = {
+        request.url.params["billaccount"]
+        for request in transport.requests_seen
+        if "billaccount" in request.url.params
+    }
+    assert accounts == set(accountids)
+
+
+def test_async_missing_xsrf_raises_error():
+    """Test a missing xsrf-token raises SrpEnergyError."""
+    transport = get_mock_transport(ROUTES, antiforgery_cookies={})
+
+    async def run():
+        async with AsyncSrpEnergyClient(
+            TEST_ACCOUNT_ID, TEST_USER_NAME, TEST_PASSWORD, transport=transport
+        ) as client:
+            await client.usage(START_DATE, END_DATE)
+
+    with pytest.raises(
+        SrpEnergyError,
+        match="XSRF token cookie missing after antiforgerytoken request",
+    ):
+        asyncio.run(run())
+
+
+def test_async_bad_parameter_start_date_string():
+    """Test start date is date."""
+    client = AsyncSrpEnergyClient(TEST_ACCOUNT_ID, TEST_USER_NAME, TEST_PASSWORD)
+
+    with pytest.raises(ValueError):
+        asyncio.run(client.usage("20181001", END_DATE))
+
+
+def test_async_usage_single_relogin():
+    """Test chunks rejected by one expired login log in again only once."""
+    mock_transport = get_mock_transport(ROUTES)
+    state = {"session": 0, "logins": 0}
+
+    async def handler(request):
+        url = str(request.url)
+        token = f"token-{state['session']}"
+        if "login/authorize" in url:
+            state["session"] += 1
+            state["logins"] += 1
+        elif "login/antiforgerytoken" in url:
+            cookie = ("set-cookie", f"xsrf-token={token}; path=/")
+            return httpx.Response(200, json={}, headers=[cookie])
+        elif request.headers.get("x-xsrf-token") != token:
+            # Later chunks are rejected after the first one logged in again.
+            await asyncio.sleep(0.005 * int(request.url.params["beginDate"][3:5]))
+            return httpx.Response(401)
+
+        return mock_transport.handler(request)
+
+    async def run():
+        async with AsyncSrpEnergyClient(
+            TEST_ACCOUNT_ID,
+            TEST_USER_NAME,
+            TEST_PASSWORD,
+            transport=httpx.MockTransport(handler),
+        ) as client:
+            await client.usage(START_DATE, END_DATE)
+
+            # The server forgets the session, rejecting its token.
+            state["session"] += 1
+
+            return await client.usage(
+                datetime(2020, 6, 18), END_DATE, chunk_days=1, max_workers=8
+            )
+
+    assert asyncio.run(run()) == get_sync_usage(False)
+    assert state["logins"] == 2  # noqa: PLR2004
+
+
+def test_async_usage_chunked():
+    """Test chunked async usage fetches each chunk once."""
+    transport = get_mock_transport(ROUTES)
+
+    async def run():
+        async with AsyncSrpEnergyClient(
+            TEST_ACCOUNT_ID, TEST_USER_NAME, TEST_PASSWORD, transport=transport
+        ) as client:
+            return await client.usage(
+                datetime(2020, 6, 20), END_DATE, chunk_days=2, max_workers=2
+            )
+
+    assert asyncio.run(run()) == get_sync_usage(False)
+    begin_dates = [
+        request.url.params["beginDate"]
+        for request in transport.requests_seen
+        if "beginDate" in request.url.params
+    ]
+    assert sorted(begin_dates) == ["06-20-2020", "06-22-2020", "06-24-2020"]
+
+
+def test_async_iter_usage():
+    """Test async iteration yields the same rows as usage."""
+    transport = get_mock_transport(ROUTES)
+
+    async def run():
+        async with AsyncSrpEnergyClient(
+            TEST_ACCOUNT_ID, TEST_USER_NAME, TEST_PASSWORD, transport=transport
+        ) as client:
+            return [
+                row
+                async for row in client.iter_usage(
+                    datetime(2020, 6, 20), END_DATE, chunk_days=2, max_workers=1
+                )
+            ]
+
+    assert asyncio.run(run()) == get_sync_usage(False)
+
+
+def test_async_usage_retries_transient_errors():
+    """Test a transient failure of the hourly usage is retried."""
+    mock_transport = get_mock_transport(ROUTES)
+    failures = [httpx.Response(503, headers={"retry-after": "0"})]
+
+    def handler(request):
+        if "usage/hourlydetail" in str(request.url) and failures:
+            return failures.pop()
+
+        return mock_transport.handler(request)
+
+    transport = httpx.MockTransport(handler)
+
+    async def run():
+        async with AsyncSrpEnergyClient(
+            TEST_ACCOUNT_ID,
+            TEST_USER_NAME,
+            TEST_PASSWORD,
+            transport=transport,
+            retry=RetryPolicy(backoff=0),
+        ) as client:
+            return await client.usage(START_DATE, END_DATE)
+
+    assert asyncio.run(run()) == get_sync_usage(False)
+    assert not failures
+
+
+def test_async_usage_with_shared_limiter():
+    """Test async clients take tokens from a shared limiter."""
+    transport = get_mock_transport(ROUTES)
+    limiter = TokenBucket(rate=1000.0, burst=1)
+
+    async def run():
+        clients = [
+            AsyncSrpEnergyClient(
+                accountid,
+                TEST_USER_NAME,
+                TEST_PASSWORD,
+                transport=transport,
+                limiter=limiter,
+            )
+            for accountid in (TEST_ACCOUNT_ID, TEST_OTHER_ACCOUNT_ID)
+        ]
+        return await asyncio.gather(
+            *(client.usage(START_DATE, END_DATE) for client in clients)
+        )
+
+    usages = asyncio.run(run())
+
+    assert usages == [get_sync_usage(False)] * 2
+    assert not limiter._waiters
@@ -0,0 +1,239 @@
+"""The tests for the backfill runner."""
+
+import csv
+from datetime import datetime
+from functools import partial
+import time
+
+import pytest
+
+from benchmarks.mock_server import MockSrpServer
+from srpenergy import backfill as backfill_module
+from srpenergy.backfill import Backfill, Checkpoint, CsvSink, _month_windows, main
+from srpenergy.client import SRP_TIMEZONE
+
+from tests.common import TEST_PASSWORD, TEST_USER_NAME
+
+ACCOUNT_IDS = ["123456789", "987654321"]
+START_DATE = datetime(2020, 1, 15)
+END_DATE = datetime(2020, 4, 10)
+MONTHS = ["2020-01", "2020-02", "2020-03", "2020-04"]
+WHOLE_START_DATE = datetime(2020, 1, 1)
+WHOLE_END_DATE = datetime(2020, 4, 30)
+
+
+class ListSink:
+    """Sink keeping the months written, failing for some months."""
+
+    def __init__(self, failing=()):
+        self.written = {}
+        self.failing = set(failing)
+
+    def write(self, accountid, month, usage):
+        """Keep the usage of a month, or fail for the failing months."""
+        if (accountid, month) in self.failing:
+            raise OSError("disk full")
+
+        self.written[accountid, month] = usage
+
+
+@pytest.fixture(name="server", scope="module")
+def fixture_server():
+    """Serve the SRP api locally for the backfill tests."""
+    with MockSrpServer() as mock_server:
+        yield mock_server
+
+
+def make_backfill(server, sink, **options):
+    """Return a backfill of two processes against the mock server."""
+    return Backfill(
+        TEST_USER_NAME,
+        TEST_PASSWORD,
+        sink,
+        processes=2,
+        base_url=server.base_url,
+        **options,
+    )
+
+
+def test_month_windows():
+    """Test a range is split into calendar months."""
+    windows = list(_month_windows(START_DATE, END_DATE))
+
+    assert windows == [
+        ("2020-01", datetime(2020, 1, 15), datetime(2020, 1, 31)),
+        ("2020-02", datetime(2020, 2, 1), datetime(2020, 2, 29)),
+        ("2020-03", datetime(2020, 3, 1), datetime(2020, 3, 31)),
+        ("2020-04", datetime(2020, 4, 1), datetime(2020, 4, 10)),
+    ]
+
+
+def test_backfill(server):
+    """Test every month of every account is fetched and written."""
+    sink = ListSink()
+
+    result = make_backfill(server, sink).run(ACCOUNT_IDS, START_DATE, END_DATE)
+
+    assert result == (8, 0, {})
+    assert sorted(sink.written) == [
+        (accountid, month) for accountid in ACCOUNT_IDS for month in MONTHS
+    ]
+    january = sink.written["123456789", "2020-01"]
+    assert len(january) == 17 * 24
+    assert january[0][2] == "2020-01-15T00:00:00"
+    assert january[-1][2] == "2020-01-31T23:00:00"
+
+
+def test_backfill_resumes_from_checkpoint(server, tmp_path):
+    """Test a rerun only fetches the months missing from the checkpoint."""
+    checkpoint = tmp_path / "checkpoint.jsonl"
+    sink = ListSink(failing=[("987654321", "2020-03")])
+
+    result = make_backfill(server, sink, checkpoint=checkpoint).run(
+        ACCOUNT_IDS, WHOLE_START_DATE, WHOLE_END_DATE
+    )
+
+    assert result.fetched == 7  # noqa: PLR2004
+    assert list(result.failed) == [("987654321", "2020-03")]
+    assert ("987654321", "2020-03") not in Checkpoint(checkpoint)
+
+    # A crash while recording a month leaves a partial line.
+    with checkpoint.open("a", encoding="utf-8") as lines:
+        lines.write('{"accountid": "9876')
+
+    requests_before = server.usage_requests
+    sink = ListSink()
+    result = make_backfill(server, sink, checkpoint=checkpoint).run(
+        ACCOUNT_IDS, WHOLE_START_DATE, WHOLE_END_DATE
+    )
+
+    assert result == (1, 7, {})
+    assert list(sink.written) == [("987654321", "2020-03")]
+    assert server.usage_requests == requests_before + 1
+
+
+def test_backfill_refetches_partial_months(server, tmp_path):
+    """Test months fetched in part are not checkpointed."""
+    checkpoint = tmp_path / "checkpoint.jsonl"
+
+    result = make_backfill(server, ListSink(), checkpoint=checkpoint).run(
+        ACCOUNT_IDS[:1], START_DATE, END_DATE
+    )
+
+    assert result == (4, 0, {})
+    assert Checkpoint(checkpoint).done == {
+        (ACCOUNT_IDS[0], "2020-02"),
+        (ACCOUNT_IDS[0], "2020-03"),
+    }
+
+    # The wider range fetches the days of January and April left out.
+    sink = ListSink()
+    result = make_backfill(server, sink, checkpoint=checkpoint).run(
+        ACCOUNT_IDS[:1], WHOLE_START_DATE, WHOLE_END_DATE
+    )
+
+    assert result == (2, 2, {})
+    january = sink.written[ACCOUNT_IDS[0], "2020-01"]
+    assert len(january) == 31 * 24
+    assert january[0][2] == "2020-01-01T00:00:00"
+    assert len(sink.written[ACCOUNT_IDS[0], "2020-04"]) == 30 * 24
+
+
+def test_backfill_does_not_checkpoint_current_month(server, tmp_path):
+    """Test the month that has not ended is not checkpointed."""
+    checkpoint = tmp_path / "checkpoint.jsonl"
+    today = datetime.now(SRP_TIMEZONE).replace(tzinfo=None)
+    startdate = datetime(today.year, today.month, 1)
+
+    result = make_backfill(server, ListSink(), checkpoint=checkpoint).run(
+        ACCOUNT_IDS[:1], startdate, today
+    )
+
+    assert result == (1, 0, {})
+    assert not Checkpoint(checkpoint).done
+
+
+def test_backfill_shared_limiter(server):
+    """Test the processes share one request rate."""
+    sink = ListSink()
+
+    started = time.monotonic()
+    result = make_backfill(server, sink, rate=20.0).run(
+        ACCOUNT_IDS, START_DATE, END_DATE
+    )
+
+    # Both processes log in with two requests, then send eight usage requests.
+    assert time.monotonic() - started >= 11 / 20
+    assert result == (8, 0, {})
+
+
+def test_backfill_login_error(server):
+    """Test a failed login fails the months without writing them."""
+    sink = ListSink()
+    backfill = Backfill(
+        TEST_USER_NAME,
+        TEST_PASSWORD,
+        sink,
+        processes=1,
+        base_url=server.base_url + "missing/",
+    )
+
+    result = backfill.run(ACCOUNT_IDS[:1], START_DATE, END_DATE)
+
+    assert result.fetched == 0
+    assert len(result.failed) == len(MONTHS)
+    assert not sink.written
+
+
+def test_backfill_bad_arguments(server):
+    """Test the backfill arguments are validated."""
+    backfill = make_backfill(server, ListSink())
+
+    with pytest.raises(ValueError):
+        backfill.run(["bad"], START_DATE, END_DATE)
+
+    with pytest.raises(ValueError):
+        backfill.run(ACCOUNT_IDS, END_DATE, START_DATE)
+
+    with pytest.raises(ValueError):
+        Backfill(TEST_USER_NAME, TEST_PASSWORD, ListSink(), processes=0)
+
+
+def test_csv_sink(tmp_path):
+    """Test the CSV sink replaces the file of a month."""
+    usage = [("01/15/2020", "00:00 AM", "2020-01-15T00:00:00", 0.4, 0.04)]
+
+    CsvSink(tmp_path).write("123456789", "2020-01", usage)
+    CsvSink(tmp_path).write("123456789", "2020-01", usage)
+
+    path = tmp_path / "123456789" / "2020-01.csv"
+    with path.open(encoding="utf-8", newline="") as stream:
+        rows = list(csv.reader(stream))
+
+    assert rows == [
+        ["date", "time", "isotime", "kwh", "cost"],
+        ["01/15/2020", "00:00 AM", "2020-01-15T00:00:00", "0.4", "0.04"],
+    ]
+    assert sorted(path.parent.iterdir()) == [path]
+
+
+def test_main(server, monkeypatch, tmp_path, capsys):
+    """Test the command line writes a CSV file per account and month."""
+    monkeypatch.setenv("SRP_USER_NAME", TEST_USER_NAME)
+    monkeypatch.setenv("SRP_PASSWORD", TEST_PASSWORD)
+    monkeypatch.setattr(
+        backfill_module, "Backfill", partial(Backfill, base_url=server.base_url)
+    )
+    arguments = [
+        *ACCOUNT_IDS,
+        "--start=2020-01-15",
+        "--end=2020-04-10",
+        f"--output={tmp_path}",
+        "--processes=2",
+    ]
+
+    assert main(arguments) == 0
+    assert capsys.readouterr().out == "Fetched 8 months, skipped 0.\n"
+    assert sorted(path.name for path in (tmp_path / "987654321").iterdir()) == [
+        f"{month}.csv" for month in MONTHS
+    ]
@@ -0,0 +1,258 @@
+"""The tests for the Srp Energy usage cache."""
+
+from datetime import date, datetime, timedelta, timezone
+import time
+from unittest.mock import patch
+
+import pytest
+
+from srpenergy.cache import UsageCache
+from srpenergy.client import SrpEnergyClient
+
+from tests.common import (
+    MOCK_LOGIN_RESPONSE,
+    PATCH_GET,
+    PATCH_POST,
+    TEST_PASSWORD,
+    TEST_USER_NAME,
+    get_mock_requests,
+)
+
+TEST_ACCOUNT_ID = "123456789"
+PATCH_TIME = "srpenergy.cache.time.time"
+
+
+def make_day_rows(day):
+    """Return two raw hourly usage rows of a day."""
+    return [
+        {
+            "date": f"{day.isoformat()}T{hour:02}:00:00",
+            "hour": f"{day.isoformat()}T{hour:02}:00:00",
+            "onPeakKwh": 0.0,
+            "offPeakKwh": 0.0,
+            "shoulderKwh": 0.0,
+            "superOffPeakKwh": 0.0,
+            "totalKwh": 1.5,
+            "onPeakCost": 0.0,
+            "offPeakCost": 0.0,
+            "shoulderCost": 0.0,
+            "superOffPeakCost": 0.0,
+            "totalCost": 0.2,
+        }
+        for hour in (0, 1)
+    ]
+
+
+def make_routes(first_day, day_count):
+    """Return one route per day, matched on the request beginDate."""
+    routes = []
+    for offset in range(day_count):
+        day = first_day + timedelta(days=offset)
+        rows = []
+        for rows_day in range(offset, day_count):
+            rows += make_day_rows(first_day + timedelta(days=rows_day))
+        routes.append(
+            (day.strftime("%m-%d-%Y"), {"hourlyUsageList": rows, "demandList": []})
+        )
+    return routes
+
+
+FIRST_DAY = date(2018, 9, 17)
+ROUTES = make_routes(FIRST_DAY, 5)
+
+
+def hourly_begin_dates(session_get):
+    """Return the beginDate of each usage/hourlydetail request."""
+    return [
+        call.kwargs["params"]["beginDate"]
+        for call in session_get.call_args_list
+        if "usage/hourlydetail" in call.args[0]
+    ]
+
+
+def test_put_and_get_day():
+    """Test a closed day is served and counted as a hit."""
+    with UsageCache(":memory:") as cache:
+        cache.put_day(TEST_ACCOUNT_ID, FIRST_DAY, make_day_rows(FIRST_DAY))
+
+        cached = cache.get_days(TEST_ACCOUNT_ID, [FIRST_DAY, date(2018, 9, 18)])
+
+        assert cached == {FIRST_DAY: make_day_rows(FIRST_DAY)}
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+        assert cache.stats()["days"] == 1
+
+
+def test_recent_day_expires():
+    """Test a still changing day is only served within the ttl."""
+    today = date.today()
+    now = datetime.now().timestamp()
+
+    with UsageCache(":memory:", recent_ttl=60) as cache:
+        with patch(PATCH_TIME, return_value=now):
+            cache.put_day(TEST_ACCOUNT_ID, today, make_day_rows(today))
+
+        with patch(PATCH_TIME, return_value=now + 30):
+            assert today in cache.get_days(TEST_ACCOUNT_ID, [today])
+
+        with patch(PATCH_TIME, return_value=now + 90):
+            assert today not in cache.get_days(TEST_ACCOUNT_ID, [today])
+
+
+def test_day_fetched_before_close_expires():
+    """Test a day stored while still changing is not kept once closed."""
+    day = date(2018, 9, 17)
+    fetched_at = datetime(2018, 9, 17, 12).timestamp()
+
+    with UsageCache(":memory:", recent_ttl=60) as cache:
+        with patch(PATCH_TIME, return_value=fetched_at):
+            cache.put_day(TEST_ACCOUNT_ID, day, make_day_rows(day))
+
+        assert day not in cache.get_days(TEST_ACCOUNT_ID, [day])
+
+
+@pytest.mark.parametrize("local_timezone", ["Asia/Tokyo", "Pacific/Honolulu"])
+def test_day_closes_in_srp_time(local_timezone, monkeypatch):
+    """Test days close at midnight in Arizona whatever the machine timezone."""
+    monkeypatch.setenv("TZ", local_timezone)
+    time.tzset()
+    try:
+        day = date(2018, 9, 17)
+        # Arizona midnight two days later is 07:00 UTC.
+        closed_at = datetime(2018, 9, 19, 7, tzinfo=timezone.utc).timestamp()
+
+        with UsageCache(":memory:", recent_ttl=60) as cache:
+            with patch(PATCH_TIME, return_value=closed_at - 3600):
+                cache.put_day(TEST_ACCOUNT_ID, day, make_day_rows(day))
+
+            with patch(PATCH_TIME, return_value=closed_at + 86400):
+                assert day not in cache.get_days(TEST_ACCOUNT_ID, [day])
+
+            with patch(PATCH_TIME, return_value=closed_at):
+                cache.put_day(TEST_ACCOUNT_ID, day, make_day_rows(day))
+
+            with patch(PATCH_TIME, return_value=closed_at + 86400):
+                assert day in cache.get_days(TEST_ACCOUNT_ID, [day])
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+
+def test_eviction_by_size():
+    """Test the least recently used days are evicted over max_bytes."""
+    with UsageCache(":memory:") as cache:
+        cache.put_day(TEST_ACCOUNT_ID, FIRST_DAY, make_day_rows(FIRST_DAY))
+        day_size = cache.stats()["bytes"]
+        cache.max_bytes = day_size * 2
+
+        for offset in range(1, 4):
+            day = FIRST_DAY + timedelta(days=offset)
+            cache.put_day(TEST_ACCOUNT_ID, day, make_day_rows(day))
+
+        stats = cache.stats()
+        assert stats["days"] == 2  # noqa: PLR2004
+        assert stats["bytes"] <= cache.max_bytes
+        assert not cache.get_days(TEST_ACCOUNT_ID, [FIRST_DAY])
+
+
+def test_bad_max_bytes():
+    """Test max_bytes must be positive."""
+    with pytest.raises(ValueError):
+        UsageCache(":memory:", max_bytes=0)
+
+
+def test_client_serves_cached_days():
+    """Test a cached range is served without logging in."""
+    with patch(PATCH_GET) as session_get, patch(PATCH_POST) as session_post:
+        session_post.return_value = MOCK_LOGIN_RESPONSE
+        session_get.side_effect = get_mock_requests(ROUTES)
+
+        cache = UsageCache(":memory:")
+        client = SrpEnergyClient(
+            TEST_ACCOUNT_ID, TEST_USER_NAME, TEST_PASSWORD, cache=cache
+        )
+
+        first = client.usage(datetime(2018, 9, 17), datetime(2018, 9, 21, 23))
+        client.close()
+        second = client.usage(datetime(2018, 9, 17), datetime(2018, 9, 21, 23))
+
+        assert first == second
+        assert len(second) == 10  # noqa: PLR2004
+        assert session_post.call_count == 1
+        assert hourly_begin_dates(session_get) == ["09-17-2018"]
+        assert cache.stats()["hits"] == 5  # noqa: PLR2004
+
+
+def test_client_skips_boundary_rows():
+    """Test a row repeated at a chunk boundary does not replace its cached day."""
+    days = [date(2018, 10, 1) + timedelta(days=offset) for offset in range(6)]
+    boundary_row = make_day_rows(days[2])[-1]
+    routes = [
+        (
+            "10-01-2018",
+            {
+                "hourlyUsageList": [
+                    row for day in days[:3] for row in make_day_rows(day)
+                ]
+            },
+        ),
+        (
+            "10-04-2018",
+            {
+                "hourlyUsageList": [boundary_row]
+                + [row for day in days[3:] for row in make_day_rows(day)]
+            },
+        ),
+    ]
+
+    with patch(PATCH_GET) as session_get, patch(PATCH_POST) as session_post:
+        session_post.return_value = MOCK_LOGIN_RESPONSE
+        session_get.side_effect = get_mock_requests(routes)
+
+        cache = UsageCache(":memory:")
+        client = SrpEnergyClient(
+            TEST_ACCOUNT_ID, TEST_USER_NAME, TEST_PASSWORD, cache=cache
+        )
+
+        first = client.usage(
+            datetime(2018, 10, 1), datetime(2018, 10, 6, 23), chunk_days=3
+        )
+        second = client.usage(
+            datetime(2018, 10, 1), datetime(2018, 10, 6, 23), chunk_days=3
+        )
+
+        assert len(first) == 12  # noqa: PLR2004
+        assert second == first
+        assert cache.get_days(TEST_ACCOUNT_ID, [days[2]]) == {
+            days[2]: make_day_rows(days[2])
+        }
+
+
+def test_client_fetches_missing_days_only():
+    """Test only the days missing from the cache are fetched."""
+    with patch(PATCH_GET) as session_get, patch(PATCH_POST) as session_post:
+        session_post.return_value = MOCK_LOGIN_RESPONSE
+        session_get.side_effect = get_mock_requests(
+            [
+                (
+                    "09-18-2018",
+                    {"hourlyUsageList": make_day_rows(date(2018, 9, 18))},
+                )
+            ]
+        )
+
+        cache = UsageCache(":memory:")
+        for offset in (0, 2):
+            day = FIRST_DAY + timedelta(days=offset)
+            cache.put_day(TEST_ACCOUNT_ID, day, make_day_rows(day))
+
+        client = SrpEnergyClient(
+            TEST_ACCOUNT_ID, TEST_USER_NAME, TEST_PASSWORD, cache=cache
+        )
+
+        usage = client.usage(datetime(2018, 9, 17), datetime(2018, 9, 19, 23))
+
+        assert [isodate for _date, _hour, isodate, _kwh, _cost in usage] == [
+            f"2018-09-{day}T{hour:02}:00:00" for day in (17, 18, 19) for hour in (0, 1)
+        ]
+        assert hourly_begin_dates(session_get) == ["09-18-2018"]
@@ -1,12 +1,27 @@
 """The tests for the Srp Energy API."""
 
-from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from datetime import date, datetime, timedelta, timezone
+import json
 import re
+import time
 from unittest.mock import Mock, patch
 
 import pytest
-
-from srpenergy.client import SrpEnergyClient, SrpEnergyError
+import requests
+
+from benchmarks.mock_server import MockSrpServer
+from srpenergy.client import (
+    BASE_USAGE_URL,
+    SRP_TIMEZONE,
+    SrpEnergyClient,
+    SrpEnergyError,
+    _parse_hourly_usage,
+    _split_date_range,
+    create_adapter,
+)
+from srpenergy.retry import RetryPolicy
 
 from tests.common import (
     MOCK_LOGIN_RESPONSE,
@@ -432,3 +447,714 @@ def test_login_authorize_http_error_raises_srp_energy_error():
 
         with pytest.raises(SrpEnergyError, match="HTTP error during 'login/authorize'"):
             client.usage(datetime(2020, 6, 24), datetime(2020, 6, 24, 23))
+
+
+def test_usage_reuses_session():
+    """Test repeated usage calls log in only once."""
+    with patch(PATCH_GET) as session_get, patch(PATCH_POST) as session_post:
+        session_post.return_value = MOCK_LOGIN_RESPONSE
+        session_get.side_effect = get_mock_requests(ROUTES)
+
+        client = SrpEnergyClient(TEST_ACCOUNT_ID, TEST_USER_NAME, TEST_PASSWORD)
+
+        start_date = datetime(2018, 9, 19, 0, 0, 0)
+        end_date = datetime(2018, 9, 19, 23, 0, 0)
+
+        client.usage(start_date, end_date)
+        usage = client.usage(start_date, end_date)
+
+        assert len(usage) == EXPECTED_USAGE_COUNT
+        assert session_post.call_count == 1
+        urls = [call.args[0] for call in session_get.call_args_list]
+        assert sum("login/antiforgerytoken" in url for url in urls) == 1
+
+
+def test_validate_then_usage_reuses_login():
+    """Test usage after validate does not authorize again."""
+    with patch(PATCH_GET) as session_get, patch(PATCH_POST) as session_post:
+        session_post.return_value = MOCK_LOGIN_RESPONSE
+        session_get.side_effect = get_mock_requests(ROUTES)
+
+        client = SrpEnergyClient(TEST_ACCOUNT_ID, TEST_USER_NAME, TEST_PASSWORD)
+
+        assert client.validate()
+        usage = client.usage(datetime(2018, 9, 19), datetime(2018, 9, 19, 23))
+
+        assert len(usage) == EXPECTED_USAGE_COUNT
+        assert session_post.call_count == 1
+
+
+def test_usage_reauthenticates_when_session_expires():
+    """Test a 401 on a reused session triggers a single new login."""
+    with patch(PATCH_GET) as session_get, patch(PATCH_POST) as session_post:
+        session_post.return_value = MOCK_LOGIN_RESPONSE
+        mocked_get = get_mock_requests(ROUTES)
+        expired = []
+
+        def expiring_get(*args, **kwargs):
+            if "usage/hourlydetail" in args[0] and len(expired) == 1:
+                expired.append(True)
+                return MockResponse("Unauthorized", 401, {}, kwargs)
+            return mocked_get(*args, **kwargs)
+
+        session_get.side_effect = expiring_get
+
+        client = SrpEnergyClient(TEST_ACCOUNT_ID, TEST_USER_NAME, TEST_PASSWORD)
+
+        client.usage(datetime(2018, 9, 19), datetime(2018, 9, 19, 23))
+        expired.append(True)
+        usage = client.usage(datetime(2018, 9, 19), datetime(2018, 9, 19, 23))
+
+        assert len(usage) == EXPECTED_USAGE_COUNT
+        assert session_post.call_count == 2  # noqa: PLR2004
+
+
+def test_usage_reauthenticates_when_xsrf_missing():
+    """Test a missing xsrf-token on a reused login triggers a new login."""
+    with patch(PATCH_GET) as session_get, patch(PATCH_POST) as session_post:
+        session_post.return_value = MOCK_LOGIN_RESPONSE
+        mocked_get = get_mock_requests(ROUTES)
+        expired_get = get_mock_requests(ROUTES, antiforgery_cookies={})
+        calls = []
+
+        def expiring_get(*args, **kwargs):
+            if "login/antiforgerytoken" in args[0] and not calls:
+                calls.append(True)
+                return expired_get(*args, **kwargs)
+            return mocked_get(*args, **kwargs)
+
+        session_get.side_effect = expiring_get
+
+        client = SrpEnergyClient(TEST_ACCOUNT_ID, TEST_USER_NAME, TEST_PASSWORD)
+
+        assert client.validate()
+        usage = client.usage(datetime(2018, 9, 19), datetime(2018, 9, 19, 23))
+
+        assert len(usage) == EXPECTED_USAGE_COUNT
+        assert session_post.call_count == 2  # noqa: PLR2004
+
+
+def test_close_discards_session():
+    """Test the context manager closes the session and forgets the login."""
+    with patch(PATCH_GET) as session_get, patch(PATCH_POST) as session_post:
+        session_post.return_value = MOCK_LOGIN_RESPONSE
+        session_get.side_effect = get_mock_requests(ROUTES)
+
+        with SrpEnergyClient(TEST_ACCOUNT_ID, TEST_USER_NAME, TEST_PASSWORD) as client:
+            client.usage(datetime(2018, 9, 19), datetime(2018, 9, 19, 23))
+
+        client.usage(datetime(2018, 9, 19), datetime(2018, 9, 19, 23))
+
+        assert session_post.call_count == 2  # noqa: PLR2004
+
+
+def make_usage_row(date, total_kwh):
+    """Return a raw hourly usage row."""
+    return {
+        "date": date,
+        "hour": date,
+        "onPeakKwh": 0.0,
+        "offPeakKwh": 0.0,
+        "shoulderKwh": 0.0,
+        "superOffPeakKwh": 0.0,
+        "totalKwh": total_kwh,
+        "onPeakCost": 0.0,
+        "offPeakCost": 0.0,
+        "shoulderCost": 0.0,
+        "superOffPeakCost": 0.0,
+        "totalCost": 0.1,
+    }
+
+
+# Chunks of three days, with a row repeated at a chunk boundary.
+ROUTES_CHUNKED = [
+    (
+        "10-01-2018",
+        {
+            "hourlyUsageList": [
+                make_usage_row("2018-10-01T00:00:00", 1.1),
+                make_usage_row("2018-10-02T00:00:00", 1.2),
+                make_usage_row("2018-10-03T23:00:00", 1.3),
+            ],
+            "demandList": [],
+        },
+    ),
+    (
+        "10-04-2018",
+        {
+            "hourlyUsageList": [
+                make_usage_row("2018-10-03T23:00:00", 1.3),
+                make_usage_row("2018-10-04T00:00:00", 1.4),
+                make_usage_row("2018-10-06T00:00:00", 1.6),
+            ],
+            "demandList": [],
+        },
+    ),
+    (
+        "10-07-2018",
+        {
+            "hourlyUsageList": [make_usage_row("2018-10-07T00:00:00", 1.7)],
+            "demandList": [],
+        },
+    ),
+]
+
+
+def test_split_date_range():
+    """Test a range is split into consecutive day chunks."""
+    chunks = _split_date_range(datetime(2018, 10, 1, 6), datetime(2018, 10, 7, 12), 3)
+
+    assert chunks == [
+        (date(2018, 10, 1), date(2018, 10, 3)),
+        (date(2018, 10, 4), date(2018, 10, 6)),
+        (date(2018, 10, 7), date(2018, 10, 7)),
+    ]
+
+
+def test_split_date_range_bad_chunk_days():
+    """Test chunk_days must be positive."""
+    with pytest.raises(ValueError):
+        _split_date_range(datetime(2018, 10, 1), datetime(2018, 10, 7), 0)
+
+
+def test_get_usage_chunked():
+    """Test chunked usage merges chunks in order without duplicates."""
+    with patch(PATCH_GET) as session_get, patch(PATCH_POST) as session_post:
+        session_post.return_value = MOCK_LOGIN_RESPONSE
+        session_get.side_effect = get_mock_requests(ROUTES_CHUNKED)
+
+        client = SrpEnergyClient(TEST_ACCOUNT_ID, TEST_USER_NAME, TEST_PASSWORD)
+
+        usage = client.usage(
+            datetime(2018, 10, 1), datetime(2018, 10, 7, 23), chunk_days=3
+        )
+
+        assert [isodate for _date, _hour, isodate, _kwh, _cost in usage] == [
+            "2018-10-01T00:00:00",
+            "2018-10-02T00:00:00",
+            "2018-10-03T23:00:00",
+            "2018-10-04T00:00:00",
+            "2018-10-06T00:00:00",
+            "2018-10-07T00:00:00",
+        ]
+        assert session_post.call_count == 1
+        begin_dates = sorted(
+            call.kwargs["params"]["beginDate"]
+            for call in session_get.call_args_list
+            if "usage/hourlydetail" in call.args[0]
+        )
+        assert begin_dates == ["10-01-2018", "10-04-2018", "10-07-2018"]
+
+
+def test_bad_parameter_max_workers():
+    """Test max_workers must be positive."""
+    client = SrpEnergyClient(TEST_ACCOUNT_ID, TEST_USER_NAME, TEST_PASSWORD)
+
+    with pytest.raises(ValueError):
+        client.usage(datetime(2018, 10, 1), datetime(2018, 10, 7), max_workers=0)
+
+
+def test_iter_usage_streams_chunks():
+    """Test iter_usage only fetches chunks as they are consumed."""
+    with patch(PATCH_GET) as session_get, patch(PATCH_POST) as session_post:
+        session_post.return_value = MOCK_LOGIN_RESPONSE
+        session_get.side_effect = get_mock_requests(ROUTES_CHUNKED)
+
+        client = SrpEnergyClient(TEST_ACCOUNT_ID, TEST_USER_NAME, TEST_PASSWORD)
+
+        rows = client.iter_usage(
+            datetime(2018, 10, 1),
+            datetime(2018, 10, 7, 23),
+            chunk_days=3,
+            max_workers=1,
+        )
+
+        assert session_get.call_count == 0
+
+        _date, _hour, isodate, _kwh, _cost = next(rows)
+
+        assert isodate == "2018-10-01T00:00:00"
+        usage_calls = [
+            call
+            for call in session_get.call_args_list
+            if "usage/hourlydetail" in call.args[0]
+        ]
+        assert len(usage_calls) == 1
+        assert len(list(rows)) == 5  # noqa: PLR2004
+
+
+def test_iter_usage_validates_eagerly():
+    """Test iter_usage validates parameters before iterating."""
+    client = SrpEnergyClient(TEST_ACCOUNT_ID, TEST_USER_NAME, TEST_PASSWORD)
+
+    with pytest.raises(ValueError):
+        client.iter_usage(datetime(2018, 10, 6), datetime(2018, 10, 5))
+
+
+MOCK_USAGE_BODY = json.dumps(
+    {
+        "hourlyConsumptionList": [],
+        "hourlyUsageList": MOCK_USAGE_RESPONSE["hourlyUsageList"],
+        "demandList": [{"date": "2019-10-09T00:00:00", "demand": 1.2}],
+    }
+).encode()
+
+
+@pytest.mark.parametrize("parser", ["ijson", "orjson", "json"])
+def test_parse_hourly_usage(parser):
+    """Test each parser yields the same hourly usage rows."""
+    if parser != "json":
+        pytest.importorskip(parser)
+
+    with (
+        patch("srpenergy.client.ijson", None) if parser != "ijson" else nullcontext(),
+        patch("srpenergy.client.orjson", None) if parser == "json" else nullcontext(),
+    ):
+        chunks = [MOCK_USAGE_BODY[start : start + 7] for start in range(0, 700, 7)]
+        chunks.append(MOCK_USAGE_BODY[700:])
+
+        rows = list(_parse_hourly_usage(chunks, stream=parser == "ijson"))
+
+    assert rows == list(MOCK_USAGE_RESPONSE["hourlyUsageList"])
+
+
+def test_parse_hourly_usage_streams_on_request():
+    """Test ijson is only used when streaming is requested."""
+    ijson_module = pytest.importorskip("ijson")
+
+    with patch("srpenergy.client.ijson", wraps=ijson_module) as ijson:
+        rows = list(_parse_hourly_usage([MOCK_USAGE_BODY]))
+
+        assert not ijson.items.called
+
+        assert list(_parse_hourly_usage([MOCK_USAGE_BODY], stream=True)) == rows
+        assert ijson.items.called
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_usage_stream(stream):
+    """Test usage returns the same rows whether the body is streamed or not."""
+    with patch(PATCH_GET) as session_get, patch(PATCH_POST) as session_post:
+        session_post.return_value = MOCK_LOGIN_RESPONSE
+        session_get.side_effect = get_mock_requests(ROUTES)
+
+        client = SrpEnergyClient(
+            TEST_ACCOUNT_ID, TEST_USER_NAME, TEST_PASSWORD, stream=stream
+        )
+
+        usage = client.usage(datetime(2018, 9, 17), datetime(2018, 9, 19, 23))
+
+        assert len(usage) == len(MOCK_USAGE_RESPONSE["hourlyUsageList"])
+
+
+@pytest.mark.parametrize("parser", ["ijson", "json"])
+def test_parse_hourly_usage_missing_list(parser):
+    """Test a body without hourlyUsageList raises SrpEnergyError."""
+    with (
+        patch("srpenergy.client.ijson", None) if parser != "ijson" else nullcontext(),
+        patch("srpenergy.client.orjson", None),
+        pytest.raises(SrpEnergyError, match="no hourlyUsageList"),
+    ):
+        list(
+            _parse_hourly_usage(
+                [json.dumps(MOCK_BAD_USAGE_RESPONSE).encode()],
+                stream=parser == "ijson",
+            )
+        )
+
+
+@pytest.mark.parametrize("parser", ["ijson", "json"])
+def test_parse_hourly_usage_empty_list(parser):
+    """Test an empty hourlyUsageList yields no rows."""
+    with (
+        patch("srpenergy.client.ijson", None) if parser != "ijson" else nullcontext(),
+        patch("srpenergy.client.orjson", None),
+    ):
+        body = json.dumps({"hourlyUsageList": [], "demandList": []}).encode()
+
+        assert not list(_parse_hourly_usage([body], stream=parser == "ijson"))
+
+
+def get_sync_routes():
+    """Return usage rows for the last three hours, the latest still open."""
+    this_hour = datetime.now(SRP_TIMEZONE).replace(
+        minute=0, second=0, microsecond=0, tzinfo=None
+    )
+    hours = [this_hour - timedelta(hours=offset) for offset in (3, 2, 1, 0)]
+    rows = [make_usage_row(hour.isoformat(), 1.0) for hour in hours]
+
+    return hours, [("usage/hourlydetail", {"hourlyUsageList": rows})]
+
+
+def test_sync_returns_completed_hours_since_watermark():
+    """Test sync returns the completed hours after the watermark."""
+    hours, routes = get_sync_routes()
+
+    with patch(PATCH_GET) as session_get, patch(PATCH_POST) as session_post:
+        session_post.return_value = MOCK_LOGIN_RESPONSE
+        session_get.side_effect = get_mock_requests(routes)
+
+        client = SrpEnergyClient(TEST_ACCOUNT_ID, TEST_USER_NAME, TEST_PASSWORD)
+
+        usage, watermark = client.sync(since=hours[0])
+
+        assert [isodate for _date, _hour, isodate, _kwh, _cost in usage] == [
+            hours[1].isoformat(),
+            hours[2].isoformat(),
+        ]
+        assert watermark == hours[2]
+        assert client.watermarks[TEST_ACCOUNT_ID] == hours[2]
+        begin_date = session_get.call_args.kwargs["params"]["beginDate"]
+        assert begin_date == hours[0].strftime("%m-%d-%Y")
+
+
+def test_sync_resumes_from_remembered_watermark():
+    """Test a second sync without since returns no repeated hours."""
+    hours, routes = get_sync_routes()
+
+    with patch(PATCH_GET) as session_get, patch(PATCH_POST) as session_post:
+        session_post.return_value = MOCK_LOGIN_RESPONSE
+        session_get.side_effect = get_mock_requests(routes)
+
+        client = SrpEnergyClient(TEST_ACCOUNT_ID, TEST_USER_NAME, TEST_PASSWORD)
+
+        first = client.sync()
+        second = client.sync()
+
+        assert len(first.usage) == 3  # noqa: PLR2004
+        assert not second.usage
+        assert second.watermark == first.watermark == hours[2]
+
+
+def test_sync_aware_since():
+    """Test an aware since is converted to SRP local time."""
+    hours, routes = get_sync_routes()
+
+    with patch(PATCH_GET) as session_get, patch(PATCH_POST) as session_post:
+        session_post.return_value = MOCK_LOGIN_RESPONSE
+        session_get.side_effect = get_mock_requests(routes)
+
+        client = SrpEnergyClient(TEST_ACCOUNT_ID, TEST_USER_NAME, TEST_PASSWORD)
+
+        since = hours[1].replace(tzinfo=SRP_TIMEZONE).astimezone(timezone.utc)
+        usage, watermark = client.sync(since=since)
+
+        assert len(usage) == 1
+        assert watermark == hours[2]
+
+
+@pytest.mark.parametrize("local_timezone", ["Pacific/Honolulu", "Asia/Tokyo"])
+def test_sync_machine_timezone(local_timezone, monkeypatch):
+    """Test sync works in SRP time whatever the machine timezone."""
+    monkeypatch.setenv("TZ", local_timezone)
+    time.tzset()
+    try:
+        hours, routes = get_sync_routes()
+
+        with patch(PATCH_GET) as session_get, patch(PATCH_POST) as session_post:
+            session_post.return_value = MOCK_LOGIN_RESPONSE
+            session_get.side_effect = get_mock_requests(routes)
+
+            client = SrpEnergyClient(TEST_ACCOUNT_ID, TEST_USER_NAME, TEST_PASSWORD)
+
+            usage, watermark = client.sync(since=hours[1])
+            second = client.sync()
+
+        assert len(usage) == 1
+        assert watermark == hours[2]
+        assert not second.usage
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+
+def test_sync_bad_since():
+    """Test since must be a datetime."""
+    client = SrpEnergyClient(TEST_ACCOUNT_ID, TEST_USER_NAME, TEST_PASSWORD)
+
+    with pytest.raises(ValueError):
+        client.sync(since="2018-10-01")
+
+
+def test_usage_many():
+    """Test several accounts share one login and keep their own results."""
+    with patch(PATCH_GET) as session_get, patch(PATCH_POST) as session_post:
+        session_post.return_value = MOCK_LOGIN_RESPONSE
+        session_get.side_effect = get_mock_requests(ROUTES)
+
+        client = SrpEnergyClient(TEST_ACCOUNT_ID, TEST_USER_NAME, TEST_PASSWORD)
+
+        results = client.usage_many(
+            [TEST_ACCOUNT_ID, TEST_BAD_ACCOUNT_ID, TEST_ACCOUNT_ID],
+            datetime(2018, 9, 17),
+            datetime(2018, 9, 19, 23),
+            chunk_days=1,
+            max_workers=1,
+        )
+
+        assert list(results) == [TEST_ACCOUNT_ID, TEST_BAD_ACCOUNT_ID]
+        assert results[TEST_ACCOUNT_ID] == client.usage(
+            datetime(2018, 9, 17), datetime(2018, 9, 19, 23)
+        )
+        assert isinstance(results[TEST_BAD_ACCOUNT_ID], Exception)
+        assert session_post.call_count == 1
+
+        # The chunks of the accounts are requested in turn.
+        accounts = [
+            call.kwargs["params"]["billaccount"]
+            for call in session_get.call_args_list
+            if "usage/hourlydetail" in call.args[0]
+        ]
+        assert accounts[:4] == [TEST_ACCOUNT_ID, TEST_BAD_ACCOUNT_ID] * 2
+
+
+def test_usage_many_bad_accountid():
+    """Test every account id is validated before any request."""
+    with patch(PATCH_GET) as session_get:
+        client = SrpEnergyClient(TEST_ACCOUNT_ID, TEST_USER_NAME, TEST_PASSWORD)
+
+        with pytest.raises(ValueError):
+            client.usage_many(
+                [TEST_ACCOUNT_ID, "12-345-678"],
+                datetime(2018, 9, 19),
+                datetime(2018, 9, 19, 23),
+            )
+
+        assert session_get.call_count == 0
+
+
+def test_usage_many_login_error():
+    """Test a failed shared login raises instead of failing each account."""
+    with patch(PATCH_GET) as session_get, patch(PATCH_POST) as session_post:
+        session_post.return_value = MOCK_LOGIN_RESPONSE
+        session_get.side_effect = get_mock_requests(ROUTES, antiforgery_cookies={})
+
+        client = SrpEnergyClient(TEST_ACCOUNT_ID, TEST_USER_NAME, TEST_PASSWORD)
+
+        with pytest.raises(SrpEnergyError):
+            client.usage_many(
+                [TEST_ACCOUNT_ID, TEST_BAD_ACCOUNT_ID],
+                datetime(2018, 9, 19),
+                datetime(2018, 9, 19, 23),
+            )
+
+
+def test_clients_share_adapter():
+    """Test clients sharing an adapter keep their own cookies."""
+    adapter = create_adapter(pool_maxsize=2)
+    first = SrpEnergyClient(
+        TEST_ACCOUNT_ID, TEST_USER_NAME, TEST_PASSWORD, adapter=adapter
+    )
+    second = SrpEnergyClient(
+        TEST_ACCOUNT_ID, TEST_USER_NAME, TEST_PASSWORD, adapter=adapter
+    )
+
+    url = BASE_USAGE_URL + "login/authorize"
+    assert first._get_session().get_adapter(url) is adapter
+    assert second._get_session().get_adapter(url) is adapter
+    assert first._get_session().cookies is not second._get_session().cookies
+    assert adapter._pool_maxsize == 2  # noqa: PLR2004
+
+
+def test_close_keeps_shared_adapter():
+    """Test closing a client does not close a shared adapter."""
+    adapter = create_adapter()
+    client = SrpEnergyClient(
+        TEST_ACCOUNT_ID, TEST_USER_NAME, TEST_PASSWORD, adapter=adapter
+    )
+    client._get_session()
+
+    with patch.object(adapter, "close") as adapter_close:
+        client.close()
+
+    adapter_close.assert_not_called()
+
+
+@patch(PATCH_POST)
+@patch(PATCH_GET)
+def test_base_url(session_get, session_post):
+    """Test the client can target a stand-in of the api."""
+    base_url = "http://127.0.0.1:8080/myaccountapi/api/"
+    session_get.side_effect = get_mock_requests([("usage", MOCK_USAGE_RESPONSE)])
+    session_post.return_value = MOCK_LOGIN_RESPONSE
+    adapter = create_adapter()
+
+    client = SrpEnergyClient(
+        TEST_ACCOUNT_ID,
+        TEST_USER_NAME,
+        TEST_PASSWORD,
+        adapter=adapter,
+        base_url=base_url,
+    )
+    client.usage(datetime(2019, 10, 9), datetime(2019, 10, 9))
+
+    assert session_post.call_args.args[0] == base_url + "login/authorize"
+    assert all(call.args[0].startswith(base_url) for call in session_get.mock_calls)
+    assert client._get_session().get_adapter(base_url) is adapter
+
+
+def test_create_adapter_bad_pool_size():
+    """Test the pool must hold a connection."""
+    with pytest.raises(ValueError):
+        create_adapter(pool_maxsize=0)
+
+
+def get_flaky_requests(routes, failures):
+    """Return a mock side_effect failing the first hourly usage requests."""
+    mocked_requests_get = get_mock_requests(routes)
+    failures = list(failures)
+
+    def flaky_requests_get(*args, **kwargs):
+        if "usage/hourlydetail" in args[0] and failures:
+            failure = failures.pop(0)
+            if isinstance(failure, Exception):
+                raise failure
+
+            return MockResponse("<html>Bad Gateway</html>", failure, {}, kwargs)
+
+        return mocked_requests_get(*args, **kwargs)
+
+    return flaky_requests_get
+
+
+def count_usage_requests(session_get):
+    """Return the number of hourly usage requests sent."""
+    return sum(
+        "usage/hourlydetail" in call.args[0] for call in session_get.call_args_list
+    )
+
+
+@pytest.mark.parametrize(
+    "failures", [[502], [429, 503], [requests.ConnectionError("reset")]]
+)
+def test_usage_retries_transient_errors(failures):
+    """Test transient failures of the hourly usage are retried."""
+    with patch(PATCH_GET) as session_get, patch(PATCH_POST) as session_post:
+        session_post.return_value = MOCK_LOGIN_RESPONSE
+        session_get.side_effect = get_flaky_requests(ROUTES, failures)
+
+        client = SrpEnergyClient(
+            TEST_ACCOUNT_ID, TEST_USER_NAME, TEST_PASSWORD, retry=RetryPolicy(backoff=0)
+        )
+        usage = client.usage(datetime(2018, 9, 19), datetime(2018, 9, 19, 23))
+
+        assert len(usage) == EXPECTED_USAGE_COUNT
+        assert count_usage_requests(session_get) == len(failures) + 1
+
+
+def test_usage_retries_failed_chunk_only():
+    """Test only the failed chunk is requested again."""
+    with patch(PATCH_GET) as session_get, patch(PATCH_POST) as session_post:
+        session_post.return_value = MOCK_LOGIN_RESPONSE
+        session_get.side_effect = get_flaky_requests(ROUTES_CHUNKED, [503])
+
+        client = SrpEnergyClient(
+            TEST_ACCOUNT_ID, TEST_USER_NAME, TEST_PASSWORD, retry=RetryPolicy(backoff=0)
+        )
+        usage = client.usage(
+            datetime(2018, 10, 1),
+            datetime(2018, 10, 7, 23),
+            chunk_days=3,
+            max_workers=1,
+        )
+
+        assert [row[3] for row in usage] == [1.1, 1.2, 1.3, 1.4, 1.6, 1.7]
+        assert count_usage_requests(session_get) == 4  # noqa: PLR2004
+        assert session_post.call_count == 1
+
+
+def test_usage_gives_up_after_max_attempts():
+    """Test a request failing on every attempt raises."""
+    with patch(PATCH_GET) as session_get, patch(PATCH_POST) as session_post:
+        session_post.return_value = MOCK_LOGIN_RESPONSE
+        session_get.side_effect = get_flaky_requests(ROUTES, [502] * 5)
+
+        client = SrpEnergyClient(
+            TEST_ACCOUNT_ID,
+            TEST_USER_NAME,
+            TEST_PASSWORD,
+            retry=RetryPolicy(max_attempts=3, backoff=0),
+        )
+
+        with pytest.raises(
+            SrpEnergyError, match="HTTP error during 'usage/hourlydetail'"
+        ):
+            client.usage(datetime(2018, 9, 19), datetime(2018, 9, 19, 23))
+
+        assert count_usage_requests(session_get) == 3  # noqa: PLR2004
+
+
+def test_usage_retry_budget():
+    """Test a client stops retrying once its budget is spent."""
+    with patch(PATCH_GET) as session_get, patch(PATCH_POST) as session_post:
+        session_post.return_value = MOCK_LOGIN_RESPONSE
+        session_get.side_effect = get_flaky_requests(ROUTES, [502] * 5)
+
+        client = SrpEnergyClient(
+            TEST_ACCOUNT_ID,
+            TEST_USER_NAME,
+            TEST_PASSWORD,
+            retry=RetryPolicy(max_attempts=5, backoff=0, budget=1),
+        )
+
+        with pytest.raises(SrpEnergyError):
+            client.usage(datetime(2018, 9, 19), datetime(2018, 9, 19, 23))
+
+        assert count_usage_requests(session_get) == 2  # noqa: PLR2004
+
+
+STRESS_THREADS = 16
+STRESS_CALLS = 64
+
+
+def fetch_days(client, offsets):
+    """Fetch the usage of one day per offset from many threads at once."""
+    first_day = datetime(2021, 1, 1)
+    with ThreadPoolExecutor(max_workers=STRESS_THREADS) as pool:
+        return list(
+            pool.map(
+                lambda offset: client.usage(
+                    first_day + timedelta(days=offset),
+                    first_day + timedelta(days=offset),
+                ),
+                offsets,
+            )
+        )
+
+
+def test_concurrent_usage_single_login():
+    """Test threads sharing a new client log in once."""
+    with (
+        MockSrpServer() as server,
+        SrpEnergyClient(
+            TEST_ACCOUNT_ID, TEST_USER_NAME, TEST_PASSWORD, base_url=server.base_url
+        ) as client,
+    ):
+        results = fetch_days(client, range(STRESS_CALLS))
+
+        assert server.logins == 1
+        assert server.usage_requests == STRESS_CALLS
+        for offset, usage in enumerate(results):
+            assert len(usage) == 24  # noqa: PLR2004
+            assert (
+                usage[0][2]
+                == (datetime(2021, 1, 1) + timedelta(days=offset)).isoformat()
+            )
+
+
+def test_concurrent_usage_single_relogin():
+    """Test threads rejected with an expired login log in again once."""
+    with (
+        MockSrpServer() as server,
+        SrpEnergyClient(
+            TEST_ACCOUNT_ID, TEST_USER_NAME, TEST_PASSWORD, base_url=server.base_url
+        ) as client,
+    ):
+        fetch_days(client, [0])
+
+        for expiry in range(1, 4):
+            server.expire_sessions()
+            results = fetch_days(client, range(STRESS_CALLS))
+
+            assert server.logins == 1 + expiry
+            assert all(len(usage) == 24 for usage in results)  # noqa: PLR2004
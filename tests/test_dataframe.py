@@ -0,0 +1,98 @@
+"""The tests for the DataFrame adapter."""
+
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from srpenergy.client import SrpEnergyClient, get_rate
+
+from tests.common import (
+    MOCK_LOGIN_RESPONSE,
+    PATCH_GET,
+    PATCH_POST,
+    TEST_PASSWORD,
+    TEST_USER_NAME,
+    get_mock_requests,
+)
+from tests.test_client import ROUTES, TEST_ACCOUNT_ID, make_usage_row
+
+pd = pytest.importorskip("pandas")
+
+from srpenergy.dataframe import usage_dataframe  # noqa: E402
+
+START_DATE = datetime(2018, 9, 19, 0, 0, 0)
+END_DATE = datetime(2018, 9, 19, 23, 0, 0)
+
+
+def test_usage_df_matches_usage():
+    """Test the DataFrame holds the values of the usage tuples."""
+    with patch(PATCH_GET) as session_get, patch(PATCH_POST) as session_post:
+        session_post.return_value = MOCK_LOGIN_RESPONSE
+        session_get.side_effect = get_mock_requests(ROUTES)
+
+        client = SrpEnergyClient(TEST_ACCOUNT_ID, TEST_USER_NAME, TEST_PASSWORD)
+
+        for is_tou in (False, True):
+            usage = client.usage(START_DATE, END_DATE, is_tou)
+            df = client.usage_df(START_DATE, END_DATE, is_tou)
+
+            assert df["kwh"].tolist() == [row[3] for row in usage]
+            assert df["cost"].round(2).tolist() == [row[4] for row in usage]
+            assert [
+                timestamp.replace(tzinfo=None).isoformat() for timestamp in df.index
+            ] == [row[2] for row in usage]
+
+
+def test_usage_dataframe_rates_match_get_rate():
+    """Test the rate and peak columns match get_rate."""
+    hours = [
+        f"2020-{month:02}-0{day}T{hour:02}:00:00"
+        for month in (1, 6, 7)
+        for day in (1, 2, 4)
+        for hour in range(24)
+    ]
+    df = usage_dataframe(make_usage_row(hour, 1.0) for hour in hours)
+
+    expected = [get_rate(hour) for hour in hours]
+    assert list(zip(df["rate"], df["peak"], strict=True)) == expected
+
+
+def test_usage_dataframe_dtypes():
+    """Test the index is time zone aware and the columns are numeric."""
+    df = usage_dataframe([make_usage_row("2020-06-24T15:00:00", 1.5)])
+
+    assert df.index.name == "timestamp"
+    assert df.index[0] == pd.Timestamp("2020-06-24T22:00:00Z")
+    assert df["kwh"].dtype == float
+    assert df["peak"].dtype == bool
+
+
+def test_usage_dataframe_aware_dates():
+    """Test dates with an offset are read in SRP local time."""
+    df = usage_dataframe([make_usage_row("2020-06-24T22:00:00+00:00", 1.5)])
+
+    assert df.index[0] == pd.Timestamp("2020-06-24T22:00:00Z")
+    assert df["peak"].tolist() == [True]
+
+
+def test_usage_dataframe_polars():
+    """Test the Polars backend."""
+    pl = pytest.importorskip("polars")
+
+    df = usage_dataframe([make_usage_row("2020-06-24T15:00:00", 1.5)], backend="polars")
+
+    assert isinstance(df, pl.DataFrame)
+    assert df.columns == ["timestamp", "kwh", "cost", "rate", "peak"]
+    assert df["timestamp"].dt.convert_time_zone("UTC").dt.hour().to_list() == [22]
+    assert df["peak"].to_list() == [True]
+
+
+def test_usage_dataframe_bad_backend():
+    """Test an unknown backend is rejected before reading rows."""
+    rows = iter([make_usage_row("2020-06-24T15:00:00", 1.5)])
+
+    with pytest.raises(ValueError):
+        usage_dataframe(rows, backend="arrow")
+
+    assert next(rows, None) is not None
@@ -0,0 +1,130 @@
+"""The tests for the usage frame."""
+
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from srpenergy.client import SrpEnergyClient
+from srpenergy.frame import UsageFrame
+
+from tests.common import (
+    MOCK_LOGIN_RESPONSE,
+    PATCH_GET,
+    PATCH_POST,
+    TEST_PASSWORD,
+    TEST_USER_NAME,
+    get_mock_requests,
+)
+from tests.test_client import ROUTES, ROUTES_CHUNKED, TEST_ACCOUNT_ID, make_usage_row
+
+START_DATE = datetime(2018, 9, 19, 0, 0, 0)
+END_DATE = datetime(2018, 9, 19, 23, 0, 0)
+
+
+def test_usage_frame_matches_usage():
+    """Test a frame iterates as the usage tuples."""
+    with patch(PATCH_GET) as session_get, patch(PATCH_POST) as session_post:
+        session_post.return_value = MOCK_LOGIN_RESPONSE
+        session_get.side_effect = get_mock_requests(ROUTES)
+
+        client = SrpEnergyClient(TEST_ACCOUNT_ID, TEST_USER_NAME, TEST_PASSWORD)
+
+        for is_tou in (False, True):
+            usage = client.usage(START_DATE, END_DATE, is_tou)
+            frame = client.usage_frame(START_DATE, END_DATE, is_tou)
+
+            assert len(frame) == len(usage)
+            assert list(frame) == usage
+            assert frame[-1] == usage[-1]
+
+
+def test_usage_frame_chunked():
+    """Test a chunked frame drops rows repeated at chunk boundaries."""
+    with patch(PATCH_GET) as session_get, patch(PATCH_POST) as session_post:
+        session_post.return_value = MOCK_LOGIN_RESPONSE
+        session_get.side_effect = get_mock_requests(ROUTES_CHUNKED)
+
+        client = SrpEnergyClient(TEST_ACCOUNT_ID, TEST_USER_NAME, TEST_PASSWORD)
+        frame = client.usage_frame(
+            datetime(2018, 10, 1), datetime(2018, 10, 7, 23), chunk_days=3
+        )
+
+        assert list(frame.kwh) == [1.1, 1.2, 1.3, 1.4, 1.6, 1.7]
+
+
+def test_frame_columns():
+    """Test the columns hold epoch seconds, unrounded cost and peak flags."""
+    row = make_usage_row("2020-06-24T15:00:00", 1.5)
+    row["totalCost"] = 0.123
+    frame = UsageFrame.from_rows([row, make_usage_row("2020-06-24T01:00:00", 0.5)])
+
+    assert (
+        frame.timestamps[0]
+        == datetime.fromisoformat("2020-06-24T15:00:00-07:00").timestamp()
+    )
+    assert frame.usage_time(0) == datetime(2020, 6, 24, 15)
+    assert list(frame.cost) == [0.123, 0.1]
+    assert list(frame.peak) == [1, 0]
+    assert frame[0][4] == 0.12  # noqa: PLR2004
+    assert frame.nbytes == 50  # noqa: PLR2004
+
+
+def test_frame_aware_rows():
+    """Test rows with a UTC offset are stored in SRP local time."""
+    row = make_usage_row("2020-06-24T22:00:00+00:00", 1.5)
+    row.update(onPeakKwh=1.0, offPeakKwh=0.5)
+    frame = UsageFrame.from_rows([row], is_tou=True)
+
+    assert frame.usage_time(0) == datetime(2020, 6, 24, 15)
+    assert list(frame.kwh) == [1.0]
+    assert list(frame.peak) == [1]
+
+
+def test_frame_slice():
+    """Test slicing returns a frame."""
+    frame = UsageFrame.from_rows(
+        make_usage_row(f"2020-06-24T{hour:02}:00:00", hour) for hour in range(4)
+    )
+
+    tail = frame[2:]
+
+    assert isinstance(tail, UsageFrame)
+    assert list(tail) == list(frame)[2:]
+    assert tail == UsageFrame.from_rows(
+        make_usage_row(f"2020-06-24T{hour:02}:00:00", hour) for hour in range(2, 4)
+    )
+
+
+def test_frame_to_numpy():
+    """Test the NumPy view of the columns."""
+    np = pytest.importorskip("numpy")
+
+    frame = UsageFrame.from_rows(
+        [
+            make_usage_row("2020-06-24T15:00:00", 1.5),
+            make_usage_row("2020-06-24T16:00:00", 2.5),
+        ]
+    )
+
+    columns = frame.to_numpy()
+
+    assert columns["timestamps"][0] == np.datetime64("2020-06-24T15:00:00")
+    assert columns["kwh"].tolist() == [1.5, 2.5]
+    assert columns["peak"].dtype == bool
+    assert columns["peak"].all()
+
+    # The value columns share the frame memory.
+    frame.kwh[0] = 3.0
+    assert columns["kwh"][0] == 3.0  # noqa: PLR2004
+
+
+def test_frame_empty():
+    """Test an empty frame."""
+    frame = UsageFrame()
+
+    assert not list(frame)
+    assert frame.nbytes == 0
+
+    pytest.importorskip("numpy")
+    assert frame.to_numpy()["kwh"].size == 0
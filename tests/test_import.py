@@ -0,0 +1,69 @@
+"""The tests for the import cost of the rate functions."""
+
+import subprocess
+import sys
+
+import pytest
+
+# Importing the rate and tariff functions must stay within this many seconds.
+IMPORT_BUDGET = 0.06
+RUNS = 3
+
+RATE_IMPORTS = "from srpenergy.client import get_rate; from srpenergy.tariff import E26"
+HEAVY_MODULES = ("dateutil", "ijson", "numpy", "orjson", "requests", "urllib3")
+
+
+def import_times(statement):
+    """Return the cumulative import seconds of each module and if it is top level."""
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+
+    times = {}
+    for line in result.stderr.splitlines():
+        _self, cumulative, name = line.removeprefix("import time:").split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = (int(cumulative) / 1e6, not name.startswith("  "))
+
+    return times
+
+
+def test_rate_functions_skip_heavy_imports():
+    """Test the rate functions import no heavy module."""
+    times = import_times(RATE_IMPORTS)
+
+    assert "srpenergy.client" in times
+    assert not [name for name in times if name.split(".")[0] in HEAVY_MODULES]
+
+
+def test_rate_functions_import_budget():
+    """Test the rate functions import within the budget."""
+    cost = min(
+        sum(
+            seconds
+            for name, (seconds, is_top) in import_times(RATE_IMPORTS).items()
+            if is_top and name.startswith("srpenergy")
+        )
+        for _run in range(RUNS)
+    )
+
+    assert cost < IMPORT_BUDGET
+
+
+@pytest.mark.parametrize(
+    ("name", "module"),
+    [("np", "numpy"), ("parse", "dateutil.parser"), ("requests", "requests")],
+)
+def test_heavy_imports_on_first_use(name, module):
+    """Test the heavy modules are imported on first use."""
+    statement = (
+        "import sys, srpenergy.client as client; "
+        f"assert {module!r} not in sys.modules; "
+        f"assert client.{name} is not None; "
+        f"assert {module!r} in sys.modules"
+    )
+
+    subprocess.run([sys.executable, "-c", statement], check=True)  # noqa: S603
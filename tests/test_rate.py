@@ -1,8 +1,19 @@
 """The tests for the Srp Energy API Rate calculation."""
 
+from contextlib import nullcontext
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import patch
+
 import pytest
 
-from srpenergy.client import get_rate
+from srpenergy.client import (
+    SEASON_PEAK_SUMMER,
+    get_rate,
+    get_rate_calendar,
+    get_rates,
+    is_holiday,
+    parse_usage_time,
+)
 
 from tests.common import (
     EXPECTED_PEAK_SUMMER_OFF_PEAK,
@@ -164,3 +175,129 @@ def test_bad_parameter():
 
     with pytest.raises(ValueError):
         get_rate(usage_time)
+
+
+HOURS_2020 = [
+    (datetime(2020, 1, 1) + timedelta(hours=hour)).isoformat()
+    for hour in range(366 * 24)
+]
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_get_rates_matches_get_rate(use_numpy):
+    """Test batch rates match get_rate for every hour of a year."""
+    if use_numpy:
+        pytest.importorskip("numpy")
+
+    with patch("srpenergy.client.np", None) if not use_numpy else nullcontext():
+        rates, is_peak = get_rates(HOURS_2020)
+
+    expected = [get_rate(usage_time) for usage_time in HOURS_2020]
+
+    assert list(rates) == [rate for rate, _is_peak in expected]
+    assert [bool(peak) for peak in is_peak] == [peak for _rate, peak in expected]
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_get_rates_datetimes(use_numpy):
+    """Test batch rates accept datetimes."""
+    if use_numpy:
+        pytest.importorskip("numpy")
+
+    with patch("srpenergy.client.np", None) if not use_numpy else nullcontext():
+        rates, is_peak = get_rates(
+            [datetime(2020, 6, 24, 15), datetime(2020, 1, 25, 5)]
+        )
+
+    assert list(rates) == [EXPECTED_SUMMER_ON_PEAK_RATE, EXPECTED_WINTER_WEEKEND_RATE]
+    assert [bool(peak) for peak in is_peak] == [True, False]
+
+
+AWARE_TIMES = [
+    "2020-06-24T15:00:00-07:00",
+    "2020-06-24T22:00:00+00:00",
+    "2020-06-24T22:00:00Z",
+    datetime(2020, 6, 24, 22, tzinfo=timezone.utc),
+    "2020-01-25T05:00:00",
+]
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_get_rates_aware(use_numpy):
+    """Test batch rates convert aware times to SRP local time like get_rate."""
+    if use_numpy:
+        pytest.importorskip("numpy")
+
+    with patch("srpenergy.client.np", None) if not use_numpy else nullcontext():
+        rates, is_peak = get_rates(AWARE_TIMES)
+
+    expected = [
+        get_rate(usage_time if isinstance(usage_time, str) else usage_time.isoformat())
+        for usage_time in AWARE_TIMES
+    ]
+
+    assert list(rates) == [rate for rate, _is_peak in expected]
+    assert [bool(peak) for peak in is_peak] == [peak for _rate, peak in expected]
+    assert expected[:4] == [(EXPECTED_SUMMER_ON_PEAK_RATE, True)] * 4
+
+
+def test_get_rates_none():
+    """Test batch rates reject None."""
+    with pytest.raises(TypeError):
+        get_rates(None)
+
+
+@pytest.mark.parametrize(
+    ("day", "expected"),
+    [
+        (date(2020, 1, 1), True),
+        (date(2020, 5, 25), True),
+        (date(2020, 5, 18), False),
+        (date(2020, 7, 4), True),
+        (date(2020, 9, 7), True),
+        (date(2020, 9, 14), False),
+        (date(2020, 11, 26), True),
+        (date(2020, 12, 24), True),
+        (date(2020, 6, 24), False),
+    ],
+)
+def test_is_holiday(day, expected):
+    """Test the observed holiday rules."""
+    assert is_holiday(day) is expected
+
+
+def test_rate_calendar_tables():
+    """Test the per-day and per-hour tables of a leap year."""
+    calendar = get_rate_calendar(2020)
+
+    assert len(calendar.seasons) == 366  # noqa: PLR2004
+    assert len(calendar.rates) == len(calendar.peaks) == 366 * 24
+    assert calendar.seasons[date(2020, 7, 24).timetuple().tm_yday - 1] == (
+        SEASON_PEAK_SUMMER
+    )
+    assert calendar.holidays[date(2020, 7, 4).timetuple().tm_yday - 1]
+    assert calendar.lookup(date(2020, 7, 24).timetuple().tm_yday, 15) == (
+        EXPECTED_PEAK_SUMMER_ON_PEAK,
+        True,
+    )
+
+
+def test_rate_calendar_cached():
+    """Test calendars are built once per year."""
+    assert get_rate_calendar(2021) is get_rate_calendar(2021)
+
+
+def test_parse_usage_time_iso():
+    """Test SRP iso dates are parsed."""
+    assert parse_usage_time("2020-06-24T15:00:00") == datetime(2020, 6, 24, 15)
+
+
+def test_parse_usage_time_fallback():
+    """Test other date formats fall back to dateutil."""
+    assert parse_usage_time("06/24/2020 3:00 PM") == datetime(2020, 6, 24, 15)
+
+
+def test_get_rate_bad_format():
+    """Test an unparsable time raises ValueError."""
+    with pytest.raises(ValueError):
+        get_rate("not a date")
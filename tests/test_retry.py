@@ -0,0 +1,95 @@
+"""The tests for the retry policy."""
+
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from srpenergy.retry import RetryPolicy
+
+from tests.common import MockResponse
+
+
+def make_response(status_code, headers=None):
+    """Return a mock response with a status and headers."""
+    return MockResponse("", status_code, {}, {}, headers)
+
+
+def test_delay_backs_off_exponentially():
+    """Test the waits double up to the maximum."""
+    policy = RetryPolicy(backoff=1.0, max_backoff=5.0, jitter=False)
+
+    assert [policy.delay(attempt) for attempt in range(1, 5)] == [1.0, 2.0, 4.0, 5.0]
+
+
+def test_delay_jitter():
+    """Test jittered waits stay under the exponential wait."""
+    policy = RetryPolicy(backoff=1.0)
+
+    delays = [policy.delay(3) for _ in range(100)]
+
+    assert all(0 <= delay <= 4.0 for delay in delays)  # noqa: PLR2004
+    assert len(set(delays)) > 1
+
+
+def test_delay_honors_retry_after_seconds():
+    """Test a Retry-After in seconds replaces the backoff in full."""
+    policy = RetryPolicy(max_backoff=10.0)
+
+    assert policy.delay(1, make_response(429, {"retry-after": "7"})) == 7.0  # noqa: PLR2004
+    assert policy.delay(1, make_response(429, {"retry-after": "10"})) == 10.0  # noqa: PLR2004
+
+
+def test_long_retry_after_is_not_retried():
+    """Test a Retry-After longer than the maximum backoff is not retried."""
+    policy = RetryPolicy(max_backoff=10.0)
+
+    assert policy.is_retryable(make_response(429, {"retry-after": "10"}))
+    assert not policy.is_retryable(make_response(429, {"retry-after": "120"}))
+    assert not policy.is_retryable(
+        make_response(403, {"cf-mitigated": "challenge", "retry-after": "120"})
+    )
+    assert policy.is_retryable(make_response(503, {"retry-after": "soon"}))
+
+
+def test_delay_honors_retry_after_date():
+    """Test a Retry-After date is converted to seconds from now."""
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+    response = make_response(
+        503, {"retry-after": format_datetime(retry_at, usegmt=True)}
+    )
+
+    assert 25 < RetryPolicy(max_backoff=60.0).delay(1, response) <= 30  # noqa: PLR2004
+
+
+def test_delay_ignores_bad_retry_after():
+    """Test an unreadable Retry-After falls back to the backoff."""
+    policy = RetryPolicy(backoff=2.0, jitter=False)
+
+    assert policy.delay(1, make_response(503, {"retry-after": "soon"})) == 2.0  # noqa: PLR2004
+
+
+@pytest.mark.parametrize(
+    ("status_code", "headers", "expected"),
+    [
+        (429, None, True),
+        (502, None, True),
+        (503, None, True),
+        (500, None, False),
+        (404, None, False),
+        (403, None, False),
+        (403, {"cf-mitigated": "challenge"}, True),
+    ],
+)
+def test_is_retryable(status_code, headers, expected):
+    """Test transient responses are retried and others are not."""
+    assert RetryPolicy().is_retryable(make_response(status_code, headers)) is expected
+
+
+def test_bad_parameters():
+    """Test the policy parameters are validated."""
+    with pytest.raises(ValueError):
+        RetryPolicy(max_attempts=0)
+
+    with pytest.raises(ValueError):
+        RetryPolicy(backoff=-1)
@@ -0,0 +1,115 @@
+"""The tests for the usage rollups."""
+
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from srpenergy.client import SrpEnergyClient
+from srpenergy.frame import UsageFrame
+from srpenergy.rollup import rollup
+
+from tests.common import (
+    MOCK_LOGIN_RESPONSE,
+    PATCH_GET,
+    PATCH_POST,
+    TEST_PASSWORD,
+    TEST_USER_NAME,
+    get_mock_requests,
+)
+from tests.test_client import make_usage_row
+from tests.test_time_of_use import ROUTES, TEST_ACCOUNT_TOU_ID
+
+
+def make_usage(days):
+    """Return a frame of every hour of some days of June 2020."""
+    rows = [
+        make_usage_row(f"2020-06-{day:02}T{hour:02}:00:00", 1.0)
+        for day in days
+        for hour in range(24)
+    ]
+    return UsageFrame.from_rows(rows)
+
+
+def test_daily_rollup_matches_hourly_sum():
+    """Test a daily rollup matches the hourly usage of the day."""
+    with patch(PATCH_GET) as session_get, patch(PATCH_POST) as session_post:
+        session_post.return_value = MOCK_LOGIN_RESPONSE
+        session_get.side_effect = get_mock_requests(ROUTES)
+
+        client = SrpEnergyClient(TEST_ACCOUNT_TOU_ID, TEST_USER_NAME, TEST_PASSWORD)
+
+        start_date = datetime(2020, 6, 28, 0, 0, 0)
+        end_date = datetime(2020, 6, 28, 23, 0, 0)
+
+        usage = client.usage(start_date, end_date, True)
+        (day,) = rollup(client.iter_usage(start_date, end_date, True))
+
+        assert day.start == datetime(2020, 6, 28)
+        assert day.hours == len(usage)
+        assert day.kwh == sum(row[3] for row in usage)
+        assert day.cost == pytest.approx(sum(row[4] for row in usage))
+        # June 28 2020 is a Sunday, so every hour is off peak.
+        assert day.off_peak_kwh == day.kwh
+        assert day.on_peak_kwh == 0
+
+
+def test_rollup_frame_matches_tuples():
+    """Test a frame and its tuples roll up to the same totals."""
+    frame = make_usage([24, 25])
+
+    assert rollup(frame) == rollup(list(frame))
+
+
+def test_rollup_peak_split():
+    """Test the hours are split on the time of use peak."""
+    (day,) = rollup(make_usage([24]))
+
+    # Summer weekday peak hours are 2pm to 8pm.
+    assert day.hours == 24  # noqa: PLR2004
+    assert day.on_peak_kwh == 6  # noqa: PLR2004
+    assert day.off_peak_kwh == 18  # noqa: PLR2004
+    assert day.on_peak_cost + day.off_peak_cost == pytest.approx(day.cost)
+
+
+@pytest.mark.parametrize(
+    ("period", "starts"),
+    [
+        ("day", [datetime(2020, 6, day) for day in (14, 15, 28, 29, 30)]),
+        (
+            "week",
+            [
+                datetime(2020, 6, 8),
+                datetime(2020, 6, 15),
+                datetime(2020, 6, 22),
+                datetime(2020, 6, 29),
+            ],
+        ),
+        ("month", [datetime(2020, 6, 1)]),
+    ],
+)
+def test_rollup_periods(period, starts):
+    """Test the start of each period."""
+    totals = rollup(make_usage([14, 15, 28, 29, 30]), period)
+
+    assert [total.start for total in totals] == starts
+    assert sum(total.hours for total in totals) == 5 * 24
+
+
+def test_rollup_billing_cycle():
+    """Test billing cycles start on the billing day."""
+    totals = rollup(make_usage([14, 15, 28]), "billing_cycle", billing_day=15)
+
+    assert [(total.start, total.hours) for total in totals] == [
+        (datetime(2020, 5, 15), 24),
+        (datetime(2020, 6, 15), 48),
+    ]
+
+
+def test_rollup_bad_parameters():
+    """Test the period and billing day are validated."""
+    with pytest.raises(ValueError):
+        rollup([], "year")
+
+    with pytest.raises(ValueError):
+        rollup([], "billing_cycle", billing_day=31)
@@ -0,0 +1,139 @@
+"""The tests for the synthetic usage payloads."""
+
+from datetime import date, datetime, timedelta
+import io
+import json
+import tracemalloc
+
+import pytest
+
+from benchmarks.synthetic import iter_days, iter_payload, main, write_payload
+from srpenergy.client import _convert_row, _get_rate, _parse_hourly_usage
+
+BEGIN_DATE = date(2020, 6, 1)
+END_DATE = date(2020, 6, 10)
+
+
+def load_payload(plan, seed=0, demand=False, begin_date=BEGIN_DATE):
+    """Return a synthetic payload as parsed JSON."""
+    return json.loads(b"".join(iter_payload(begin_date, END_DATE, plan, seed, demand)))
+
+
+@pytest.mark.parametrize("plan", ["total", "ez3", "tou"])
+def test_payload_rows(plan):
+    """Test a payload holds every hour of the range."""
+    rows = load_payload(plan)["hourlyUsageList"]
+
+    assert len(rows) == 10 * 24
+    assert rows[0]["date"] == "2020-06-01T00:00:00"
+    assert rows[-1]["date"] == "2020-06-10T23:00:00"
+    assert all(row["hour"] == row["date"] for row in rows)
+
+
+def test_payload_is_seeded():
+    """Test the same seed gives the same payload."""
+    assert load_payload("total", seed=1) == load_payload("total", seed=1)
+    assert load_payload("total", seed=1) != load_payload("total", seed=2)
+
+
+def test_payload_days_do_not_depend_on_range():
+    """Test the usage of a day does not depend on the range start."""
+    rows = load_payload("total")["hourlyUsageList"]
+    later_rows = load_payload("total", begin_date=date(2020, 6, 5))["hourlyUsageList"]
+
+    assert later_rows == rows[4 * 24 :]
+
+
+def test_payload_total():
+    """Test the total plan only fills the totals."""
+    for row in load_payload("total")["hourlyUsageList"]:
+        assert row["totalKwh"] > 0
+        assert row["onPeakKwh"] == row["offPeakKwh"] == 0
+
+
+def test_payload_ez3():
+    """Test the EZ-3 plan splits the usage by peak."""
+    for row in load_payload("ez3")["hourlyUsageList"]:
+        usage_time = datetime.fromisoformat(row["date"])
+        is_peak = usage_time.weekday() < 5 and 15 <= usage_time.hour < 18  # noqa: PLR2004
+
+        assert row["totalKwh"] == row["totalCost"] == 0
+        assert (row["onPeakKwh"] > 0) == is_peak
+        assert (row["offPeakKwh"] > 0) != is_peak
+        assert _convert_row(row)[3] == row["onPeakKwh"] + row["offPeakKwh"]
+
+
+def test_payload_tou():
+    """Test the time of use plan splits the usage by the E-26 peak."""
+    for row in load_payload("tou")["hourlyUsageList"]:
+        is_peak = _get_rate(datetime.fromisoformat(row["date"]))[1]
+
+        assert row["totalKwh"] == 0
+        assert (row["onPeakKwh"] > 0) == is_peak
+        assert _convert_row(row, is_tou=True)[3] > 0
+
+
+def test_payload_demand():
+    """Test the demand list holds the peak of each day."""
+    assert load_payload("tou")["demandList"] == []
+
+    demand_list = load_payload("tou", demand=True)["demandList"]
+    assert len(demand_list) == 10  # noqa: PLR2004
+    for (day_demand, rows), demand in zip(
+        iter_days(BEGIN_DATE, END_DATE, "tou"), demand_list, strict=True
+    ):
+        assert demand == day_demand
+        assert demand["demandKw"] == max(
+            row["onPeakKwh"] + row["offPeakKwh"] for row in rows
+        )
+
+
+def test_payload_parsed_in_chunks():
+    """Test the payload parses like the API response."""
+    payload = iter_payload(BEGIN_DATE, END_DATE, "ez3", demand=True)
+
+    rows = list(_parse_hourly_usage(payload))
+
+    assert rows == load_payload("ez3")["hourlyUsageList"]
+
+
+def test_payload_memory_does_not_depend_on_range():
+    """Test a long range with demand does not hold more memory than a short one."""
+
+    def peak_memory(days):
+        payload = iter_payload(
+            BEGIN_DATE, BEGIN_DATE + timedelta(days=days), demand=True
+        )
+        tracemalloc.start()
+        try:
+            for _part in payload:
+                pass
+
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    assert peak_memory(200) < 2 * peak_memory(10)
+
+
+def test_write_payload():
+    """Test the payload is written whole and its size returned."""
+    stream = io.BytesIO()
+
+    size = write_payload(stream, iter_payload(BEGIN_DATE, END_DATE))
+
+    assert size == len(stream.getvalue())
+    assert json.loads(stream.getvalue()) == load_payload("total")
+
+
+def test_main(capsysbinary):
+    """Test the command line prints the payload."""
+    main(["2020-06-01", "2020-06-10", "--plan", "tou", "--seed", "3"])
+
+    assert json.loads(capsysbinary.readouterr().out) == load_payload("tou", seed=3)
+
+
+def test_bad_plan():
+    """Test an unknown plan is rejected."""
+    with pytest.raises(ValueError):
+        list(iter_payload(BEGIN_DATE, END_DATE, "e-26"))
@@ -0,0 +1,161 @@
+"""The tests for the data-driven rate plans."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from srpenergy import tariff
+from srpenergy.client import get_rates
+from srpenergy.frame import UsageFrame
+from srpenergy.tariff import E26, RatePlan
+
+from tests.test_client import make_usage_row
+
+# A three band plan with made up prices.
+THREE_BAND_PLAN = {
+    "name": "three-band",
+    "peak_bands": ["on_peak"],
+    "schedules": [
+        {
+            "effective": "2020-01-01",
+            "holidays": ["2020-07-03"],
+            "seasons": [
+                {
+                    "name": "all",
+                    "months": list(range(1, 13)),
+                    "price": 0.10,
+                    "bands": [
+                        {
+                            "name": "on_peak",
+                            "price": 0.30,
+                            "hours": [[15, 18]],
+                            "weekdays": [0, 1, 2, 3, 4],
+                        },
+                        {
+                            "name": "shoulder",
+                            "price": 0.20,
+                            "hours": [[12, 20]],
+                            "weekdays": [0, 1, 2, 3, 4],
+                        },
+                    ],
+                }
+            ],
+        },
+        {
+            "effective": "2021-01-01",
+            "seasons": [
+                {"name": "flat", "months": list(range(1, 13)), "price": 0.12},
+            ],
+        },
+    ],
+}
+
+
+def test_e26_matches_get_rates():
+    """Test the E-26 plan prices every hour like get_rates."""
+    np = pytest.importorskip("numpy")
+
+    hours = np.arange(
+        np.datetime64("2015-01-01T00"), np.datetime64("2021-01-01T00")
+    ).astype("datetime64[s]")
+
+    prices, bands = E26.rates(hours)
+    rates, is_peak = get_rates(hours)
+
+    assert (prices == rates).all()
+    assert (
+        np.array(E26.bands)[bands] == np.where(is_peak, "on_peak", "off_peak")
+    ).all()
+
+
+def test_e26_rates_aware():
+    """Test aware times are priced in SRP local time."""
+    prices, bands = E26.rates(["2020-06-24T22:00:00+00:00", "2020-06-24T15:00:00"])
+
+    assert prices[0] == prices[1]
+    assert bands[0] == bands[1]
+    assert E26.rate(datetime(2020, 6, 24, 22, tzinfo=timezone.utc)) == E26.rate(
+        datetime(2020, 6, 24, 15)
+    )
+
+
+def test_plan_bands_and_schedules():
+    """Test band precedence, holidays and effective dates."""
+    plan = RatePlan.from_dict(THREE_BAND_PLAN)
+
+    assert plan.rate(datetime(2020, 7, 2, 16)) == (0.30, "on_peak")
+    assert plan.rate(datetime(2020, 7, 2, 13)) == (0.20, "shoulder")
+    assert plan.rate(datetime(2020, 7, 2, 21)) == (0.10, "off_peak")
+    assert plan.rate(datetime(2020, 7, 3, 16)) == (0.10, "off_peak")
+    assert plan.rate(datetime(2020, 7, 4, 16)) == (0.10, "off_peak")
+    assert plan.rate(datetime(2021, 7, 2, 16)) == (0.12, "off_peak")
+    # The first schedule applies before its effective date.
+    assert plan.rate(datetime(2019, 7, 2, 16)) == (0.30, "on_peak")
+
+
+def test_plan_apply_frame():
+    """Test a frame is priced with the plan in one pass."""
+    rows = [make_usage_row(f"2020-06-24T{hour:02}:00:00", 2.0) for hour in range(24)]
+    frame = UsageFrame.from_rows(rows)
+
+    priced = RatePlan.from_dict(THREE_BAND_PLAN).apply(frame)
+
+    assert list(priced.kwh) == list(frame.kwh)
+    assert (
+        priced.cost.tolist()
+        == [0.2] * 12 + [0.4] * 3 + [0.6] * 3 + [0.4] * 2 + [0.2] * 4
+    )
+    assert priced.peak.tolist() == [0] * 15 + [1] * 3 + [0] * 6
+    assert list(frame.cost) == [0.1] * 24
+
+
+def test_plan_apply_prices_total_kwh():
+    """Test the plan prices the total kWh and rejects time of use frames."""
+    rows = [make_usage_row(f"2020-06-24T{hour:02}:00:00", 2.0) for hour in (10, 16)]
+    for row in rows:
+        row.update(onPeakKwh=1.5, offPeakKwh=0.5)
+
+    priced = RatePlan.from_dict(THREE_BAND_PLAN).apply(UsageFrame.from_rows(rows))
+
+    assert priced.cost.tolist() == [0.2, 0.6]
+
+    tou_frame = UsageFrame.from_rows(rows, is_tou=True)
+
+    assert tou_frame[1:].is_tou
+    with pytest.raises(ValueError, match="is_tou=False"):
+        E26.apply(tou_frame)
+
+
+def test_plan_apply_without_numpy(monkeypatch):
+    """Test the pure Python pricing matches the NumPy one."""
+    rows = [make_usage_row(f"2020-12-{day:02}T10:00:00", 1.5) for day in range(1, 31)]
+    frame = UsageFrame.from_rows(rows)
+    expected = E26.apply(frame)
+
+    monkeypatch.setattr(tariff, "np", None)
+
+    assert E26.apply(frame) == expected
+
+
+@pytest.mark.parametrize(
+    "seasons",
+    [
+        [{"name": "part", "months": [1, 2, 3], "price": 0.1}],
+        [
+            {"name": "a", "months": list(range(1, 13)), "price": 0.1},
+            {"name": "b", "months": [6], "price": 0.2},
+        ],
+        [
+            {
+                "name": "bad",
+                "months": list(range(1, 13)),
+                "price": 0.1,
+                "bands": [{"name": "late", "price": 0.2, "hours": [[20, 25]]}],
+            }
+        ],
+    ],
+)
+def test_plan_bad_data(seasons):
+    """Test plans must price every hour of every month once."""
+    with pytest.raises(ValueError):
+        RatePlan("bad", [{"effective": "2020-01-01", "seasons": seasons}])
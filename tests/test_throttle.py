@@ -0,0 +1,124 @@
+"""The tests for the shared rate limiter."""
+
+import asyncio
+from datetime import datetime
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from srpenergy.client import SrpEnergyClient
+from srpenergy.throttle import TokenBucket
+
+from tests.common import (
+    MOCK_LOGIN_RESPONSE,
+    PATCH_GET,
+    PATCH_POST,
+    TEST_PASSWORD,
+    TEST_USER_NAME,
+    get_mock_requests,
+)
+from tests.test_client import ROUTES, TEST_ACCOUNT_ID, TEST_BAD_ACCOUNT_ID
+
+
+def test_burst_is_immediate():
+    """Test a burst of requests is not delayed."""
+    bucket = TokenBucket(rate=1.0, burst=5)
+
+    started = time.monotonic()
+    for _ in range(5):
+        bucket.acquire()
+
+    assert time.monotonic() - started < 0.5  # noqa: PLR2004
+
+
+def test_rate_is_enforced():
+    """Test requests beyond the burst wait for the refill."""
+    bucket = TokenBucket(rate=50.0, burst=1)
+
+    started = time.monotonic()
+    for _ in range(6):
+        bucket.acquire()
+
+    assert time.monotonic() - started >= 0.09  # noqa: PLR2004
+
+
+def test_keys_are_served_in_turn():
+    """Test waiting keys are granted tokens round-robin."""
+    bucket = TokenBucket(rate=1.0, burst=3)
+    bucket._tokens = 0.0
+
+    waiters = [bucket._enqueue(key) for key in ("a", "a", "a", "b")]
+    bucket._tokens = 3.0
+    bucket._dispatch()
+
+    assert [waiter.granted for waiter in waiters] == [True, True, False, True]
+
+
+def test_shared_by_threads_and_event_loops():
+    """Test blocking and asyncio callers share the same tokens."""
+    bucket = TokenBucket(rate=100.0, burst=2)
+
+    async def acquire_async():
+        for _ in range(5):
+            await bucket.acquire_async("async")
+
+    started = time.monotonic()
+    thread = threading.Thread(target=lambda: [bucket.acquire("sync") for _ in range(5)])
+    thread.start()
+    asyncio.run(acquire_async())
+    thread.join()
+
+    # Ten requests with a burst of two need eight refills.
+    assert time.monotonic() - started >= 0.07  # noqa: PLR2004
+
+
+def test_cancelled_waiter_leaves_queue():
+    """Test a cancelled asyncio waiter gives up its place."""
+    bucket = TokenBucket(rate=1.0, burst=1)
+    bucket.acquire()
+
+    async def cancel_waiter():
+        task = asyncio.ensure_future(bucket.acquire_async("a"))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_waiter())
+
+    assert not bucket._waiters
+    assert not bucket._keys
+
+
+def test_bad_parameters():
+    """Test the rate and burst are validated."""
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+    with pytest.raises(ValueError):
+        TokenBucket(rate=1.0, burst=0)
+
+
+def test_client_takes_token_per_request():
+    """Test the client takes a token keyed by account before each request."""
+    limiter = Mock(spec=TokenBucket)
+
+    with patch(PATCH_GET) as session_get, patch(PATCH_POST) as session_post:
+        session_post.return_value = MOCK_LOGIN_RESPONSE
+        session_get.side_effect = get_mock_requests(ROUTES)
+
+        client = SrpEnergyClient(
+            TEST_ACCOUNT_ID, TEST_USER_NAME, TEST_PASSWORD, limiter=limiter
+        )
+        client.usage_many(
+            [TEST_ACCOUNT_ID, TEST_BAD_ACCOUNT_ID],
+            datetime(2018, 9, 19),
+            datetime(2018, 9, 19, 23),
+        )
+
+    keys = [call.args[0] for call in limiter.acquire.call_args_list]
+    # Login, antiforgery token, then one usage request per account.
+    assert len(keys) == session_post.call_count + session_get.call_count
+    assert sorted(keys[2:]) == sorted([TEST_ACCOUNT_ID, TEST_BAD_ACCOUNT_ID])
@@ -0,0 +1,159 @@
+"""The tests for the tracer hooks."""
+
+import asyncio
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from srpenergy.cache import UsageCache
+from srpenergy.client import SrpEnergyClient, SrpEnergyError
+from srpenergy.retry import RetryPolicy
+from srpenergy.trace import CallbackTracer
+
+from tests.common import (
+    MOCK_LOGIN_RESPONSE,
+    PATCH_GET,
+    PATCH_POST,
+    TEST_PASSWORD,
+    TEST_USER_NAME,
+    get_mock_requests,
+    get_mock_transport,
+)
+from tests.test_client import (
+    EXPECTED_USAGE_COUNT,
+    ROUTES,
+    ROUTES_CHUNKED,
+    TEST_ACCOUNT_ID,
+    get_flaky_requests,
+)
+
+START_DATE = datetime(2018, 9, 19, 0, 0, 0)
+END_DATE = datetime(2018, 9, 19, 23, 0, 0)
+
+
+def get_recording_tracer():
+    """Return a tracer and the list of (name, duration, attributes) it records."""
+    spans = []
+    tracer = CallbackTracer(
+        lambda name, duration, attributes: spans.append((name, duration, attributes))
+    )
+    return tracer, spans
+
+
+def test_usage_spans():
+    """Test each step of a usage request is reported."""
+    tracer, spans = get_recording_tracer()
+
+    with patch(PATCH_GET) as session_get, patch(PATCH_POST) as session_post:
+        session_post.return_value = MOCK_LOGIN_RESPONSE
+        session_get.side_effect = get_mock_requests(ROUTES)
+
+        client = SrpEnergyClient(
+            TEST_ACCOUNT_ID, TEST_USER_NAME, TEST_PASSWORD, tracer=tracer
+        )
+        usage = client.usage(START_DATE, END_DATE)
+
+    assert len(usage) == EXPECTED_USAGE_COUNT
+    assert [name for name, _duration, _attributes in spans] == [
+        "login/authorize",
+        "login/antiforgerytoken",
+        "usage/hourlydetail",
+        "usage/decode",
+        "usage/convert",
+    ]
+    assert all(duration >= 0 for _name, duration, _attributes in spans)
+
+    attributes = {name: attributes for name, _duration, attributes in spans}
+    assert attributes["usage/hourlydetail"] == {
+        "http.status_code": 200,
+        "srp.retries": 0,
+    }
+    assert attributes["usage/decode"]["srp.bytes"] > 0
+    assert attributes["usage/decode"]["srp.rows"] == EXPECTED_USAGE_COUNT
+    assert attributes["usage/convert"]["srp.rows"] == EXPECTED_USAGE_COUNT
+
+
+def test_usage_spans_chunked_with_cache():
+    """Test cache lookups, retries and each chunk are reported."""
+    tracer, spans = get_recording_tracer()
+
+    with patch(PATCH_GET) as session_get, patch(PATCH_POST) as session_post:
+        session_post.return_value = MOCK_LOGIN_RESPONSE
+        session_get.side_effect = get_flaky_requests(ROUTES_CHUNKED, [503])
+
+        client = SrpEnergyClient(
+            TEST_ACCOUNT_ID,
+            TEST_USER_NAME,
+            TEST_PASSWORD,
+            cache=UsageCache(":memory:"),
+            retry=RetryPolicy(backoff=0),
+            tracer=tracer,
+        )
+        client.usage(datetime(2018, 10, 1), datetime(2018, 10, 7, 23), chunk_days=3)
+
+    names = [name for name, _duration, _attributes in spans]
+    assert names.count("usage/convert") == 3  # noqa: PLR2004
+
+    attributes = [attributes for name, _duration, attributes in spans]
+    assert attributes[names.index("cache/lookup")] == {
+        "srp.cache_hits": 0,
+        "srp.cache_misses": 7,
+    }
+    retries = [
+        attributes["srp.retries"]
+        for name, _duration, attributes in spans
+        if name == "usage/hourlydetail"
+    ]
+    assert sorted(retries) == [0, 0, 1]
+
+
+def test_failed_step_span():
+    """Test a failed step is reported with its error."""
+    tracer, spans = get_recording_tracer()
+
+    with patch(PATCH_GET) as session_get, patch(PATCH_POST) as session_post:
+        session_post.return_value = MOCK_LOGIN_RESPONSE
+        session_get.side_effect = get_mock_requests(ROUTES, antiforgery_cookies={})
+
+        client = SrpEnergyClient(
+            TEST_ACCOUNT_ID, TEST_USER_NAME, TEST_PASSWORD, tracer=tracer
+        )
+
+        with pytest.raises(SrpEnergyError):
+            client.usage(START_DATE, END_DATE)
+
+    assert [name for name, _duration, _attributes in spans] == [
+        "login/authorize",
+        "login/antiforgerytoken",
+    ]
+
+
+def test_async_usage_spans():
+    """Test the async client reports the same steps."""
+    pytest.importorskip("httpx")
+    from srpenergy.async_client import AsyncSrpEnergyClient  # noqa: PLC0415
+
+    tracer, spans = get_recording_tracer()
+    transport = get_mock_transport(ROUTES)
+
+    async def run():
+        async with AsyncSrpEnergyClient(
+            TEST_ACCOUNT_ID,
+            TEST_USER_NAME,
+            TEST_PASSWORD,
+            transport=transport,
+            tracer=tracer,
+        ) as client:
+            return await client.usage(START_DATE, END_DATE)
+
+    usage = asyncio.run(run())
+
+    assert len(usage) == EXPECTED_USAGE_COUNT
+    assert [name for name, _duration, _attributes in spans] == [
+        "login/authorize",
+        "login/antiforgerytoken",
+        "usage/hourlydetail",
+        "usage/decode",
+        "usage/convert",
+    ]